@@ -0,0 +1,5 @@
+def main() -> None:
+    """Entry point of the `batboy` command (see batboy.cli)."""
+    from batboy.cli import main as cli_main
+
+    cli_main()
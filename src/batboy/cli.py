@@ -0,0 +1,368 @@
+import cProfile
+import pstats
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Optional
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeElapsedColumn,
+)
+
+from batboy.config.constants import LAKE_COMPACT_MIN_FILES, LAKE_DIR, PAGE_CACHE_DIR
+from batboy.scraping.progress import BatchProgress, configure_progress
+
+app = typer.Typer(
+    name="batboy",
+    help="Scrape, wrangle, and query NCAA baseball data.",
+    no_args_is_help=True,
+)
+console = Console()
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "ETA -:--:--"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"ETA {hours}:{minutes:02d}:{secs:02d}"
+
+
+def _with_progress(description: str, job: Callable[[], object]) -> object:
+    """
+    Run `job` while drawing a live bar of targets done, pages/sec, rows/sec
+    and ETA from the BatchProgress that run_batch reports to.
+    """
+    with Progress(
+        TextColumn("[bold]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("{task.fields[pages_per_sec]:.2f} pages/s"),
+        TextColumn("{task.fields[rows_per_sec]:.1f} rows/s"),
+        TextColumn("{task.fields[failed]} failed"),
+        TimeElapsedColumn(),
+        TextColumn("{task.fields[eta]}"),
+        console=console,
+    ) as bar:
+        task = bar.add_task(
+            description,
+            total=None,
+            pages_per_sec=0.0,
+            rows_per_sec=0.0,
+            failed=0,
+            eta=_format_eta(None),
+        )
+
+        def update(progress: BatchProgress) -> None:
+            rates = progress.rates()
+            bar.update(
+                task,
+                total=progress.total or None,
+                completed=progress.done,
+                pages_per_sec=rates["pages_per_sec"],
+                rows_per_sec=rates["rows_per_sec"],
+                failed=progress.failed,
+                eta=_format_eta(rates["eta"]),
+            )
+
+        configure_progress(BatchProgress(on_update=update))
+        try:
+            return job()
+        finally:
+            configure_progress(None)
+
+
+def _show_targets(targets: pl.DataFrame, what: str) -> None:
+    console.print(f"🧪 Dry run: {targets.shape[0]} {what} would be scraped.")
+    if not targets.is_empty():
+        console.print(targets.head(10))
+
+
+@app.callback()
+def main_options(
+    ctx: typer.Context,
+    rate: Optional[float] = typer.Option(
+        None, help="Pin the per-host request rate (requests/sec)."
+    ),
+    no_rate_limit: bool = typer.Option(
+        False, "--no-rate-limit", help="Use random delays instead of the limiter."
+    ),
+    shard: Optional[str] = typer.Option(
+        None, help="Work only shard k of N (e.g. 0/4), writing shard DB files."
+    ),
+    cache_dir: Path = typer.Option(
+        Path(PAGE_CACHE_DIR), help="Directory of the page cache."
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the page cache."),
+    lake: Optional[Path] = typer.Option(
+        None, help="Mirror writes into a Parquet lake at this directory."
+    ),
+    lean: bool = typer.Option(False, help="Use the lean browser profile."),
+    profile: Optional[Path] = typer.Option(
+        None, help="Profile the command and save pstats to this file."
+    ),
+):
+    """Global throughput settings, applied before the command runs."""
+    from batboy.scraping.cache import configure_page_cache
+    from batboy.scraping.core import close_driver_pools, set_lean_mode
+    from batboy.scraping.ratelimit import configure_rate_limiter
+    from batboy.storage.lake import configure_lake
+    from batboy.storage.shards import configure_shard
+
+    try:
+        configure_shard(shard)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--shard")
+    if no_rate_limit:
+        configure_rate_limiter(enabled=False)
+    elif rate is not None:
+        if rate <= 0:
+            raise typer.BadParameter("must be positive", param_hint="--rate")
+        configure_rate_limiter(initial_rate=rate, min_rate=rate, max_rate=rate)
+    configure_page_cache(None if no_cache else str(cache_dir))
+    if lake is not None:
+        configure_lake(str(lake))
+    set_lean_mode(lean)
+    ctx.call_on_close(close_driver_pools)
+
+    if profile is not None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def save_profile() -> None:
+            profiler.disable()
+            profiler.dump_stats(str(profile))
+            stats = pstats.Stats(profiler)
+            stats.sort_stats("cumulative").print_stats(25)
+            console.print(f"📈 Profile saved to {profile}")
+
+        ctx.call_on_close(save_profile)
+
+
+@app.command()
+def teams():
+    """Refresh the list of NCAA baseball teams."""
+    from batboy.scraping.teams import get_ncaa_baseball_teams
+
+    df = get_ncaa_baseball_teams(refresh=True)
+    console.print(f"✅ {df.shape[0]} teams")
+
+
+@app.command()
+def audit(
+    limit: Optional[int] = typer.Option(None, help="Maximum teams to audit."),
+    min_year: str = typer.Option("1996-97", help="Earliest season to audit."),
+    division: str = typer.Option("D-I", help="Only audit teams of this division."),
+    workers: int = typer.Option(4, help="Concurrent tab probes per season."),
+    queue: bool = typer.Option(False, help="Work through the shared job queue."),
+    dry_run: bool = typer.Option(False, help="List unaudited schools and exit."),
+):
+    """Audit which seasons have schedules and rosters (fills season_info)."""
+    from batboy.data import load_schools
+    from batboy.scraping.teams import audit_all_info_with_resume, get_audited_org_ids
+    from batboy.storage.shards import filter_shard
+
+    if dry_run:
+        schools = filter_shard(load_schools())
+        pending = schools.filter(~pl.col("org_id").is_in(get_audited_org_ids()))
+        _show_targets(pending.head(limit) if limit else pending, "schools")
+        return
+    _with_progress(
+        "audit",
+        lambda: audit_all_info_with_resume(
+            min_year, division, limit, queue=queue, probe_workers=workers
+        ),
+    )
+
+
+def _season_command(
+    what: str,
+    pending: Callable[[Optional[int]], pl.DataFrame],
+    open_seasons: Callable[[], pl.DataFrame],
+    batch: Callable[..., None],
+    refresh_job: Callable[..., object],
+    limit: Optional[int],
+    workers: int,
+    queue: bool,
+    refresh: bool,
+    dry_run: bool,
+) -> None:
+    if dry_run:
+        targets = open_seasons() if refresh else pending(limit)
+        _show_targets(targets.head(limit) if limit else targets, f"{what} seasons")
+        return
+    if refresh:
+        counts = _with_progress(
+            f"refresh {what}", lambda: refresh_job(workers=workers, limit=limit)
+        )
+        console.print(f"📊 {counts}")
+        return
+    _with_progress(what, lambda: batch(limit=limit, workers=workers, queue=queue))
+
+
+@app.command()
+def schedules(
+    limit: Optional[int] = typer.Option(None, help="Maximum seasons to scrape."),
+    workers: int = typer.Option(1, help="Concurrent browser workers."),
+    queue: bool = typer.Option(False, help="Work through the shared job queue."),
+    refresh: bool = typer.Option(
+        False, help="Re-fetch open seasons instead of unscraped ones."
+    ),
+    dry_run: bool = typer.Option(False, help="List the targets and exit."),
+):
+    """Scrape team schedules of every audited season not yet logged."""
+    from batboy.scraping.refresh import get_open_season_targets
+    from batboy.scraping.schedules import (
+        batch_scrape_team_schedules,
+        get_pending_schedule_targets,
+        refresh_team_schedules,
+    )
+
+    _season_command(
+        "schedules",
+        get_pending_schedule_targets,
+        lambda: get_open_season_targets("has_schedule"),
+        batch_scrape_team_schedules,
+        refresh_team_schedules,
+        limit,
+        workers,
+        queue,
+        refresh,
+        dry_run,
+    )
+
+
+@app.command()
+def rosters(
+    limit: Optional[int] = typer.Option(None, help="Maximum seasons to scrape."),
+    workers: int = typer.Option(1, help="Concurrent browser workers."),
+    queue: bool = typer.Option(False, help="Work through the shared job queue."),
+    refresh: bool = typer.Option(
+        False, help="Re-fetch open seasons instead of unscraped ones."
+    ),
+    dry_run: bool = typer.Option(False, help="List the targets and exit."),
+):
+    """Scrape team rosters of every audited season not yet logged."""
+    from batboy.scraping.refresh import get_open_season_targets
+    from batboy.scraping.rosters import (
+        batch_scrape_team_rosters,
+        get_pending_roster_targets,
+        refresh_team_rosters,
+    )
+
+    _season_command(
+        "rosters",
+        get_pending_roster_targets,
+        lambda: get_open_season_targets("has_roster"),
+        batch_scrape_team_rosters,
+        refresh_team_rosters,
+        limit,
+        workers,
+        queue,
+        refresh,
+        dry_run,
+    )
+
+
+class QueryView(str, Enum):
+    record = "record"
+    head_to_head = "head-to-head"
+    splits = "splits"
+    attendance = "attendance"
+    schedules = "schedules"
+    rosters = "rosters"
+    season_info = "season-info"
+
+
+@app.command()
+def query(
+    view: QueryView = typer.Argument(..., help="What to query."),
+    year: Optional[str] = typer.Option(None, help="Season label, e.g. 2024-25."),
+    org_id: Optional[int] = typer.Option(None, help="Team org_id."),
+    opponent: Optional[int] = typer.Option(
+        None, help="Opponent org_id (head-to-head)."
+    ),
+    limit: Optional[int] = typer.Option(None, help="Maximum rows to return."),
+    cached: bool = typer.Option(True, help="Serve aggregates from the cache."),
+    output: Optional[Path] = typer.Option(
+        None, help="Write the result to a .csv or .parquet file."
+    ),
+):
+    """Query the scraped data (aggregates are cached between runs)."""
+    from batboy.query import Query
+
+    with Query() as q:
+        if view is QueryView.head_to_head:
+            if org_id is None or opponent is None:
+                raise typer.BadParameter("needs --org-id and --opponent")
+            relation = q.head_to_head(org_id, opponent, year)
+        elif view is QueryView.record:
+            relation = q.team_season_record(year, org_id)
+        elif view is QueryView.splits:
+            relation = q.home_away_splits(year, org_id)
+        elif view is QueryView.attendance:
+            relation = q.attendance_by_venue(year)
+        elif view is QueryView.schedules:
+            relation = q.schedules(year, org_id)
+        elif view is QueryView.rosters:
+            relation = q.rosters(year, org_id)
+        else:
+            relation = q.season_info(year, org_id)
+
+        if limit:
+            relation = relation.limit(limit)
+        is_aggregate = view in (
+            QueryView.record,
+            QueryView.head_to_head,
+            QueryView.splits,
+            QueryView.attendance,
+        )
+        df = q.cached(relation) if cached and is_aggregate else relation.pl()
+
+    if output is None:
+        with pl.Config(tbl_rows=limit or 50, tbl_cols=-1):
+            console.print(df)
+    elif output.suffix == ".parquet":
+        df.write_parquet(output)
+    else:
+        df.write_csv(output)
+
+
+@app.command()
+def merge(
+    remove: bool = typer.Option(False, help="Delete shard files once merged."),
+):
+    """Merge shard DuckDB files into the canonical databases."""
+    from batboy.storage.shards import merge_shards
+
+    console.print(f"🧩 {merge_shards(remove=remove)}")
+
+
+@app.command()
+def compact(
+    lake_dir: Path = typer.Option(Path(LAKE_DIR), help="Root of the Parquet lake."),
+    min_files: int = typer.Option(
+        LAKE_COMPACT_MIN_FILES, help="Compact partitions with at least this many files."
+    ),
+):
+    """Merge small files in every dataset of the Parquet lake."""
+    from batboy.storage.lake import MANIFEST_NAME, LakeWriter
+
+    for manifest in sorted(lake_dir.glob(f"*/{MANIFEST_NAME}")):
+        dataset = manifest.parent.name
+        removed = LakeWriter(dataset, str(lake_dir)).compact(min_files)
+        console.print(f"🧹 {dataset}: {removed} files removed")
+
+
+def main() -> None:
+    app()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,16 @@ SEASON_INFO_OUT = "src/batboy/data/season_info_available.parquet"
 INFO_DB_PATH = "src/batboy/data/season_info_audit.duckdb"
 SEASON_SCHEDULE_DB = "src/batboy/data/season_schedules.duckdb"
 ROSTER_DB_PATH = "src/batboy/data/team_rosters.duckdb"
+GAME_BY_GAME_DB_PATH = "src/batboy/data/game_by_game.duckdb"
+BOX_SCORE_DB_PATH = "src/batboy/data/box_scores.duckdb"
+JOB_QUEUE_DB_PATH = "src/batboy/data/job_queue.duckdb"
+QUERY_CACHE_DB_PATH = "src/batboy/data/query_cache.duckdb"
+METRICS_DB_PATH = "src/batboy/data/metrics.duckdb"
+METRICS_DIR = "src/batboy/data/metrics"
+PAGE_CACHE_DIR = "src/batboy/data/page_cache"
+RATE_LIMIT_STATE_PATH = "src/batboy/data/rate_limit_state.json"
+BROWSER_CACHE_DIR = "src/batboy/data/browser_cache"
+LAKE_DIR = "src/batboy/data/lake"
 
 # Duckdb tables
 SEASON_INFO_TABLE_NAME = "season_info"
@@ -14,6 +24,146 @@ SCHEDULE_LOG_TABLE = "log"
 SCHEDULE_DATA_TABLE = "schedules"
 ROSTER_DATA_TABLE = "rosters"
 ROSTER_LOG_TABLE = "rosters_log"
+GAME_BY_GAME_DATA_TABLE = "game_by_game"
+GAME_BY_GAME_LOG_TABLE = "game_by_game_log"
+LINE_SCORE_TABLE = "line_scores"
+BOX_SCORE_PLAYER_TABLE = "box_score_players"
+BOX_SCORE_LOG_TABLE = "box_scores_log"
+PAGE_HASH_TABLE = "page_hashes"
+JOB_QUEUE_TABLE = "jobs"
+QUERY_CACHE_TABLE = "query_cache"
+METRICS_TABLE = "metrics"
+
+SCHEDULE_LOG_COLUMNS = {
+    "org_id": "INTEGER",
+    "school_name": "TEXT",
+    "season_url": "TEXT",
+    "success": "BOOLEAN",
+    "n_games": "INTEGER",
+    "error": "TEXT",
+}
+ROSTER_LOG_COLUMNS = {
+    "org_id": "INTEGER",
+    "school_name": "TEXT",
+    "season_url": "TEXT",
+    "success": "BOOLEAN",
+    "n_players": "INTEGER",
+    "error": "TEXT",
+}
+GAME_BY_GAME_LOG_COLUMNS = {
+    "org_id": "INTEGER",
+    "school_name": "TEXT",
+    "season_url": "TEXT",
+    "player_url": "TEXT",  # NULL for team-season totals
+    "success": "BOOLEAN",
+    "n_rows": "INTEGER",
+    "error": "TEXT",
+}
+PAGE_HASH_COLUMNS = {
+    "season_url": "TEXT",
+    "content_hash": "TEXT",  # sha256 of the parsed table
+    "n_rows": "INTEGER",
+    "updated_at": "TIMESTAMP",
+}
+BOX_SCORE_LOG_COLUMNS = {
+    "game_id": "BIGINT",
+    "success": "BOOLEAN",
+    "n_players": "INTEGER",
+    "error": "TEXT",
+}
+
+# Browser driver pool
+DRIVER_POOL_SIZE = 2
+DRIVER_MAX_PAGES = 100  # recycle a driver after this many page loads
+DRIVER_MAX_RSS_MB = 1024  # recycle a driver once its process tree exceeds this
+
+# Lean browser profile: resources we never read, blocked via CDP
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.svg",
+    "*.webp",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.css",
+    "*.mp4",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*quantserve.com*",
+    "*scorecardresearch.com*",
+]
+
+LEAN_CHROME_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Readiness waits for rendered pages (seconds)
+READY_TIMEOUT = 10.0
+READY_POLL_INTERVAL = 0.1
+
+# Raw page cache
+PAGE_CACHE_MAX_BYTES = 2 * 1024**3
+CURRENT_SEASON_TTL = 6 * 3600  # seconds; pages for finished seasons never expire
+PAGE_CACHE_TTLS = [
+    # (URL regex, TTL in seconds) — first match wins, float("inf") never expires
+    (r"/contests/\d+/box_score", float("inf")),
+    (r"/teams/history", 24 * 3600),
+    (r"/rankings/", 24 * 3600),
+]
+
+# Adaptive per-host rate limiting (requests per second, AIMD)
+RATE_LIMIT_INITIAL = 0.5
+RATE_LIMIT_MIN = 0.1
+RATE_LIMIT_MAX = 4.0
+RATE_LIMIT_INCREASE = 0.05  # added to the rate after each healthy response
+RATE_LIMIT_DECREASE = 0.5  # rate multiplier after an error, timeout or block
+RATE_LIMIT_BURST = 2.0
+
+# HTTP statuses meaning the host wants us to slow down
+THROTTLE_STATUS_CODES = (403, 429, 503)
+
+# Markers of throttling / bot-wall responses, matched case-insensitively
+BLOCK_PAGE_MARKERS = (
+    "access denied",
+    "request unsuccessful",
+    "too many requests",
+    "attention required",
+    "captcha",
+)
+
+# Buffered DuckDB writes: flush after this many seasons or seconds
+WRITER_FLUSH_EVERY = 25
+WRITER_FLUSH_INTERVAL = 30.0
+
+# Parquet lake output (hive-partitioned copies of the DuckDB tables)
+LAKE_PARTITIONS = ("year", "division")
+LAKE_ROW_GROUP_SIZE = 100_000
+LAKE_COMPACT_MIN_FILES = 8  # compact a partition once it holds this many files
+
+# Leased job queue shared by batch worker processes
+JOB_LEASE_SECONDS = 600.0  # an unfinished claim returns to the queue after this
+JOB_MAX_ATTEMPTS = 3  # failed jobs are retried until they reach this many claims
+JOB_RETRY_DELAY = 60.0  # a failed job waits this long, doubling per attempt
 
 # Global headers for static requests
 HEADERS = {
@@ -24,6 +174,21 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml",
 }
 
+# CSS selectors proving a page's data is present in the HTML. They validate
+# static responses and double as readiness conditions for rendered pages.
+PAGE_SELECTORS = {
+    "teams": 'select[name="org_id"] option',
+    "team_history": "#team_history_data_table tbody tr",
+    "season": ".nav-tabs .nav-link",
+    "tab": ".nav-tabs, table",
+    "schedule": "table.mytable, tr.underline_rows",
+    "roster": "table a[href*='/players/']",
+    "game_by_game": "table a[href*='/contests/']",
+    # Whole game log table; its text changes when the stat category switches
+    "game_by_game_table": "table:has(a[href*='/contests/'])",
+    "box_score": "table a[href*='/players/']",
+}
+
 TRACKED_TABS = {
     "Schedule/Results",
     "Roster",
@@ -32,6 +197,44 @@ TRACKED_TABS = {
     "Ranking Summary",
 }
 
+# Roster page header text -> canonical roster column (covers older layouts)
+ROSTER_HEADER_MAP = {
+    "#": "number",
+    "Jersey": "number",
+    "Name": "player_name",
+    "Player": "player_name",
+    "Class": "class",
+    "Yr": "class",
+    "Year": "class",
+    "Position": "position",
+    "Pos": "position",
+    "Height": "height",
+    "Ht": "height",
+    "Bats": "bats",
+    "Throws": "throws",
+    "Hometown": "hometown",
+    "High School": "highschool",
+    "GP": "gp",
+    "GS": "gs",
+}
+
+# Canonical roster layout (column -> Polars dtype name), identical for every era
+ROSTER_SCHEMA = {
+    "player_id": "Int64",
+    "player_name": "String",
+    "player_url": "String",
+    "gp": "Int64",
+    "gs": "Int64",
+    "number": "String",
+    "class": "String",
+    "position": "String",
+    "height": "String",
+    "bats": "String",
+    "throws": "String",
+    "hometown": "String",
+    "highschool": "String",
+}
+
 STAT_CATEGORY_SCHEMAS = {
     "hitting": [
         "Date",
@@ -175,7 +378,33 @@ FLOAT16_COLUMNS = {"FldPct", "SBAPct", "ERA", "OBPct", "SlgPct", "BA", "IP", "wi
 
 ALL_STAT_COLUMNS = set().union(*STAT_CATEGORY_SCHEMAS.values())
 
+# Schedule / roster / season-info columns stored in compact types
+SMALL_INT_COLUMNS = {
+    "team_score",
+    "opp_score",
+    "innings",
+    "opponent_rank",
+    "gp",
+    "gs",
+    "wins",
+    "losses",
+    "ties",
+}
+DATE_COLUMNS = {"date"}
+DATE_FORMAT = "%m/%d/%Y"
+CATEGORICAL_COLUMNS = {"division", "conference", "class", "position", "bats", "throws"}
+# Closed sets of values stored as enums (anything else becomes null)
+ENUM_CATEGORIES = {"opponent_site": ["", "@", "vs"]}
+
 DEFAULT_DTYPES = {
     **{col: "Int16" for col in INT16_COLUMNS},
     **{col: "Float16" for col in FLOAT16_COLUMNS},
+    **{col: "Int16" for col in SMALL_INT_COLUMNS},
+    "attendance": "Int32",
+    **{col: "Date" for col in DATE_COLUMNS},
+    **{col: "Categorical" for col in CATEGORICAL_COLUMNS},
+    **{col: "Enum" for col in ENUM_CATEGORIES},
 }
+
+# Scrape telemetry: upper bounds (seconds) of the stage latency histograms
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
@@ -0,0 +1,361 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import duckdb
+
+from batboy.config.constants import (
+    METRICS_BUCKETS,
+    METRICS_DB_PATH,
+    METRICS_DIR,
+    METRICS_TABLE,
+)
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+Labels = Tuple[Tuple[str, str], ...]
+
+METRIC_COLUMNS = {
+    "run_id": "TEXT",
+    "batch": "TEXT",
+    "recorded_at": "TIMESTAMP",
+    "kind": "TEXT",  # "histogram" or "counter"
+    "name": "TEXT",
+    "labels": "TEXT",  # JSON object
+    "count": "BIGINT",
+    "sum": "DOUBLE",
+    "p50": "DOUBLE",
+    "p95": "DOUBLE",
+    "max": "DOUBLE",
+}
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (Prometheus-style upper bounds).
+
+    Args:
+        buckets: Increasing bucket upper bounds in seconds; an implicit
+            +Inf bucket catches the rest
+    """
+
+    def __init__(self, buckets: Sequence[float] = METRICS_BUCKETS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding quantile `q` (max for +Inf)."""
+        if not self.count:
+            return None
+        seen = 0
+        for bound, n in zip(self.buckets + [self.max], self.counts):
+            seen += n
+            if seen >= q * self.count:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max if self.count else None,
+        }
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prom_labels(labels: Labels, **extra: str) -> str:
+    pairs = list(labels) + sorted(extra.items())
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def failure_reason(error: BaseException) -> str:
+    """Short label for a failed fetch: blocked, timeout, or the error type."""
+    name = type(error).__name__
+    if name == "BlockedPageError":
+        return "blocked"
+    if "Timeout" in name:
+        return "timeout"
+    return name
+
+
+class Metrics:
+    """
+    Thread-safe scrape telemetry: stage latency histograms and counters.
+
+    Stages are timed with `timer("navigate")` (or observe()), counters are
+    bumped with `inc("pages", source="cache")`. Every fetch, parse, wait
+    and DuckDB write in the scrapers reports to the process-wide instance
+    from get_metrics(), and export_metrics() writes it out at the end of
+    each batch.
+
+    Args:
+        buckets: Histogram bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets: Sequence[float] = METRICS_BUCKETS):
+        self.buckets = list(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms: Dict[str, Histogram] = {}
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            self.started = time.time()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = Histogram(self.buckets)
+            self.histograms[stage].observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Observe the duration of the `with` block, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name: str, n: float = 1, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Total of counter `name` over all label sets matching `labels`."""
+        wanted = set(_labels(labels))
+        with self._lock:
+            return sum(
+                value
+                for (counter, key), value in self.counters.items()
+                if counter == name and wanted <= set(key)
+            )
+
+    def cache_hit_rate(self) -> Optional[float]:
+        hits = self.counter("cache_lookups", result="hit")
+        lookups = self.counter("cache_lookups")
+        return hits / lookups if lookups else None
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready snapshot: stage summaries, counters and cache hit rate."""
+        with self._lock:
+            stages = {
+                stage: hist.summary() for stage, hist in sorted(self.histograms.items())
+            }
+            counters: Dict[str, List[Dict[str, Any]]] = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters.setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+            started = self.started
+        return {
+            "started_at": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+            "elapsed_seconds": time.time() - started,
+            "stages": stages,
+            "counters": counters,
+            "cache_hit_rate": self.cache_hit_rate(),
+        }
+
+    def to_prometheus(self, prefix: str = "batboy", **labels: str) -> str:
+        """Render in the Prometheus text exposition format."""
+        base = _labels(labels)
+        lines = [
+            f"# HELP {prefix}_stage_seconds Latency of scrape stages in seconds.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, hist in sorted(self.histograms.items()):
+                stage_labels = base + (("stage", stage),)
+                cumulative = 0
+                for bound, n in zip(hist.buckets + ["+Inf"], hist.counts):
+                    cumulative += n
+                    le = _prom_labels(stage_labels, le=str(bound))
+                    lines.append(f"{prefix}_stage_seconds_bucket{le} {cumulative}")
+                tags = _prom_labels(stage_labels)
+                lines.append(f"{prefix}_stage_seconds_sum{tags} {hist.sum}")
+                lines.append(f"{prefix}_stage_seconds_count{tags} {hist.count}")
+
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                for (counter, key), value in sorted(self.counters.items()):
+                    if counter == name:
+                        tags = _prom_labels(tuple(sorted(base + key)))
+                        lines.append(f"{prefix}_{name}_total{tags} {value:g}")
+
+        hit_rate = self.cache_hit_rate()
+        if hit_rate is not None:
+            lines.append(f"# TYPE {prefix}_cache_hit_ratio gauge")
+            lines.append(f"{prefix}_cache_hit_ratio{_prom_labels(base)} {hit_rate}")
+        return "\n".join(lines) + "\n"
+
+    def rows(self, run_id: str, batch: str) -> List[Dict[str, Any]]:
+        """One METRICS_TABLE row per stage histogram and counter label set."""
+        now = datetime.now()
+        common = {"run_id": run_id, "batch": batch, "recorded_at": now}
+        rows = []
+        with self._lock:
+            for stage, hist in sorted(self.histograms.items()):
+                s = hist.summary()
+                rows.append(
+                    {
+                        **common,
+                        "kind": "histogram",
+                        "name": stage,
+                        "labels": "{}",
+                        "count": s["count"],
+                        "sum": s["sum"],
+                        "p50": s["p50"],
+                        "p95": s["p95"],
+                        "max": s["max"],
+                    }
+                )
+            for (name, labels), value in sorted(self.counters.items()):
+                rows.append(
+                    {
+                        **common,
+                        "kind": "counter",
+                        "name": name,
+                        "labels": json.dumps(dict(labels)),
+                        "count": None,
+                        "sum": value,
+                        "p50": None,
+                        "p95": None,
+                        "max": None,
+                    }
+                )
+        return rows
+
+
+_METRICS = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """The process-wide telemetry registry."""
+    return _METRICS
+
+
+def timed(stage: str):
+    """Time the `with` block as `stage` in the process-wide registry."""
+    return _METRICS.timer(stage)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+_EXPORT_DIR: Optional[str] = METRICS_DIR
+_EXPORT_DB: Optional[str] = METRICS_DB_PATH
+
+
+def configure_metrics_export(
+    metrics_dir: Optional[str] = METRICS_DIR, db_path: Optional[str] = METRICS_DB_PATH
+) -> None:
+    """Where export_metrics writes files and the metrics table (None skips)."""
+    global _EXPORT_DIR, _EXPORT_DB
+    _EXPORT_DIR = metrics_dir
+    _EXPORT_DB = db_path
+
+
+def export_metrics(
+    batch: str, metrics: Optional[Metrics] = None, reset: bool = True
+) -> Dict[str, Any]:
+    """
+    Write the telemetry of a finished batch and start a fresh window.
+
+    - `<metrics_dir>/batboy_<batch>.prom`: Prometheus textfile (for the
+      node_exporter textfile collector), replaced atomically
+    - `<metrics_dir>/<batch>.json`: JSON summary of the run
+    - METRICS_TABLE in the metrics DB: one row per stage and counter,
+      tagged with a run_id, for comparing runs over time
+
+    Destinations are set with configure_metrics_export().
+
+    Args:
+        batch: Batch name (e.g. "schedules"), used as a label and file name
+        metrics: Registry to export (defaults to the process-wide one)
+        reset: Clear the registry afterwards
+
+    Returns:
+        The JSON summary, with its run_id.
+    """
+    metrics = metrics or _METRICS
+    run_id = uuid.uuid4().hex[:12]
+    summary = {"run_id": run_id, "batch": batch, **metrics.summary()}
+
+    if _EXPORT_DIR is not None:
+        directory = Path(_EXPORT_DIR)
+        _write_atomic(
+            directory / f"batboy_{batch}.prom", metrics.to_prometheus(batch=batch)
+        )
+        _write_atomic(directory / f"{batch}.json", json.dumps(summary, indent=1))
+
+    if _EXPORT_DB is not None:
+        _store_metrics(_EXPORT_DB, metrics.rows(run_id, batch))
+
+    if reset:
+        metrics.reset()
+    hit_rate = summary["cache_hit_rate"]
+    logger.info(
+        f"📈 {batch} metrics: {len(summary['stages'])} stages, "
+        f"cache hit rate {'-' if hit_rate is None else f'{hit_rate:.0%}'} "
+        f"(run {run_id})"
+    )
+    return summary
+
+
+def _store_metrics(db_path: str, rows: List[Dict[str, Any]]) -> None:
+    from batboy.storage.writer import db_lock
+
+    if not rows:
+        return
+    columns = list(METRIC_COLUMNS)
+    with db_lock(db_path):
+        con = duckdb.connect(db_path)
+        try:
+            definition = ", ".join(f"{k} {v}" for k, v in METRIC_COLUMNS.items())
+            con.execute(f"CREATE TABLE IF NOT EXISTS {METRICS_TABLE} ({definition})")
+            placeholders = ", ".join("?" for _ in columns)
+            con.executemany(
+                f"INSERT INTO {METRICS_TABLE} ({', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                [[row[col] for col in columns] for row in rows],
+            )
+        finally:
+            con.close()
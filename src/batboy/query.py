@@ -0,0 +1,309 @@
+import hashlib
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import duckdb
+import polars as pl
+
+from batboy.config.constants import (
+    INFO_DB_PATH,
+    QUERY_CACHE_DB_PATH,
+    QUERY_CACHE_TABLE,
+    ROSTER_DATA_TABLE,
+    ROSTER_DB_PATH,
+    ROSTER_LOG_TABLE,
+    SCHEDULE_DATA_TABLE,
+    SCHEDULE_LOG_TABLE,
+    SEASON_INFO_TABLE_NAME,
+    SEASON_SCHEDULE_DB,
+)
+from batboy.storage.writer import db_lock
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+# Alias -> (database file, data table, table whose row count signals new data)
+SOURCES = {
+    "info": (INFO_DB_PATH, SEASON_INFO_TABLE_NAME, SEASON_INFO_TABLE_NAME),
+    "sched": (SEASON_SCHEDULE_DB, SCHEDULE_DATA_TABLE, SCHEDULE_LOG_TABLE),
+    "roster": (ROSTER_DB_PATH, ROSTER_DATA_TABLE, ROSTER_LOG_TABLE),
+}
+
+# Venue of a schedule row: the home team for home games, the opponent for
+# road games, and the location note ("@ Omaha, NE") for neutral sites
+SITE_LABEL = """
+    CASE opponent_site WHEN '@' THEN 'away' WHEN 'vs' THEN 'neutral' ELSE 'home' END
+"""
+VENUE = """
+    CASE opponent_site
+        WHEN '@' THEN opponent_name
+        WHEN 'vs' THEN NULLIF(trim(ltrim(opponent_note, '@')), '')
+        ELSE school_name
+    END
+"""
+RECORD_COLUMNS = """
+    count(*) AS games,
+    count(*) FILTER (WHERE team_score > opp_score) AS wins,
+    count(*) FILTER (WHERE team_score < opp_score) AS losses,
+    count(*) FILTER (WHERE team_score = opp_score) AS ties,
+    sum(team_score) AS runs_scored,
+    sum(opp_score) AS runs_allowed
+"""
+
+
+def _literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _where(*conditions: Optional[str], **equals: Any) -> str:
+    """WHERE clause from raw conditions and column = value filters (None skips)."""
+    parts = [c for c in conditions if c]
+    parts += [f"{col} = {_literal(v)}" for col, v in equals.items() if v is not None]
+    return f"WHERE {' AND '.join(parts)}" if parts else ""
+
+
+class Query:
+    """
+    Read-side API over the schedules, rosters and season_info databases.
+
+    The databases are ATTACHed read-only to one in-memory DuckDB connection.
+    Every query method returns a lazy DuckDB relation: nothing runs until it
+    is collected (`.pl()`, `.fetchall()`), filters given as arguments are
+    pushed down into the table scans, and relations compose further
+    (`.filter()`, `.aggregate()`, joins). Expensive aggregates can be served
+    from a cache with cached().
+
+    Close the Query (or use it as a context manager) to release the files;
+    a database a batch job is writing cannot be attached meanwhile.
+
+    Args:
+        sources: Alias -> (db file, data table, signal table); defaults to
+            SOURCES. Missing files are skipped.
+        cache_db: DuckDB file holding materialized aggregates (None disables
+            caching)
+    """
+
+    def __init__(
+        self,
+        sources: Optional[Dict[str, tuple]] = None,
+        cache_db: Optional[str] = QUERY_CACHE_DB_PATH,
+    ):
+        self.sources = sources or SOURCES
+        self.cache_db = cache_db
+        self.con = duckdb.connect()
+        self.attached: List[str] = []
+        for alias, (db_path, _, _) in self.sources.items():
+            if os.path.exists(db_path):
+                escaped = db_path.replace("'", "''")
+                self.con.execute(f"ATTACH '{escaped}' AS {alias} (READ_ONLY)")
+                self.attached.append(alias)
+
+    def __enter__(self) -> "Query":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.con.close()
+
+    def _table(self, alias: str) -> str:
+        if alias not in self.attached:
+            raise FileNotFoundError(
+                f"❌ No {alias} database at {self.sources[alias][0]}"
+            )
+        return f"{alias}.{self.sources[alias][1]}"
+
+    def _has_table(self, alias: str, table: str) -> bool:
+        return (
+            alias in self.attached
+            and self.con.execute(
+                "SELECT 1 FROM duckdb_tables() "
+                "WHERE database_name = ? AND table_name = ?",
+                [alias, table],
+            ).fetchone()
+            is not None
+        )
+
+    # Base tables
+
+    def schedules(
+        self,
+        year: Optional[str] = None,
+        org_id: Optional[int] = None,
+        season_url: Optional[str] = None,
+    ) -> duckdb.DuckDBPyRelation:
+        """Schedule rows, optionally for one season label, team or season."""
+        where = _where(year=year, org_id=org_id, season_url=season_url)
+        return self.con.sql(f"SELECT * FROM {self._table('sched')} {where}")
+
+    def rosters(
+        self,
+        year: Optional[str] = None,
+        org_id: Optional[int] = None,
+        season_url: Optional[str] = None,
+    ) -> duckdb.DuckDBPyRelation:
+        """Roster rows, optionally for one season label, team or season."""
+        where = _where(year=year, org_id=org_id, season_url=season_url)
+        return self.con.sql(f"SELECT * FROM {self._table('roster')} {where}")
+
+    def season_info(
+        self,
+        year: Optional[str] = None,
+        org_id: Optional[int] = None,
+        division: Optional[str] = None,
+    ) -> duckdb.DuckDBPyRelation:
+        """season_info rows, optionally for one season label, team or division."""
+        where = _where(year=year, org_id=org_id, division=division)
+        return self.con.sql(f"SELECT * FROM {self._table('info')} {where}")
+
+    # Aggregates
+
+    def team_season_record(
+        self, year: Optional[str] = None, org_id: Optional[int] = None
+    ) -> duckdb.DuckDBPyRelation:
+        """Won-lost record and runs per team-season, over completed games."""
+        where = _where("team_score IS NOT NULL", year=year, org_id=org_id)
+        return self.con.sql(f"""
+            SELECT org_id, any_value(school_name) AS school_name,
+                   season_url, any_value(year) AS year,
+                   {RECORD_COLUMNS}
+            FROM {self._table("sched")}
+            {where}
+            GROUP BY org_id, season_url
+            ORDER BY year, org_id
+        """)
+
+    def head_to_head(
+        self, org_id: int, opponent_org_id: int, year: Optional[str] = None
+    ) -> duckdb.DuckDBPyRelation:
+        """
+        Season-by-season record of one team against another.
+
+        Schedules name opponents by their team-season id, so opponents are
+        resolved to org_ids through season_info.
+        """
+        where = _where("team_score IS NOT NULL", org_id=org_id, year=year)
+        return self.con.sql(f"""
+            SELECT year, {RECORD_COLUMNS}
+            FROM {self._table("sched")}
+            {where}
+              AND '/teams/' || opponent_id IN (
+                  SELECT season_url FROM {self._table("info")}
+                  WHERE org_id = {_literal(opponent_org_id)}
+              )
+            GROUP BY year
+            ORDER BY year
+        """)
+
+    def home_away_splits(
+        self, year: Optional[str] = None, org_id: Optional[int] = None
+    ) -> duckdb.DuckDBPyRelation:
+        """Record, runs and attendance per team-season at home, away and neutral."""
+        where = _where("team_score IS NOT NULL", year=year, org_id=org_id)
+        return self.con.sql(f"""
+            SELECT org_id, any_value(school_name) AS school_name, year,
+                   {SITE_LABEL} AS site,
+                   {RECORD_COLUMNS},
+                   avg(attendance) AS avg_attendance
+            FROM {self._table("sched")}
+            {where}
+            GROUP BY org_id, year, site
+            ORDER BY org_id, year, site
+        """)
+
+    def attendance_by_venue(
+        self, year: Optional[str] = None, min_games: int = 1
+    ) -> duckdb.DuckDBPyRelation:
+        """
+        Attendance per venue and season.
+
+        Each contest appears in both teams' schedules; it is counted once,
+        with its venue taken from the home team's row when there is one.
+        """
+        where = _where("game_id IS NOT NULL", year=year)
+        return self.con.sql(f"""
+            WITH games AS (
+                SELECT game_id, any_value(year) AS year,
+                       first({VENUE} ORDER BY opponent_site = '' DESC) AS venue,
+                       max(attendance) AS attendance
+                FROM {self._table("sched")}
+                {where}
+                GROUP BY game_id
+            )
+            SELECT venue, year, count(*) AS games,
+                   sum(attendance) AS total_attendance,
+                   avg(attendance) AS avg_attendance,
+                   max(attendance) AS max_attendance
+            FROM games
+            WHERE venue IS NOT NULL
+            GROUP BY venue, year
+            HAVING count(*) >= {int(min_games)}
+            ORDER BY total_attendance DESC NULLS LAST
+        """)
+
+    # Materialized cache
+
+    def signature(self) -> str:
+        """
+        Row counts of the log tables (and season_info). Every batch job
+        appends log rows as it writes seasons, so a changed signature means
+        new or refreshed data.
+        """
+        parts = []
+        for alias, (_, _, signal) in sorted(self.sources.items()):
+            if self._has_table(alias, signal):
+                n = self.con.sql(f"SELECT count(*) FROM {alias}.{signal}").fetchone()
+                parts.append(f"{alias}.{signal}={n[0]}")
+        return ";".join(parts)
+
+    def cached(self, relation: duckdb.DuckDBPyRelation) -> pl.DataFrame:
+        """
+        Collect `relation`, materializing it in the cache database.
+
+        Results are keyed by the relation's SQL and stored with the current
+        signature(); a later call with the same SQL reads the stored table
+        while the signature is unchanged and rebuilds it otherwise.
+        """
+        if self.cache_db is None:
+            return relation.pl()
+
+        sql = relation.sql_query()
+        key = hashlib.sha1(sql.encode("utf-8")).hexdigest()[:16]
+        table = f"cache.agg_{key}"
+        signature = self.signature()
+
+        with db_lock(self.cache_db):
+            escaped = self.cache_db.replace("'", "''")
+            self.con.execute(f"ATTACH '{escaped}' AS cache")
+            try:
+                self.con.execute(f"""
+                    CREATE TABLE IF NOT EXISTS cache.{QUERY_CACHE_TABLE} (
+                        key TEXT PRIMARY KEY, signature TEXT, query TEXT,
+                        n_rows BIGINT, built_at TIMESTAMP
+                    )
+                """)
+                stored = self.con.execute(
+                    f"SELECT signature FROM cache.{QUERY_CACHE_TABLE} WHERE key = ?",
+                    [key],
+                ).fetchone()
+                if stored is not None and stored[0] == signature:
+                    logger.debug(f"🎯 Query cache hit {key}")
+                    return self.con.sql(f"SELECT * FROM {table}").pl()
+
+                logger.info(f"🧮 Materializing aggregate {key}")
+                self.con.execute(f"CREATE OR REPLACE TABLE {table} AS {sql}")
+                n_rows = self.con.sql(f"SELECT count(*) FROM {table}").fetchone()[0]
+                self.con.execute(
+                    f"INSERT OR REPLACE INTO cache.{QUERY_CACHE_TABLE} "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [key, signature, sql, n_rows, datetime.now()],
+                )
+                return self.con.sql(f"SELECT * FROM {table}").pl()
+            finally:
+                self.con.execute("DETACH cache")
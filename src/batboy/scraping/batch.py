@@ -0,0 +1,190 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+import polars as pl
+
+from batboy.metrics import failure_reason, get_metrics, timed
+from batboy.scraping.core import ensure_pool_capacity
+from batboy.scraping.progress import BatchProgress, get_progress
+from batboy.storage.queue import JobQueue, default_owner
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+Row = Dict[str, Any]
+ScrapeFn = Callable[[Row], pl.DataFrame]
+WriteFn = Callable[[Row, Optional[pl.DataFrame], Optional[Exception]], None]
+
+
+def run_batch(
+    pending: pl.DataFrame,
+    scrape: ScrapeFn,
+    write: WriteFn,
+    workers: int = 1,
+) -> None:
+    """
+    Scrape every pending row, optionally across a pool of browser workers.
+
+    `scrape(row)` runs on worker threads and may only fetch and parse.
+    `write(row, df, error)` always runs on the calling thread, one row at a
+    time, so DuckDB never sees concurrent writers and each season is logged
+    as soon as it finishes (keeping per-season_url resume semantics).
+    Politeness across workers comes from the shared rate limiter. Targets
+    (by status) and scraped rows are counted in the metrics and in the
+    configured BatchProgress, if any.
+
+    Args:
+        pending: Target rows (e.g. from get_pending_schedule_targets)
+        scrape: Fetch + parse one target, returning its rows
+        write: Persist one result, or log `error` if scraping raised
+        workers: Number of concurrent scrape workers
+    """
+    rows = pending.iter_rows(named=True)
+    progress = get_progress()
+    if progress is not None:
+        progress.add_total(pending.shape[0])
+    scrape = _timed(scrape)
+    write = _counted(write, progress)
+
+    if workers <= 1:
+        for row in rows:
+            _scrape_and_write(row, scrape, write)
+        return
+
+    ensure_pool_capacity(workers)
+    logger.info(f"🧵 Scraping {pending.shape[0]} targets with {workers} workers")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight: Dict[Future, Row] = {}
+
+        def submit_next() -> bool:
+            row = next(rows, None)
+            if row is None:
+                return False
+            in_flight[executor.submit(scrape, row)] = row
+            return True
+
+        # Keep a small backlog queued so workers never idle between writes
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                row = in_flight.pop(future)
+                error = future.exception()
+                if error is None:
+                    write(row, future.result(), None)
+                else:
+                    write(row, None, error)  # type: ignore[arg-type]
+                submit_next()
+
+
+def run_queue(
+    queue: JobQueue,
+    kind: str,
+    key: str,
+    scrape: ScrapeFn,
+    write: WriteFn,
+    workers: int = 1,
+    owner: Optional[str] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Claim and work jobs of one kind until the queue has none left to claim.
+
+    Jobs are claimed a few at a time and run through run_batch. After
+    `write` returns, a job is completed, or failed when scraping raised, so
+    `write` must have persisted the result by then (use a writer with
+    flush_every=1). When only failed jobs waiting out their retry backoff
+    are left, this sleeps until the next one is due. Several processes may
+    run this on the same queue.
+
+    Args:
+        queue: Shared job queue
+        kind: Job kind to work (e.g. "schedules")
+        key: Payload column the jobs were enqueued under
+        scrape, write: As for run_batch
+        workers: Number of concurrent scrape workers
+        owner: Lease owner id (defaults to host:pid)
+        batch_size: Jobs claimed at a time (defaults to 2 per worker)
+
+    Returns:
+        Number of jobs worked.
+    """
+    owner = owner or default_owner()
+    batch_size = batch_size or max(1, workers) * 2
+
+    def write_and_settle(
+        row: Row, df: Optional[pl.DataFrame], error: Optional[Exception]
+    ) -> None:
+        write(row, df, error)
+        if error is None:
+            queue.complete(kind, row[key], owner)
+        else:
+            queue.fail(kind, row[key], owner, str(error))
+
+    worked = 0
+    while True:
+        claimed = queue.claim(kind, owner, batch_size)
+        if claimed.is_empty():
+            delay = queue.next_retry_in(kind)
+            if delay is None:
+                break
+            logger.info(f"⏳ Waiting {delay:.0f}s for the next {kind} retry")
+            time.sleep(delay)
+            continue
+        run_batch(claimed, scrape, write_and_settle, workers=workers)
+        worked += claimed.shape[0]
+
+    logger.info(f"🏁 {owner} worked {worked} {kind} jobs; queue: {queue.counts(kind)}")
+    return worked
+
+
+def _timed(scrape: ScrapeFn) -> ScrapeFn:
+    def timed_scrape(row: Row) -> pl.DataFrame:
+        with timed("scrape"):
+            return scrape(row)
+
+    return timed_scrape
+
+
+def _counted(write: WriteFn, progress: Optional[BatchProgress]) -> WriteFn:
+    metrics = get_metrics()
+
+    def write_and_count(
+        row: Row, df: Optional[pl.DataFrame], error: Optional[Exception]
+    ) -> None:
+        with timed("write"):
+            write(row, df, error)
+        rows = _n_rows(df)
+        if error is None:
+            metrics.inc("targets", status="ok")
+            metrics.inc("rows", rows)
+        else:
+            metrics.inc("targets", status="failed")
+            metrics.inc("target_failures", reason=failure_reason(error))
+        if progress is not None:
+            progress.advance(rows=rows, failed=error is not None)
+
+    return write_and_count
+
+
+def _n_rows(result: Any) -> int:
+    """Rows in a scrape result: a frame, a table -> frame mapping, or None."""
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        return sum(df.shape[0] for df in result.values())
+    return result.shape[0]
+
+
+def _scrape_and_write(row: Row, scrape: ScrapeFn, write: WriteFn) -> None:
+    try:
+        df = scrape(row)
+    except Exception as e:
+        write(row, None, e)
+        return
+    write(row, df, None)
@@ -0,0 +1,296 @@
+from typing import Dict, List, Optional
+
+import polars as pl
+from selectolax.parser import HTMLParser, Node
+
+from batboy.config.constants import (
+    BASE_DOMAIN,
+    BOX_SCORE_DB_PATH,
+    BOX_SCORE_LOG_COLUMNS,
+    BOX_SCORE_LOG_TABLE,
+    BOX_SCORE_PLAYER_TABLE,
+    LINE_SCORE_TABLE,
+    PAGE_SELECTORS,
+    SCHEDULE_DATA_TABLE,
+    SEASON_SCHEDULE_DB,
+    STAT_CATEGORY_SCHEMAS,
+)
+from batboy.metrics import export_metrics, timed
+from batboy.scraping.batch import run_batch
+from batboy.scraping.cache import get_page_cache
+from batboy.scraping.core import fetch_dom
+from batboy.scraping.parsing import (
+    PLAYER_ID_PATTERN,
+    TEAM_ID_PATTERN,
+    detect_category,
+    link_id,
+    to_int,
+)
+from batboy.storage.pending import get_pending_targets
+from batboy.storage.schema import apply_schema
+from batboy.storage.shards import shard_db_path
+from batboy.storage.writer import DuckDBWriter
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+BOX_SCORE_CATEGORIES = ("hitting", "pitching")
+NAME_HEADERS = {"Name", "Player"}
+
+
+def _cells(row: Node) -> List[Node]:
+    return [child for child in row.iter() if child.tag in ("td", "th")]
+
+
+def _parse_line_score(dom: HTMLParser, game_id: int) -> pl.DataFrame:
+    """
+    Extract the line score: one row per team with runs by inning and R/H/E.
+
+    The first team row is the visitor (team_index 0), the second the home
+    team (team_index 1).
+    """
+    for table in dom.css("table"):
+        rows = table.css("tr")
+        if not rows:
+            continue
+        headers = [c.text(strip=True) for c in _cells(rows[0])]
+        if not {"1", "R", "H", "E"} <= set(headers):
+            continue
+
+        inning_positions = [i for i, h in enumerate(headers) if h.isdigit()]
+        records = []
+        for row in rows[1:]:
+            cells = _cells(row)
+            if len(cells) != len(headers):
+                continue
+            records.append(
+                {
+                    "game_id": game_id,
+                    "team_index": len(records),
+                    "team_name": cells[0].text(strip=True),
+                    "team_id": link_id(cells[0], TEAM_ID_PATTERN),
+                    "runs_by_inning": [
+                        to_int(cells[i].text(strip=True)) for i in inning_positions
+                    ],
+                    **{
+                        col: cells[headers.index(col)].text(strip=True)
+                        for col in ("R", "H", "E")
+                    },
+                }
+            )
+        return pl.DataFrame(
+            records,
+            schema_overrides={
+                "team_id": pl.Int64,
+                "runs_by_inning": pl.List(pl.Int16),
+            },
+        )
+
+    logger.warning(f"❌ No line score found for game {game_id}")
+    return pl.DataFrame()
+
+
+def _parse_player_lines(
+    dom: HTMLParser, game_id: int, teams: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+    """
+    Extract batting and pitching lines for both teams.
+
+    Every table listing players is classified by its headers; tables of the
+    same category are assigned to the visitor then the home team in page
+    order, and named from the line score when it is given.
+    """
+    team_names = []
+    if teams is not None and "team_name" in teams.columns:
+        team_names = teams["team_name"].to_list()
+    seen: Dict[str, int] = {}
+    frames = []
+
+    for table in dom.css("table"):
+        if not table.css_first("a[href*='/players/']"):
+            continue
+        header_row = table.css_first("thead tr") or table.css_first("tr")
+        headers = [c.text(strip=True) for c in _cells(header_row)]
+        category = detect_category(headers)
+        if category not in BOX_SCORE_CATEGORIES:
+            continue
+        name_index = next((i for i, h in enumerate(headers) if h in NAME_HEADERS), 0)
+        schema = set(STAT_CATEGORY_SCHEMAS[category])
+        stat_positions = {i: h for i, h in enumerate(headers) if h in schema}
+
+        team_index = seen.get(category, 0)
+        seen[category] = team_index + 1
+
+        records = []
+        for row in table.css("tbody tr"):
+            cells = _cells(row)
+            if len(cells) != len(headers):
+                continue
+            player_id = link_id(cells[name_index], PLAYER_ID_PATTERN)
+            if player_id is None:
+                continue  # totals and spacer rows
+            record = {
+                "game_id": game_id,
+                "category": category,
+                "team_index": team_index,
+                "team_name": team_names[team_index]
+                if team_index < len(team_names)
+                else None,
+                "player_id": player_id,
+                "player_name": cells[name_index].text(strip=True),
+                "position": cells[headers.index("Pos")].text(strip=True)
+                if "Pos" in headers
+                else None,
+            }
+            for i, col in stat_positions.items():
+                record[col] = cells[i].text(strip=True)
+            records.append(record)
+        if records:
+            frames.append(pl.DataFrame(records, infer_schema_length=None))
+
+    if not frames:
+        return pl.DataFrame()
+    return pl.concat(frames, how="diagonal_relaxed")
+
+
+def _category_link(dom: HTMLParser, label: str) -> Optional[str]:
+    """Href of a link labelled `label` (e.g. "Pitching"), if it leads elsewhere."""
+    for link in dom.css("a"):
+        href = link.attrs.get("href") or ""
+        if link.text(strip=True).lower() == label.lower() and href.startswith("/"):
+            return href
+    return None
+
+
+def get_box_score(game_id: int) -> Dict[str, pl.DataFrame]:
+    """
+    Scrape the box score of one contest.
+
+    Args:
+        game_id: Contest id (the `game_id` column of the schedules table)
+
+    Returns:
+        Mapping of table name -> frame: the line score (LINE_SCORE_TABLE) and
+        the batting and pitching lines of both teams (BOX_SCORE_PLAYER_TABLE),
+        cast with DEFAULT_DTYPES.
+    """
+    url = f"{BASE_DOMAIN}/contests/{game_id}/box_score"
+    dom = fetch_dom(url, PAGE_SELECTORS["box_score"])
+    if dom is None or dom.root is None:
+        raise ValueError(f"❌ Failed to load DOM for box score: {url}")
+
+    with timed("parse_box_score"):
+        line_score = _parse_line_score(dom, game_id)
+        players = _parse_player_lines(dom, game_id, line_score)
+
+    # Some box scores show one category per page; follow the other one
+    found = set(players["category"].unique()) if not players.is_empty() else set()
+    for category in BOX_SCORE_CATEGORIES:
+        href = _category_link(dom, category.title()) if category not in found else None
+        if href is None:
+            continue
+        other = fetch_dom(f"{BASE_DOMAIN}{href}", PAGE_SELECTORS["box_score"])
+        if other is not None and other.root is not None:
+            with timed("parse_box_score"):
+                extra = _parse_player_lines(other, game_id, line_score)
+            extra = (
+                extra.filter(pl.col("category") == category) if extra.height else extra
+            )
+            players = pl.concat([players, extra], how="diagonal_relaxed")
+
+    logger.info(
+        f"Parsed line score ({line_score.shape[0]} teams) and "
+        f"{players.shape[0]} player lines for game {game_id}"
+    )
+    return {
+        LINE_SCORE_TABLE: apply_schema(line_score),
+        BOX_SCORE_PLAYER_TABLE: apply_schema(players),
+    }
+
+
+def get_pending_box_score_targets(limit: Optional[int] = None) -> pl.DataFrame:
+    """
+    Distinct game_ids from the schedules table that have not been scraped.
+
+    Each contest appears in both teams' schedules but is fetched only once.
+
+    Returns:
+        Polars DataFrame with a single "game_id" column.
+    """
+    return get_pending_targets(
+        BOX_SCORE_DB_PATH,
+        BOX_SCORE_LOG_TABLE,
+        BOX_SCORE_LOG_COLUMNS,
+        SEASON_SCHEDULE_DB,
+        f"""
+            SELECT DISTINCT game_id
+            FROM source.{SCHEDULE_DATA_TABLE}
+            WHERE game_id IS NOT NULL
+        """,
+        key="game_id",
+        limit=limit,
+        shard_column="game_id",
+    )
+
+
+def batch_scrape_box_scores(limit: Optional[int] = None, workers: int = 1) -> None:
+    """
+    Batch scrape box scores for every distinct scheduled game with resume logic.
+
+    Args:
+        limit: Optional limit to number of games to process
+        workers: Number of concurrent workers (writes stay serial)
+    """
+    logger.info(
+        f"\n🚦 Starting batch scrape of box scores (limit={limit}, workers={workers})"
+    )
+    pending = get_pending_box_score_targets(limit)
+
+    if pending.is_empty():
+        logger.info("📭 Nothing to scrape — all box scores are logged.")
+        return
+
+    def scrape(row: dict) -> Dict[str, pl.DataFrame]:
+        logger.info(f"\n📦 Box score for game {row['game_id']}")
+        tables = get_box_score(row["game_id"])
+        # A page that loaded but parsed to nothing (layout change, error
+        # page) is logged as a failed target, not a success with no rows
+        if all(df.is_empty() for df in tables.values()):
+            raise ValueError(f"No line score or player lines for game {row['game_id']}")
+        return tables
+
+    writer = DuckDBWriter(
+        shard_db_path(BOX_SCORE_DB_PATH),
+        BOX_SCORE_PLAYER_TABLE,
+        log_table=BOX_SCORE_LOG_TABLE,
+        log_columns=BOX_SCORE_LOG_COLUMNS,
+    )
+
+    def write(
+        row: dict,
+        tables: Optional[Dict[str, pl.DataFrame]],
+        error: Optional[Exception],
+    ):
+        log = {"game_id": row["game_id"]}
+        if error is not None or tables is None:
+            logger.error(f"❌ Failed: {error}")
+            writer.add(
+                log={**log, "success": False, "n_players": 0, "error": str(error)}
+            )
+            return
+
+        n_players = tables[BOX_SCORE_PLAYER_TABLE].shape[0]
+        writer.add(tables, log={**log, "success": True, "n_players": n_players})
+        logger.info(f"✅ Scraped {n_players} player lines.")
+
+    with writer:
+        run_batch(pending, scrape, write, workers=workers)
+
+    cache = get_page_cache()
+    if cache is not None:
+        logger.info(f"📦 Page cache: {cache.stats()}")
+    export_metrics("box_scores")
+
+
+if __name__ == "__main__":
+    batch_scrape_box_scores(limit=1000)
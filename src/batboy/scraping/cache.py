@@ -0,0 +1,288 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from selectolax.parser import HTMLParser
+
+from batboy.config.constants import (
+    CURRENT_SEASON_TTL,
+    PAGE_CACHE_DIR,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_TTLS,
+)
+from batboy.metrics import get_metrics
+from batboy.utils import setup_logger
+
+try:  # Python 3.14+
+    from compression import zstd as _zstd  # type: ignore[import-not-found]
+except ImportError:
+    try:
+        import zstandard as _zstd  # type: ignore[import-not-found, no-redef]
+    except ImportError:
+        _zstd = None
+
+logger = setup_logger()
+
+# What a truncated or garbled entry raises while being decoded
+CORRUPT_ENTRY_ERRORS: Tuple[type, ...] = (
+    OSError,
+    EOFError,
+    ValueError,
+    KeyError,
+    TypeError,
+)
+if _zstd is not None and hasattr(_zstd, "ZstdError"):
+    CORRUPT_ENTRY_ERRORS += (_zstd.ZstdError,)
+
+FOREVER = float("inf")
+
+
+def _compress(data: bytes) -> Tuple[bytes, str]:
+    if _zstd is not None:
+        return _zstd.compress(data), ".zst"
+    return gzip.compress(data, compresslevel=6), ".gz"
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        if _zstd is None:
+            raise ValueError("zstd-compressed cache entry but no zstd codec")
+        return _zstd.decompress(data)
+    return gzip.decompress(data)
+
+
+def season_ttl(year: str, today: Optional[date] = None) -> float:
+    """
+    TTL for a team-season page given its year label (e.g. "2024-25").
+
+    Seasons wrap up by July of their second calendar year, after which the
+    page is frozen and cached forever. Unparseable labels get the short
+    current-season TTL.
+    """
+    m = re.match(r"(\d{4})", year or "")
+    if not m:
+        return CURRENT_SEASON_TTL
+    season_end = date(int(m.group(1)) + 1, 7, 1)
+    return FOREVER if (today or date.today()) >= season_end else CURRENT_SEASON_TTL
+
+
+def url_ttl(url: str) -> float:
+    """TTL for a URL from the PAGE_CACHE_TTLS classes."""
+    for pattern, ttl in PAGE_CACHE_TTLS:
+        if re.search(pattern, url):
+            return ttl
+    return CURRENT_SEASON_TTL
+
+
+def keep_subtree(html: str, selector: str) -> str:
+    """Reduce a page to the outer HTML of the nodes matching `selector`."""
+    nodes = HTMLParser(html).css(selector)
+    inner = "".join(node.html or "" for node in nodes)
+    return f"<html><body>{inner}</body></html>"
+
+
+class PageCache:
+    """
+    Content-addressed, compressed on-disk cache of raw page HTML.
+
+    Entries are keyed by the SHA-256 of the URL and stored as
+    `<dir>/<key[:2]>/<key>.html.{zst,gz}` with a one-line JSON header that
+    records the URL, store time and TTL. Reads refresh an entry's mtime,
+    and once the directory exceeds `max_bytes` the least recently used
+    entries are evicted.
+
+    Args:
+        cache_dir: Directory holding cache entries
+        max_bytes: Size bound for the whole cache directory
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = PAGE_CACHE_DIR,
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "corrupt": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_written": 0,
+        }
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, url: str) -> List[Path]:
+        key = self.key(url)
+        folder = self.cache_dir / key[:2]
+        return [folder / f"{key}.html{suffix}" for suffix in (".zst", ".gz")]
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached HTML for `url`, or None on a miss or expired entry."""
+        for path in self._paths(url):
+            try:
+                raw = path.read_bytes()
+            except FileNotFoundError:
+                continue
+
+            try:
+                header, _, body = _decompress(raw, path.suffix).partition(b"\n")
+                meta = json.loads(header)
+                html = body.decode("utf-8")
+                expired = time.time() - meta["stored_at"] > meta["ttl"]
+            except CORRUPT_ENTRY_ERRORS as e:
+                # A crash mid-write or a disk error; drop it and refetch
+                logger.warning(f"⚠️ Removing corrupt cache entry {path.name}: {e}")
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    if self._total_bytes is not None:
+                        self._total_bytes -= len(raw)
+                self._count("corrupt")
+                self._count("misses")
+                get_metrics().inc("cache_lookups", result="corrupt")
+                return None
+            if expired:
+                self._count("expired")
+                self._count("misses")
+                get_metrics().inc("cache_lookups", result="expired")
+                return None
+
+            os.utime(path)  # mark as recently used for LRU eviction
+            self._count("hits")
+            get_metrics().inc("cache_lookups", result="hit")
+            return html
+
+        self._count("misses")
+        get_metrics().inc("cache_lookups", result="miss")
+        return None
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        ttl: Optional[float] = None,
+        keep_selector: Optional[str] = None,
+    ) -> None:
+        """
+        Store a page.
+
+        Args:
+            url: Page URL (cache key)
+            html: Raw page HTML
+            ttl: Seconds until the entry expires; defaults to url_ttl(url)
+            keep_selector: If given, store only the matching subtree(s)
+        """
+        if keep_selector:
+            html = keep_subtree(html, keep_selector)
+        meta = {
+            "url": url,
+            "stored_at": time.time(),
+            "ttl": url_ttl(url) if ttl is None else ttl,
+        }
+        payload, suffix = _compress(
+            json.dumps(meta).encode("utf-8") + b"\n" + html.encode("utf-8")
+        )
+
+        path = self._paths(url)[0 if suffix == ".zst" else 1]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+
+        with self._lock:
+            total = self._current_total()
+            if path.exists():
+                total -= path.stat().st_size
+            os.replace(tmp, path)
+            self._total_bytes = total + len(payload)
+            self._stats["stores"] += 1
+            self._stats["bytes_written"] += len(payload)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters plus the current hit rate."""
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob("*/*.html.*"):
+            if path.suffix not in (".zst", ".gz"):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _current_total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        return self._total_bytes
+
+    def _evict(self) -> None:
+        # Evict down to 90% so we don't rescan on every subsequent put.
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            self._stats["evictions"] += 1
+        self._total_bytes = total
+        logger.info(f"🧹 Page cache trimmed to {total / 1024**2:.1f} MB")
+
+
+_CACHE: Optional[PageCache] = None
+_CACHE_ENABLED = True
+_CACHE_LOCK = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Return the process-wide page cache, or None if caching is disabled."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if not _CACHE_ENABLED:
+            return None
+        if _CACHE is None:
+            _CACHE = PageCache()
+        return _CACHE
+
+
+def configure_page_cache(
+    cache_dir: Optional[str] = PAGE_CACHE_DIR,
+    max_bytes: int = PAGE_CACHE_MAX_BYTES,
+) -> Optional[PageCache]:
+    """Point the process-wide cache at `cache_dir`, or disable it with None."""
+    global _CACHE, _CACHE_ENABLED
+    with _CACHE_LOCK:
+        _CACHE_ENABLED = cache_dir is not None
+        _CACHE = PageCache(cache_dir, max_bytes) if cache_dir is not None else None
+        return _CACHE
@@ -1,24 +1,92 @@
+import atexit
 import logging
+import os
 import random
+import threading
 import time
-from typing import Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import requests
 from selectolax.parser import HTMLParser
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium_stealth import stealth
 
-from batboy.config.constants import HEADERS
+from batboy.config.constants import (
+    BROWSER_CACHE_DIR,
+    DRIVER_MAX_PAGES,
+    DRIVER_MAX_RSS_MB,
+    DRIVER_POOL_SIZE,
+    HEADERS,
+    LEAN_BLOCKED_URL_PATTERNS,
+    LEAN_CHROME_ARGS,
+    READY_POLL_INTERVAL,
+    READY_TIMEOUT,
+    THROTTLE_STATUS_CODES,
+)
+from batboy.metrics import failure_reason, get_metrics, timed
+from batboy.scraping.cache import PageCache, get_page_cache
+from batboy.scraping.progress import record_page
+from batboy.scraping.ratelimit import (
+    DEFAULT_HOST,
+    BlockedPageError,
+    get_rate_limiter,
+    host_of,
+    is_block_page,
+    is_throttle_error,
+)
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session used for static requests."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=DRIVER_POOL_SIZE * 4
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def share_driver_cookies(driver) -> None:
+    """Copy cookies from a warmed Selenium session into the shared session."""
+    session = get_session()
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"),
+        )
 
 
 def make_request(url: str, timeout: float = 10.0) -> requests.Response:
-    """Static HTML request with custom headers."""
-    return requests.get(url, headers=HEADERS, timeout=timeout)
+    """Static HTML request with custom headers over the shared session."""
+    return get_session().get(url, timeout=timeout)
+
 
+def get_driver(headless: bool = True, lean: bool = False) -> webdriver.Chrome:
+    """
+    Return a stealth-patched Chrome driver.
 
-def get_driver(headless: bool = True) -> webdriver.Chrome:
-    """Return a stealth-patched Chrome driver."""
+    With `lean=True` the browser skips everything we never read: images,
+    fonts, stylesheets and analytics are blocked through CDP, unneeded
+    background services are disabled, and all lean drivers share one disk
+    cache directory (BROWSER_CACHE_DIR) for the scripts they do load.
+    """
     options = Options()
     if headless:
         options.add_argument("--headless=new")
@@ -26,39 +94,521 @@ def get_driver(headless: bool = True) -> webdriver.Chrome:
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
 
-    driver = webdriver.Chrome(options=options)
-    stealth(
-        driver,
-        languages=["en-US", "en"],
-        vendor="Google Inc.",
-        platform="Win32",
-        webgl_vendor="Intel Inc.",
-        renderer="Intel Iris OpenGL Engine",
-        fix_hairline=True,
-    )
+    if lean:
+        for arg in LEAN_CHROME_ARGS:
+            options.add_argument(arg)
+        options.add_argument(f"--disk-cache-dir={os.path.abspath(BROWSER_CACHE_DIR)}")
+        options.add_experimental_option(
+            "prefs",
+            {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            },
+        )
+
+    with timed("driver_start"):
+        driver = webdriver.Chrome(options=options)
+        if lean:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS}
+            )
+        stealth(
+            driver,
+            languages=["en-US", "en"],
+            vendor="Google Inc.",
+            platform="Win32",
+            webgl_vendor="Intel Inc.",
+            renderer="Intel Iris OpenGL Engine",
+            fix_hairline=True,
+        )
     return driver
 
 
-def get_dom(
+def _driver_rss_mb(driver) -> Optional[float]:
+    """
+    Resident memory (MB) of a driver's process tree, read from /proc.
+
+    Returns None where the process tree cannot be inspected (non-Linux,
+    remote drivers, fake drivers in tests).
+    """
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    pid = getattr(process, "pid", None)
+    if not isinstance(pid, int) or not os.path.isdir("/proc"):
+        return None
+
+    total_kb = 0
+    stack = [pid]
+    seen = set()
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+            task_dir = f"/proc/{current}/task"
+            for tid in os.listdir(task_dir):
+                with open(f"{task_dir}/{tid}/children") as f:
+                    stack.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Thread-safe pool of reusable Chrome drivers.
+
+    Drivers are created lazily up to `size`, health-checked before they are
+    handed out, and recycled after `max_pages` page loads or once their
+    process tree grows past `max_rss_mb`. A driver whose borrower raised is
+    always quit rather than returned, so a wedged browser never leaks back
+    into the pool.
+
+    Args:
+        size: Maximum number of live drivers
+        max_pages: Page loads before a driver is recycled
+        max_rss_mb: Memory ceiling (MB) before a driver is recycled
+        headless, lean: Passed to get_driver() when no factory is given
+        factory: Optional zero-argument callable returning a new driver
+    """
+
+    def __init__(
+        self,
+        size: int = DRIVER_POOL_SIZE,
+        max_pages: int = DRIVER_MAX_PAGES,
+        max_rss_mb: Optional[float] = DRIVER_MAX_RSS_MB,
+        headless: bool = True,
+        lean: bool = False,
+        factory: Optional[Callable[[], webdriver.Chrome]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._factory = factory or (lambda: get_driver(headless=headless, lean=lean))
+        self._idle: List[_PooledDriver] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None) -> Iterator[webdriver.Chrome]:
+        """Lend a driver for the duration of the `with` block."""
+        pooled = self._acquire(timeout)
+        ok = False
+        try:
+            yield pooled.driver
+            ok = True
+        finally:
+            pooled.pages += 1
+            if ok:
+                self._release(pooled)
+            else:
+                self._discard(pooled)
+
+    def close(self) -> None:
+        """Quit every idle driver; borrowed drivers are quit when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def _acquire(self, timeout: Optional[float]) -> _PooledDriver:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if self._idle:
+                    pooled = self._idle.pop()
+                elif self._live < self.size:
+                    self._live += 1
+                    pooled = None
+                else:
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError("Timed out waiting for a driver")
+                    self._cond.wait(remaining)
+                    continue
+
+            if pooled is None:
+                try:
+                    return _PooledDriver(self._factory())
+                except Exception:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+
+            if self._is_healthy(pooled.driver):
+                return pooled
+            logging.info("Discarding unhealthy pooled driver.")
+            self._discard(pooled)
+
+    def _release(self, pooled: _PooledDriver) -> None:
+        if pooled.pages >= self.max_pages:
+            logging.info(f"Recycling driver after {pooled.pages} pages.")
+            self._discard(pooled)
+            return
+
+        if self.max_rss_mb is not None:
+            rss = _driver_rss_mb(pooled.driver)
+            if rss is not None and rss > self.max_rss_mb:
+                logging.info(f"Recycling driver using {rss:.0f} MB.")
+                self._discard(pooled)
+                return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+        self._discard(pooled)
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logging.warning(f"Error while quitting driver: {e}")
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            _ = driver.current_url
+            return True
+        except Exception:
+            return False
+
+
+_POOLS: Dict[Tuple[bool, bool], DriverPool] = {}
+_POOLS_LOCK = threading.Lock()
+_LEAN_DEFAULT = False
+_POOL_SIZE = DRIVER_POOL_SIZE
+
+
+def set_lean_mode(enabled: bool) -> None:
+    """Make pooled drivers use the lean browser profile by default."""
+    global _LEAN_DEFAULT
+    _LEAN_DEFAULT = enabled
+
+
+def ensure_pool_capacity(size: int) -> None:
+    """Grow the default and existing driver pools to at least `size` drivers."""
+    global _POOL_SIZE
+    with _POOLS_LOCK:
+        _POOL_SIZE = max(_POOL_SIZE, size)
+        for pool in _POOLS.values():
+            with pool._cond:
+                pool.size = max(pool.size, size)
+                pool._cond.notify_all()
+
+
+def get_driver_pool(headless: bool = True, lean: Optional[bool] = None) -> DriverPool:
+    """Return the process-wide driver pool for the given mode."""
+    key = (headless, _LEAN_DEFAULT if lean is None else lean)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = DriverPool(size=_POOL_SIZE, headless=key[0], lean=key[1])
+            _POOLS[key] = pool
+        return pool
+
+
+@atexit.register
+def close_driver_pools() -> None:
+    """Quit every pooled driver (runs automatically at interpreter exit)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def wait_for_selector(
+    driver,
+    selector: Optional[str],
+    timeout: float = READY_TIMEOUT,
+    poll: float = READY_POLL_INTERVAL,
+) -> bool:
+    """
+    Poll until `selector` matches in the live page (or, with no selector,
+    until the document has finished loading).
+
+    Returns:
+        True if the page became ready, False if `timeout` elapsed first.
+    """
+    if selector:
+        condition = EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+    else:
+
+        def condition(d):
+            return d.execute_script("return document.readyState") == "complete"
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+        return True
+    except TimeoutException:
+        logging.warning(f"Page not ready after {timeout:.1f}s (waiting on {selector})")
+        return False
+
+
+def wait_for_text_change(
+    driver,
+    selector: str,
+    previous: str,
+    timeout: float = READY_TIMEOUT,
+    poll: float = READY_POLL_INTERVAL,
+) -> bool:
+    """Poll until the text of `selector` differs from `previous`."""
+
+    def changed(d):
+        try:
+            return d.find_element(By.CSS_SELECTOR, selector).text != previous
+        except WebDriverException:
+            return False
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(changed)
+        return True
+    except TimeoutException:
+        logging.warning(f"'{selector}' did not change after {timeout:.1f}s")
+        return False
+
+
+def _render_html(
     url: str,
-    delay: float = 2.0,
+    ready_selector: Optional[str] = None,
+    ready_timeout: float = READY_TIMEOUT,
+    delay: float = 0.0,
     headless: bool = True,
+    lean: Optional[bool] = None,
     min_delay: float = 0.5,
     max_delay: float = 1.5,
     max_retries: int = 3,
     verbose: bool = True,
-) -> Optional[HTMLParser]:
-    """Selenium + stealth + retries to render JS and return parsed DOM."""
+) -> Tuple[str, HTMLParser]:
+    """Render `url` in a pooled driver; return the page source and its tree."""
 
     def fetch():
-        driver = get_driver(headless=headless)
-        driver.get(url)
-        time.sleep(delay)
-        html = driver.page_source
-        driver.quit()
+        with get_driver_pool(headless, lean).borrow() as driver:
+            with timed("navigate"):
+                driver.get(url)
+            with timed("ready_wait"):
+                wait_for_selector(driver, ready_selector, ready_timeout)
+            if delay:
+                with timed("settle_sleep"):
+                    time.sleep(delay)
+            html = driver.page_source
+            dom = _parse_html(html)
+            if is_block_page(dom):
+                raise BlockedPageError(f"Block page served for {url}")
+            try:
+                share_driver_cookies(driver)
+            except Exception as e:
+                logging.debug(f"Could not hand off driver cookies: {e}")
+        return html, dom
+
+    return throttle_and_retry(
+        fetch, max_retries, min_delay, max_delay, verbose, host=host_of(url)
+    )
+
+
+def _parse_html(html: str) -> HTMLParser:
+    with timed("html_parse"):
         return HTMLParser(html)
 
-    return throttle_and_retry(fetch, max_retries, min_delay, max_delay, verbose)
+
+def _page_served(source: str) -> None:
+    """Count a page returned from the cache, a static GET or a render."""
+    get_metrics().inc("pages", source=source)
+    record_page()
+
+
+def _is_ready(dom: HTMLParser, selector: Optional[str]) -> bool:
+    """True if `selector` matches in `dom` (always, without a selector)."""
+    return selector is None or dom.css_first(selector) is not None
+
+
+def _cached_dom(
+    cache: PageCache, url: str, selector: Optional[str]
+) -> Optional[HTMLParser]:
+    """
+    A cached page, parsed, if it still matches `selector`. Entries that do
+    not (stored before the page finished rendering, or by an older
+    version) are treated as misses and refetched.
+    """
+    html = cache.get(url)
+    if html is None:
+        return None
+    dom = _parse_html(html)
+    if not _is_ready(dom, selector):
+        logging.info(f"Cached page for {url} lacks '{selector}', refetching.")
+        get_metrics().inc("cache_stale")
+        return None
+    _page_served("cache")
+    return dom
+
+
+def get_dom(
+    url: str,
+    delay: float = 0.0,
+    headless: bool = True,
+    min_delay: float = 0.5,
+    max_delay: float = 1.5,
+    max_retries: int = 3,
+    verbose: bool = True,
+    use_cache: bool = True,
+    cache_ttl: Optional[float] = None,
+    ready_selector: Optional[str] = None,
+    ready_timeout: float = READY_TIMEOUT,
+    lean: Optional[bool] = None,
+) -> Optional[HTMLParser]:
+    """
+    Selenium + stealth + retries to render JS and return parsed DOM.
+
+    The page is read as soon as `ready_selector` matches (or the document
+    finishes loading when no selector is given); `delay` adds optional
+    extra settle time on top. `lean` picks the browser profile (defaults
+    to the mode set by set_lean_mode()). Rendered pages are cached only
+    when `ready_selector` matched, and cache hits must match it too.
+    """
+    cache = get_page_cache() if use_cache else None
+    if cache is not None:
+        dom = _cached_dom(cache, url, ready_selector)
+        if dom is not None:
+            return dom
+
+    html, dom = _render_html(
+        url,
+        ready_selector=ready_selector,
+        ready_timeout=ready_timeout,
+        delay=delay,
+        headless=headless,
+        lean=lean,
+        min_delay=min_delay,
+        max_delay=max_delay,
+        max_retries=max_retries,
+        verbose=verbose,
+    )
+    if cache is not None and _is_ready(dom, ready_selector):
+        cache.put(url, html, ttl=cache_ttl)
+    _page_served("rendered")
+    return dom
+
+
+def fetch_dom(
+    url: str,
+    selector: str,
+    timeout: float = 10.0,
+    min_delay: float = 0.5,
+    max_delay: float = 1.5,
+    verbose: bool = True,
+    use_cache: bool = True,
+    cache_ttl: Optional[float] = None,
+    cache_subtree: Optional[str] = None,
+    delay: float = 0.0,
+    headless: bool = True,
+    max_retries: int = 3,
+    ready_timeout: float = READY_TIMEOUT,
+    render: bool = True,
+) -> Optional[HTMLParser]:
+    """
+    Static-first fetch that falls back to a rendered Selenium page.
+
+    Serves the page from the page cache when possible. Otherwise tries a
+    plain GET over the shared keep-alive session (carrying cookies handed
+    off from earlier Selenium renders) and returns that DOM when it
+    contains `selector`, rendering with Selenium only when it does not.
+    A rendered page is read as soon as `selector` appears. Only pages that
+    contain `selector` are written to the cache, and cached pages that do
+    not contain it are refetched.
+
+    Args:
+        url: Full page URL
+        selector: CSS selector that must match for the static HTML to count
+        timeout: Timeout in seconds for the static request
+        use_cache: Read from and write to the page cache
+        cache_ttl: Entry TTL in seconds (defaults to the URL's class TTL)
+        cache_subtree: Optional selector; cache only the matching subtree
+        delay, headless, max_retries, ready_timeout: Selenium render settings
+        render: If False, return None instead of rendering with Selenium
+
+    Returns:
+        Parsed DOM, or None if rendering also failed (or was disabled).
+    """
+    cache = get_page_cache() if use_cache else None
+    if cache is not None:
+        cached_dom = _cached_dom(cache, url, selector)
+        if cached_dom is not None:
+            return cached_dom
+
+    def fetch_static():
+        with timed("static_fetch"):
+            resp = make_request(url, timeout=timeout)
+        if resp.status_code in THROTTLE_STATUS_CODES:
+            raise BlockedPageError(f"HTTP {resp.status_code} block for {url}")
+        resp.raise_for_status()
+        dom = _parse_html(resp.text)
+        if is_block_page(dom):
+            raise BlockedPageError(f"Block page served for {url}")
+        return resp.text, dom
+
+    html: Optional[str]
+    dom: Optional[HTMLParser]
+    try:
+        html, dom = throttle_and_retry(
+            fetch_static, 1, min_delay, max_delay, verbose, host=host_of(url)
+        )
+    except RuntimeError as e:
+        logging.info(f"Static fetch failed for {url}: {e}")
+        html, dom = None, None
+
+    source = "static"
+    if dom is not None and dom.css_first(selector) is not None:
+        if verbose:
+            logging.info(f"Static HTML served {url}")
+    elif not render:
+        return None
+    else:
+        logging.info(f"Static HTML for {url} lacks '{selector}', rendering instead.")
+        html, dom = _render_html(
+            url,
+            ready_selector=selector,
+            ready_timeout=ready_timeout,
+            delay=delay,
+            headless=headless,
+            min_delay=min_delay,
+            max_delay=max_delay,
+            max_retries=max_retries,
+            verbose=verbose,
+        )
+        source = "rendered"
+
+    if cache is not None and html and _is_ready(dom, selector):
+        cache.put(url, html, ttl=cache_ttl, keep_selector=cache_subtree)
+    _page_served(source)
+    return dom
 
 
 def throttle_and_retry(
@@ -67,20 +617,48 @@ def throttle_and_retry(
     min_delay: float = 1.0,
     max_delay: float = 2.5,
     verbose: bool = True,
+    host: str = DEFAULT_HOST,
 ):
-    """Wrap a request function with delay and retry logic."""
+    """
+    Wrap a request function with rate limiting and retry logic.
+
+    Requests are paced by the shared per-host RateLimiter, which speeds up
+    while calls succeed and backs off when the host signals throttling (see
+    is_throttle_error); other failures are retried without slowing down
+    every worker on the host. If the limiter is
+    disabled, a random delay between min_delay and max_delay is used.
+    Waits, backoffs, retries and failures (by reason) go to the metrics.
+    """
+    limiter = get_rate_limiter()
+    metrics = get_metrics()
     attempt = 0
     while attempt < max_retries:
-        delay = random.uniform(min_delay, max_delay)
-        if verbose:
-            logging.info(f"Waiting {delay:.2f}s before request...")
-        time.sleep(delay)
+        if limiter is not None:
+            waited = limiter.acquire(host)
+            metrics.observe("rate_limit_wait", waited)
+            if verbose and waited > 0:
+                logging.info(f"Rate limited {waited:.2f}s before request to {host}")
+        else:
+            delay = random.uniform(min_delay, max_delay)
+            if verbose:
+                logging.info(f"Waiting {delay:.2f}s before request...")
+            with timed("throttle_sleep"):
+                time.sleep(delay)
         try:
-            return func()
+            result = func()
         except Exception as e:
+            metrics.inc("failures", reason=failure_reason(e))
+            if limiter is not None and is_throttle_error(e):
+                limiter.record_failure(host)
             attempt += 1
             if attempt >= max_retries:
                 raise RuntimeError(f"Failed after {max_retries} attempts: {e}")
             backoff = 2**attempt
             logging.warning(f"Attempt {attempt} failed, retrying in {backoff}s...")
-            time.sleep(backoff)
+            metrics.inc("retries")
+            with timed("retry_backoff"):
+                time.sleep(backoff)
+        else:
+            if limiter is not None:
+                limiter.record_success(host)
+            return result
@@ -0,0 +1,378 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+import polars as pl
+from selectolax.parser import HTMLParser, Node
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from batboy.config.constants import (
+    BASE_DOMAIN,
+    GAME_BY_GAME_DATA_TABLE,
+    GAME_BY_GAME_DB_PATH,
+    GAME_BY_GAME_LOG_COLUMNS,
+    GAME_BY_GAME_LOG_TABLE,
+    INFO_DB_PATH,
+    PAGE_SELECTORS,
+    READY_TIMEOUT,
+    ROSTER_DATA_TABLE,
+    ROSTER_DB_PATH,
+    SEASON_INFO_TABLE_NAME,
+    STAT_CATEGORY_SCHEMAS,
+)
+from batboy.metrics import export_metrics, timed
+from batboy.scraping.batch import run_batch
+from batboy.scraping.cache import get_page_cache, season_ttl
+from batboy.scraping.core import (
+    fetch_dom,
+    get_driver_pool,
+    throttle_and_retry,
+    wait_for_selector,
+    wait_for_text_change,
+)
+from batboy.scraping.parsing import (
+    CONTEXT_COLUMNS,
+    GAME_ID_PATTERN,
+    PLAYER_ID_PATTERN,
+    TEAM_ID_PATTERN,
+    detect_category,
+)
+from batboy.scraping.ratelimit import (
+    BlockedPageError,
+    host_of,
+    is_block_page,
+)
+from batboy.storage.pending import get_pending_targets
+from batboy.storage.schema import apply_schema
+from batboy.storage.shards import shard_db_path
+from batboy.storage.writer import DuckDBWriter, with_season_context
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+DATE_PATTERN = re.compile(r"^\d{2}/\d{2}/\d{4}")
+
+# Clicks the Hitting / Pitching / Fielding switch without reloading the page.
+# The search starts at the game log table (arguments[1]) and widens one
+# ancestor at a time, so the stat-category nav next to the table wins over
+# same-named links elsewhere; links in the table and site menus never match.
+SWITCH_CATEGORY_JS = """
+const label = arguments[0].toLowerCase();
+const table = document.querySelector(arguments[1]);
+let scope = table ? table.parentElement : document.body;
+for (; scope; scope = scope.parentElement) {
+  const target = Array.from(scope.querySelectorAll('a, button')).find(el =>
+    !(table && table.contains(el)) && !el.closest('header, .navbar') &&
+    el.textContent.trim().toLowerCase() === label);
+  if (target) { target.click(); return true; }
+}
+return false;
+"""
+
+
+def _find_game_log_table(dom: HTMLParser) -> Optional[Node]:
+    """The first table with a Date header and links to contests."""
+    for table in dom.css("table"):
+        header = table.css_first("thead")
+        if header is None or not table.css_first("a[href*='/contests/']"):
+            continue
+        if "Date" in {th.text(strip=True) for th in header.css("th")}:
+            return table
+    return None
+
+
+def _parse_game_by_game_dom(
+    dom: HTMLParser, category: Optional[str] = None
+) -> pl.DataFrame:
+    """
+    Extract one row per game from a Game By Game page.
+
+    Args:
+        dom: Parsed Game By Game page
+        category: Expected stat category; detected from the headers if None
+
+    Returns:
+        Polars DataFrame with date/opponent/result, opponent_id, game_id,
+        category and the category's stat columns (as text).
+    """
+    table = _find_game_log_table(dom)
+    if table is None:
+        logger.warning("❌ No game-by-game table found in DOM.")
+        return pl.DataFrame()
+
+    headers = [th.text(strip=True) for th in table.css_first("thead").css("th")]
+    detected = detect_category(headers)
+    if category is None:
+        category = detected
+    elif detected != category:
+        logger.warning(f"⚠️ Expected {category} table, found {detected}")
+        return pl.DataFrame()
+    if category is None:
+        logger.warning(f"⚠️ Unrecognized game-by-game headers: {headers}")
+        return pl.DataFrame()
+
+    schema = set(STAT_CATEGORY_SCHEMAS[category])
+    positions = {
+        i: CONTEXT_COLUMNS.get(h, h) for i, h in enumerate(headers) if h in schema
+    }
+    columns: Dict[str, List] = {col: [] for col in positions.values()}
+    opponent_ids: List[Optional[int]] = []
+    game_ids: List[Optional[int]] = []
+
+    for tr in table.css("tbody tr"):
+        cells = [td for td in tr.iter() if td.tag == "td"]
+        # Skip totals and spacer rows, which have no game date
+        if len(cells) != len(headers) or not DATE_PATTERN.match(
+            cells[0].text(strip=True)
+        ):
+            continue
+        for i, col in positions.items():
+            columns[col].append(cells[i].text(strip=True))
+
+        opponent_id = game_id = None
+        for link in tr.css("a"):
+            href = link.attrs.get("href") or ""
+            team = TEAM_ID_PATTERN.search(href)
+            game = GAME_ID_PATTERN.search(href)
+            if team and opponent_id is None:
+                opponent_id = int(team.group(1))
+            if game and game_id is None:
+                game_id = int(game.group(1))
+        opponent_ids.append(opponent_id)
+        game_ids.append(game_id)
+
+    df = pl.DataFrame(
+        {**columns, "opponent_id": opponent_ids, "game_id": game_ids},
+        schema_overrides={"opponent_id": pl.Int64, "game_id": pl.Int64},
+    )
+    return df.with_columns(category=pl.lit(category, dtype=pl.String))
+
+
+def get_game_by_game(
+    players_url: str,
+    categories: Iterable[str] = tuple(STAT_CATEGORY_SCHEMAS),
+    ready_timeout: float = READY_TIMEOUT,
+) -> pl.DataFrame:
+    """
+    Scrape every stat category of a Game By Game page in one browser session.
+
+    The page is loaded once; other categories are reached by clicking the
+    category switch and waiting for the game log table to change, instead of
+    loading a new page per category. The load and every switch are paced
+    and retried separately, so a flaky switch does not repeat the whole
+    page. Works for a player page or for the team-season page linked from
+    the "Game By Game" tab.
+
+    Args:
+        players_url: Player page path or URL (e.g. "/players/5519651")
+        categories: Stat categories to collect (keys of STAT_CATEGORY_SCHEMAS)
+        ready_timeout: Seconds to wait for the table after each load or switch
+
+    Returns:
+        Polars DataFrame (cast with DEFAULT_DTYPES) with a `category` column.
+    """
+    url = players_url if players_url.startswith("http") else BASE_DOMAIN + players_url
+    host = host_of(url)
+    ready = PAGE_SELECTORS["game_by_game"]
+    table_selector = PAGE_SELECTORS["game_by_game_table"]
+
+    def page_dom(driver) -> HTMLParser:
+        with timed("html_parse"):
+            dom = HTMLParser(driver.page_source)
+        if is_block_page(dom):
+            raise BlockedPageError(f"Block page served for {url}")
+        return dom
+
+    def shown_category(dom: HTMLParser) -> Optional[str]:
+        table = _find_game_log_table(dom)
+        if table is None:
+            return None
+        return detect_category(th.text(strip=True) for th in table.css("thead th"))
+
+    frames = []
+    with get_driver_pool().borrow() as driver:
+
+        def load() -> HTMLParser:
+            with timed("navigate"):
+                driver.get(url)
+            with timed("ready_wait"):
+                wait_for_selector(driver, ready, ready_timeout)
+            return page_dom(driver)
+
+        def switch(category: str) -> Optional[HTMLParser]:
+            try:
+                previous = driver.find_element(By.CSS_SELECTOR, table_selector).text
+            except WebDriverException:
+                previous = ""
+            if not driver.execute_script(
+                SWITCH_CATEGORY_JS, category.title(), table_selector
+            ):
+                return None
+            with timed("ready_wait"):
+                if not wait_for_text_change(
+                    driver, table_selector, previous, ready_timeout
+                ):
+                    raise TimeoutException(f"{category} table did not load on {url}")
+            return page_dom(driver)
+
+        # Each switch is a request of its own: it is paced by the limiter,
+        # reports success or failure to it, and is retried on its own
+        dom = throttle_and_retry(load, host=host)
+        for category in categories:
+            if shown_category(dom) != category:
+                switched = throttle_and_retry(lambda: switch(category), host=host)
+                if switched is None:
+                    logger.warning(f"⚠️ No {category} switch on {url}")
+                    continue
+                dom = switched
+            if shown_category(dom) is None:
+                continue  # no games logged in this category
+            with timed("parse_game_by_game"):
+                frames.append(_parse_game_by_game_dom(dom, category))
+
+    frames = [f for f in frames if not f.is_empty()]
+    if not frames:
+        return pl.DataFrame()
+    df = pl.concat(frames, how="diagonal_relaxed")
+    logger.info(f"Parsed {df.shape[0]} game rows ({len(frames)} categories) from {url}")
+    return apply_schema(df)
+
+
+def get_game_by_game_url(season_url: str, year: Optional[str] = None) -> Optional[str]:
+    """Path of the "Game By Game" tab on a team-season page, if present."""
+    dom = fetch_dom(
+        f"{BASE_DOMAIN}{season_url}",
+        PAGE_SELECTORS["season"],
+        cache_ttl=season_ttl(year) if year else None,
+    )
+    if dom is None or dom.root is None:
+        return None
+    for tab in dom.css(".nav-tabs .nav-link"):
+        if tab.text(strip=True) == "Game By Game":
+            return tab.attrs.get("href")
+    return None
+
+
+def get_pending_game_by_game_targets(
+    limit: Optional[int] = None, players: bool = False
+) -> pl.DataFrame:
+    """
+    Return team-seasons (or roster players) whose game logs are not yet logged.
+
+    Args:
+        limit: Optional maximum number of targets
+        players: Target individual players from the rosters DB instead of
+            team-season totals from season_info
+
+    Returns:
+        Polars DataFrame with columns:
+        ["org_id", "school_name", "season_url", "year", "player_url"]
+    """
+    if players:
+        source_db = ROSTER_DB_PATH
+        source_query = f"""
+            SELECT DISTINCT org_id, school_name, season_url, year, player_url
+            FROM source.{ROSTER_DATA_TABLE}
+            WHERE player_url IS NOT NULL
+        """
+    else:
+        source_db = INFO_DB_PATH
+        source_query = f"""
+            SELECT org_id, school_name, season_url, year,
+                   CAST(NULL AS TEXT) AS player_url
+            FROM source.{SEASON_INFO_TABLE_NAME}
+            WHERE has_game_by_game = TRUE
+        """
+
+    return get_pending_targets(
+        GAME_BY_GAME_DB_PATH,
+        GAME_BY_GAME_LOG_TABLE,
+        GAME_BY_GAME_LOG_COLUMNS,
+        source_db,
+        source_query,
+        key="player_url" if players else "season_url",
+        log_filter="done.player_url IS NOT NULL"
+        if players
+        else "done.player_url IS NULL",
+        limit=limit,
+    )
+
+
+def batch_scrape_game_by_game(
+    limit: Optional[int] = None, workers: int = 1, players: bool = False
+) -> None:
+    """
+    Batch scrape game-by-game stats (hitting, pitching, fielding) with resume logic.
+
+    Team-season totals are scraped for every season with has_game_by_game;
+    with `players=True`, every player in the rosters DB is scraped instead.
+    Each target is logged once, so an interrupted run picks up where it
+    stopped.
+
+    Args:
+        limit: Optional limit to number of targets to process
+        workers: Number of concurrent browser workers (writes stay serial)
+        players: Scrape individual players instead of team-season totals
+    """
+    logger.info(
+        f"\n🚦 Starting batch scrape of game-by-game stats "
+        f"(limit={limit}, workers={workers}, players={players})"
+    )
+    pending = get_pending_game_by_game_targets(limit, players)
+
+    if pending.is_empty():
+        logger.info("📭 Nothing to scrape — all game-by-game targets are logged.")
+        return
+
+    def scrape(row: dict) -> pl.DataFrame:
+        logger.info(f"\n📈 {row['school_name']} {row['year']} — {row['season_url']}")
+        target = row["player_url"] or get_game_by_game_url(
+            row["season_url"], row["year"]
+        )
+        if not target:
+            raise ValueError(f"No Game By Game tab on {row['season_url']}")
+        return get_game_by_game(target)
+
+    writer = DuckDBWriter(
+        shard_db_path(GAME_BY_GAME_DB_PATH),
+        GAME_BY_GAME_DATA_TABLE,
+        log_table=GAME_BY_GAME_LOG_TABLE,
+        log_columns=GAME_BY_GAME_LOG_COLUMNS,
+    )
+
+    def write(row: dict, df: Optional[pl.DataFrame], error: Optional[Exception]):
+        context = {
+            "org_id": row["org_id"],
+            "school_name": row["school_name"],
+            "season_url": row["season_url"],
+        }
+        log = {**context, "player_url": row["player_url"]}
+        if error is not None or df is None:
+            logger.error(f"❌ Failed: {error}")
+            writer.add(log={**log, "success": False, "n_rows": 0, "error": str(error)})
+            return
+
+        player_id = None
+        if row["player_url"]:
+            match = PLAYER_ID_PATTERN.search(row["player_url"])
+            player_id = int(match.group(1)) if match else None
+        data = with_season_context(df, **context, year=row["year"])
+        if not data.is_empty():
+            data = data.with_columns(
+                player_id=pl.lit(player_id, dtype=pl.Int64),
+                player_url=pl.lit(row["player_url"], dtype=pl.String),
+            )
+        writer.add(data, log={**log, "success": True, "n_rows": df.shape[0]})
+        logger.info(f"✅ Scraped {df.shape[0]} game rows.")
+
+    with writer:
+        run_batch(pending, scrape, write, workers=workers)
+
+    cache = get_page_cache()
+    if cache is not None:
+        logger.info(f"📦 Page cache: {cache.stats()}")
+    export_metrics("game_by_game")
+
+
+if __name__ == "__main__":
+    batch_scrape_game_by_game(limit=100)
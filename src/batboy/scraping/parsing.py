@@ -0,0 +1,42 @@
+import re
+from typing import Iterable, Optional
+
+from selectolax.parser import Node
+
+from batboy.config.constants import STAT_CATEGORY_SCHEMAS
+
+# IDs carried in the links of stats.ncaa.org tables
+TEAM_ID_PATTERN = re.compile(r"/teams/(\d+)")
+GAME_ID_PATTERN = re.compile(r"/contests/(\d+)/")
+PLAYER_ID_PATTERN = re.compile(r"/players/(\d+)")
+
+# Leading columns shared by every stat category, stored under lowercase names
+CONTEXT_COLUMNS = {"Date": "date", "Opponent": "opponent", "Result": "result"}
+
+
+def to_int(text: str) -> Optional[int]:
+    """Integer value of a table cell ("1,204" -> 1204), or None if not a number."""
+    try:
+        return int(text.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def link_id(node: Node, pattern: re.Pattern) -> Optional[int]:
+    """First ID matched by `pattern` in the links under `node`."""
+    for link in node.css("a"):
+        match = pattern.search(link.attrs.get("href") or "")
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def detect_category(headers: Iterable[str]) -> Optional[str]:
+    """Stat category whose schema best matches the table headers."""
+    stats = set(headers) - set(CONTEXT_COLUMNS)
+    scores = {
+        category: len(stats & set(columns))
+        for category, columns in STAT_CATEGORY_SCHEMAS.items()
+    }
+    best = max(scores, key=scores.get)
+    return best if scores[best] else None
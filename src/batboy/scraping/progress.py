@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+ProgressCallback = Callable[["BatchProgress"], None]
+
+
+class BatchProgress:
+    """
+    Thread-safe counters for a running batch: targets, pages and rows.
+
+    run_batch adds its targets to the total and advances once per written
+    target; fetch_dom and get_dom count every page they return (cache hits
+    included). `on_update` is called after every change, e.g. to redraw a
+    progress bar.
+
+    Args:
+        on_update: Optional callback receiving this object
+    """
+
+    def __init__(self, on_update: Optional[ProgressCallback] = None):
+        self.on_update = on_update
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.pages = 0
+        self.rows = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _changed(self) -> None:
+        if self.on_update is not None:
+            self.on_update(self)
+
+    def add_total(self, n: int) -> None:
+        with self._lock:
+            self.total += n
+        self._changed()
+
+    def advance(self, rows: int = 0, failed: bool = False) -> None:
+        with self._lock:
+            self.done += 1
+            self.failed += int(failed)
+            self.rows += rows
+        self._changed()
+
+    def page(self) -> None:
+        with self._lock:
+            self.pages += 1
+        self._changed()
+
+    def rates(self) -> Dict[str, Optional[float]]:
+        """Pages/sec, rows/sec and the ETA in seconds (None until known)."""
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            per_target = elapsed / self.done if self.done else None
+            remaining = max(self.total - self.done, 0)
+            return {
+                "pages_per_sec": self.pages / elapsed,
+                "rows_per_sec": self.rows / elapsed,
+                "eta": per_target * remaining if per_target is not None else None,
+            }
+
+
+_PROGRESS: Optional[BatchProgress] = None
+
+
+def configure_progress(progress: Optional[BatchProgress]) -> None:
+    """Report batch progress to `progress` (None stops reporting)."""
+    global _PROGRESS
+    _PROGRESS = progress
+
+
+def get_progress() -> Optional[BatchProgress]:
+    """The process-wide progress counters, or None when not reporting."""
+    return _PROGRESS
+
+
+def record_page() -> None:
+    """Count one fetched page, if progress is being reported."""
+    if _PROGRESS is not None:
+        _PROGRESS.page()
@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+from urllib.parse import urlparse
+
+from selectolax.parser import HTMLParser
+
+from batboy.config.constants import (
+    BASE_DOMAIN,
+    BLOCK_PAGE_MARKERS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_DECREASE,
+    RATE_LIMIT_INCREASE,
+    RATE_LIMIT_INITIAL,
+    RATE_LIMIT_MAX,
+    RATE_LIMIT_MIN,
+    RATE_LIMIT_STATE_PATH,
+    THROTTLE_STATUS_CODES,
+)
+from batboy.metrics import failure_reason
+from batboy.utils import file_lock
+
+DEFAULT_HOST = urlparse(BASE_DOMAIN).netloc
+
+
+class BlockedPageError(RuntimeError):
+    """Raised when the site answers with a throttling or bot-wall page."""
+
+
+def is_block_page(page: Union[str, HTMLParser]) -> bool:
+    """
+    True if a page looks like a throttling / bot-wall response.
+
+    Pass the parsed tree when the caller parses the page anyway, so the
+    HTML is not parsed twice.
+    """
+    dom = HTMLParser(page) if isinstance(page, str) else page
+    title = dom.css_first("title")
+    text = title.text(strip=True) if title else ""
+    if dom.body is not None:
+        text += " " + dom.body.text(strip=True)[:500]
+    text = text.lower()
+    return any(marker in text for marker in BLOCK_PAGE_MARKERS)
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+    True if a failed request means the host wants us to slow down: a block
+    page, a THROTTLE_STATUS_CODES response or a timeout. Other errors
+    (parse failures, missing elements, bugs) leave the rate alone.
+    """
+    if isinstance(error, BlockedPageError):
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) in THROTTLE_STATUS_CODES:
+        return True
+    return failure_reason(error) == "timeout"
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc or DEFAULT_HOST
+
+
+class RateLimiter:
+    """
+    Adaptive token-bucket rate limiter keyed by host.
+
+    Each host has a bucket refilled at `rate` tokens per second (capped at
+    `burst`). The rate follows AIMD: it grows by `increase` after every
+    healthy response and is multiplied by `decrease` after an error,
+    timeout or block page. Bucket state lives in a small JSON file guarded
+    by a file lock, so every thread and every batch process on the box
+    shares one politeness budget per host.
+
+    Args:
+        state_path: JSON file holding the shared bucket state
+        initial_rate: Starting requests/second for a new host
+        min_rate: Floor for the rate after repeated failures
+        max_rate: Ceiling for the rate while responses stay healthy
+        increase: Additive increase per success (requests/second)
+        decrease: Multiplicative decrease per failure
+        burst: Maximum tokens a bucket may accumulate
+    """
+
+    def __init__(
+        self,
+        state_path: str = RATE_LIMIT_STATE_PATH,
+        initial_rate: float = RATE_LIMIT_INITIAL,
+        min_rate: float = RATE_LIMIT_MIN,
+        max_rate: float = RATE_LIMIT_MAX,
+        increase: float = RATE_LIMIT_INCREASE,
+        decrease: float = RATE_LIMIT_DECREASE,
+        burst: float = RATE_LIMIT_BURST,
+    ):
+        if min(initial_rate, min_rate, max_rate, burst) <= 0:
+            raise ValueError("rates and burst must be positive")
+        if min_rate > max_rate:
+            raise ValueError(f"min_rate {min_rate} exceeds max_rate {max_rate}")
+        self.state_path = Path(state_path)
+        self.lock_path = Path(f"{state_path}.lock")
+        self.initial_rate = min(max(initial_rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Dict[str, float]]]:
+        with self._thread_lock, file_lock(self.lock_path):
+            try:
+                state = json.loads(self.state_path.read_text())
+            except (FileNotFoundError, ValueError):
+                state = {}
+            yield state
+            tmp = Path(f"{self.state_path}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.state_path)
+
+    def _bucket(self, state: Dict[str, Dict[str, float]], host: str) -> Dict:
+        now = time.time()
+        bucket = state.setdefault(
+            host, {"rate": self.initial_rate, "tokens": self.burst, "updated": now}
+        )
+        bucket["rate"] = min(max(bucket["rate"], self.min_rate), self.max_rate)
+        elapsed = max(0.0, now - bucket["updated"])
+        bucket["tokens"] = min(self.burst, bucket["tokens"] + elapsed * bucket["rate"])
+        bucket["updated"] = now
+        return bucket
+
+    def acquire(self, host: str = DEFAULT_HOST) -> float:
+        """
+        Reserve one request slot for `host`, sleeping until it is due.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        with self._state() as state:
+            bucket = self._bucket(state, host)
+            bucket["tokens"] -= 1.0
+            wait = max(0.0, -bucket["tokens"] / bucket["rate"])
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_success(self, host: str = DEFAULT_HOST) -> None:
+        with self._state() as state:
+            bucket = self._bucket(state, host)
+            bucket["rate"] = min(self.max_rate, bucket["rate"] + self.increase)
+
+    def record_failure(self, host: str = DEFAULT_HOST) -> None:
+        with self._state() as state:
+            bucket = self._bucket(state, host)
+            bucket["rate"] = max(self.min_rate, bucket["rate"] * self.decrease)
+            bucket["tokens"] = min(bucket["tokens"], 0.0)
+
+    def rate(self, host: str = DEFAULT_HOST) -> float:
+        """Current requests/second allowed for `host`."""
+        with self._state() as state:
+            return self._bucket(state, host)["rate"]
+
+
+_LIMITER: Optional[RateLimiter] = None
+_LIMITER_ENABLED = True
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Return the process-wide rate limiter, or None if it is disabled."""
+    global _LIMITER
+    with _LIMITER_LOCK:
+        if not _LIMITER_ENABLED:
+            return None
+        if _LIMITER is None:
+            _LIMITER = RateLimiter()
+        return _LIMITER
+
+
+def configure_rate_limiter(enabled: bool = True, **kwargs) -> Optional[RateLimiter]:
+    """Replace the process-wide limiter (kwargs go to RateLimiter)."""
+    global _LIMITER, _LIMITER_ENABLED
+    with _LIMITER_LOCK:
+        _LIMITER_ENABLED = enabled
+        _LIMITER = RateLimiter(**kwargs) if enabled else None
+        return _LIMITER
@@ -0,0 +1,155 @@
+import hashlib
+from datetime import date, datetime
+from typing import Callable, Dict, Optional
+
+import duckdb
+import polars as pl
+
+from batboy.config.constants import (
+    INFO_DB_PATH,
+    PAGE_HASH_COLUMNS,
+    PAGE_HASH_TABLE,
+    SEASON_INFO_TABLE_NAME,
+)
+from batboy.scraping.batch import run_batch
+from batboy.scraping.cache import FOREVER, season_ttl
+from batboy.storage.shards import filter_shard
+from batboy.storage.writer import DuckDBWriter, with_season_context
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+
+def is_open_season(year: str, today: Optional[date] = None) -> bool:
+    """True while a season's pages can still change (see season_ttl)."""
+    return season_ttl(year, today) != FOREVER
+
+
+def content_hash(df: pl.DataFrame) -> str:
+    """
+    sha256 of a parsed table.
+
+    Hashing the parsed rows rather than the raw page ignores markup churn
+    (session tokens, ads, timestamps) that does not change the data.
+    """
+    return hashlib.sha256(df.write_csv().encode("utf-8")).hexdigest()
+
+
+def get_open_season_targets(
+    tab_column: str, today: Optional[date] = None
+) -> pl.DataFrame:
+    """
+    Team-seasons with the given tab whose season is still in progress
+    (restricted to the configured shard, if any).
+
+    Args:
+        tab_column: season_info flag such as "has_schedule" or "has_roster"
+        today: Date used to decide which seasons are open (defaults to today)
+
+    Returns:
+        Polars DataFrame with columns:
+        ["org_id", "school_name", "season_url", "year"]
+    """
+    con = duckdb.connect(INFO_DB_PATH, read_only=True)
+    df = con.sql(f"""
+        SELECT org_id, school_name, season_url, year
+        FROM {SEASON_INFO_TABLE_NAME}
+        WHERE {tab_column} = TRUE
+    """).pl()
+    con.close()
+
+    open_years = [y for y in df["year"].unique().to_list() if is_open_season(y, today)]
+    return filter_shard(df.filter(pl.col("year").is_in(open_years)))
+
+
+def load_page_hashes(db_path: str) -> Dict[str, str]:
+    """Last stored content hash per season_url (creates the table if missing)."""
+    con = duckdb.connect(db_path)
+    columns = ", ".join(f"{k} {v}" for k, v in PAGE_HASH_COLUMNS.items())
+    con.execute(f"CREATE TABLE IF NOT EXISTS {PAGE_HASH_TABLE} ({columns})")
+    rows = con.sql(f"SELECT season_url, content_hash FROM {PAGE_HASH_TABLE}").fetchall()
+    con.close()
+    return dict(rows)
+
+
+def refresh_seasons(
+    targets: pl.DataFrame,
+    scrape: Callable[[dict], pl.DataFrame],
+    writer: DuckDBWriter,
+    count_column: str,
+    workers: int = 1,
+) -> Dict[str, int]:
+    """
+    Re-scrape team-seasons and rewrite only those whose table changed.
+
+    Each target is fetched and parsed, and the parsed rows are hashed. If
+    the hash matches the one stored in PAGE_HASH_TABLE nothing is written.
+    Otherwise the season's old rows are deleted and the new rows, the new
+    hash and a log row are written in the same transaction. Seasons that
+    have no stored hash yet (e.g. scraped before hashes were kept) are
+    rewritten once. Failed fetches and pages that parse to no rows are
+    logged and skipped, keeping the stored rows until a later refresh
+    succeeds.
+
+    Args:
+        targets: Rows with org_id, school_name, season_url and year
+        scrape: Fetch + parse one target (should bypass the page cache)
+        writer: Writer for the data DB; PAGE_HASH_TABLE lives alongside
+        count_column: Log column receiving the row count (e.g. "n_games")
+        workers: Number of concurrent scrape workers
+
+    Returns:
+        Counts of "changed", "unchanged" and "failed" seasons.
+    """
+    stored = load_page_hashes(writer.db_path)
+    counts = {"changed": 0, "unchanged": 0, "failed": 0}
+
+    def write(row: dict, df: Optional[pl.DataFrame], error: Optional[Exception]):
+        season_url = row["season_url"]
+        if error is not None or df is None:
+            logger.error(f"❌ Refresh failed for {season_url}: {error}")
+            counts["failed"] += 1
+            return
+        if df.is_empty():
+            # A page that parses to nothing (layout change, error page) must
+            # never replace a season's stored rows with nothing
+            logger.error(f"❌ Refresh parsed no rows for {season_url}, keeping stored")
+            counts["failed"] += 1
+            return
+
+        digest = content_hash(df)
+        if stored.get(season_url) == digest:
+            logger.info(f"💤 Unchanged: {season_url}")
+            counts["unchanged"] += 1
+            return
+
+        log = {
+            "org_id": row["org_id"],
+            "school_name": row["school_name"],
+            "season_url": season_url,
+        }
+        page_hash = pl.DataFrame(
+            {
+                "season_url": [season_url],
+                "content_hash": [digest],
+                "n_rows": [df.shape[0]],
+                "updated_at": [datetime.now()],
+            }
+        )
+        writer.add(
+            {
+                writer.data_table: with_season_context(df, **log, year=row["year"]),
+                PAGE_HASH_TABLE: page_hash,
+            },
+            log={**log, "success": True, count_column: df.shape[0]},
+            replace={"season_url": season_url},
+        )
+        stored[season_url] = digest
+        counts["changed"] += 1
+        logger.info(f"🔄 Rewrote {df.shape[0]} rows for {season_url}")
+
+    with writer:
+        run_batch(targets, scrape, write, workers=workers)
+
+    logger.info(f"📊 Refresh summary: {counts}")
+    return counts
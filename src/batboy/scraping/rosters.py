@@ -1,22 +1,54 @@
-import re
-from typing import Optional
+from typing import Dict, Optional
 
 import polars as pl
 from selectolax.parser import HTMLParser
 
-from batboy.config.constants import BASE_DOMAIN
-from batboy.scraping.core import get_dom
+from batboy.config.constants import (
+    BASE_DOMAIN,
+    INFO_DB_PATH,
+    PAGE_SELECTORS,
+    ROSTER_DATA_TABLE,
+    ROSTER_DB_PATH,
+    ROSTER_HEADER_MAP,
+    ROSTER_LOG_COLUMNS,
+    ROSTER_LOG_TABLE,
+    ROSTER_SCHEMA,
+    SEASON_INFO_TABLE_NAME,
+    WRITER_FLUSH_EVERY,
+)
+from batboy.metrics import export_metrics, timed
+from batboy.scraping.batch import run_batch, run_queue
+from batboy.scraping.cache import get_page_cache, season_ttl
+from batboy.scraping.core import fetch_dom
+from batboy.scraping.parsing import PLAYER_ID_PATTERN, to_int
+from batboy.scraping.refresh import get_open_season_targets, refresh_seasons
+from batboy.storage.lake import get_lake_writer
+from batboy.storage.pending import get_pending_targets
+from batboy.storage.queue import JobQueue
+from batboy.storage.shards import shard_db_path
+from batboy.storage.writer import DuckDBWriter, db_lock, with_season_context
 from batboy.utils import setup_logger
 
 logger = setup_logger()
 
+ROSTER_POLARS_SCHEMA = pl.Schema(
+    {col: getattr(pl, dtype) for col, dtype in ROSTER_SCHEMA.items()}
+)
+INT_COLUMNS = {col for col, dtype in ROSTER_SCHEMA.items() if dtype.startswith("Int")}
+# Header-driven columns missing from a table are filled with nulls
+UNMAPPED_COLUMNS = set(ROSTER_SCHEMA) - {"player_id", "player_url"}
 
-def get_team_roster(season_id: int) -> pl.DataFrame:
+
+def get_team_roster(
+    season_id: int, year: Optional[str] = None, use_cache: bool = True
+) -> pl.DataFrame:
     """
     Scrape the team roster table for a given season.
 
     Args:
         season_id: The numeric season ID for the team (from season_url)
+        year: Optional season label; finished seasons are cached indefinitely
+        use_cache: Read from and write to the page cache (False forces a fetch)
 
     Returns:
         Polars DataFrame with normalized roster fields.
@@ -24,21 +56,35 @@ def get_team_roster(season_id: int) -> pl.DataFrame:
     url = f"{BASE_DOMAIN}/teams/{season_id}/roster"
     logger.info(f"🔗 Fetching roster from {url}")
 
-    dom: Optional[HTMLParser] = get_dom(url)
+    dom: Optional[HTMLParser] = fetch_dom(
+        url,
+        PAGE_SELECTORS["roster"],
+        use_cache=use_cache,
+        cache_ttl=season_ttl(year) if year else None,
+    )
     if dom is None or dom.root is None:
         raise ValueError(f"❌ Failed to load DOM for roster page: {url}")
 
     logger.info("✅ DOM successfully retrieved.")
+    with timed("parse_roster"):
+        return _parse_roster_dom(dom)
+
 
-    # Try to locate the scrolling roster table
+def _parse_roster_dom(dom: HTMLParser) -> pl.DataFrame:
+    """Extract normalized roster rows from a pre-parsed roster page."""
+    # Rendered pages wrap the roster in a scrolling DataTable; server HTML
+    # only has the bare table, so fall back to the one listing players.
     scroll_body = dom.css_first(".dataTables_scrollBody")
-    if not scroll_body:
-        logger.warning("❌ dataTables_scrollBody not found in DOM.")
-        return pl.DataFrame()
+    if scroll_body:
+        table = scroll_body.css_first("table")
+    else:
+        table = next(
+            (t for t in dom.css("table") if t.css_first("a[href*='/players/']")),
+            None,
+        )
 
-    table = scroll_body.css_first("table")
     if not table:
-        logger.warning("❌ No <table> found inside dataTables_scrollBody.")
+        logger.warning("❌ No roster <table> found in DOM.")
         return pl.DataFrame()
 
     thead = table.css_first("thead")
@@ -52,247 +98,182 @@ def get_team_roster(season_id: int) -> pl.DataFrame:
     headers = [th.text(strip=True) for th in thead.css("th")]
     logger.info(f"📋 Table headers: {headers}")
 
-    rows = tbody.css("tr")
+    # Map header positions to canonical columns once per table (first wins)
+    positions = {}
+    for i, header in enumerate(headers):
+        col = ROSTER_HEADER_MAP.get(header)
+        if col and col not in positions.values():
+            positions[i] = col
+    name_index = next((i for i, col in positions.items() if col == "player_name"), None)
+    if name_index is None:
+        logger.warning(f"⚠️ No Name column in roster headers {headers}")
+
+    rows = [[td for td in tr.iter() if td.tag == "td"] for tr in tbody.css("tr")]
     logger.info(f"🧍 Found {len(rows)} roster rows")
 
-    records = []
-
-    for row in rows:
-        cells = row.css("td")
+    columns = {col: [] for col in ROSTER_SCHEMA}
+    missing = UNMAPPED_COLUMNS.difference(positions.values())
+    for cells in rows:
         if len(cells) != len(headers):
             logger.warning(
                 f"⚠️ Skipping row with {len(cells)} cells (expected {len(headers)})"
             )
             continue
 
-        record = {}
-        for i, header in enumerate(headers):
+        for col in missing:
+            columns[col].append(None)
+        for i, col in positions.items():
             text = cells[i].text(strip=True)
-            record[header] = text
-
-        # Extract player_id and URL from the "Name" column
-        name_cell = cells[3]
-        link = name_cell.css_first("a")
-        player_id = None
-        player_url = None
-        if link:
-            href = link.attrs.get("href")
-            if href and "/players/" in href:
-                player_url = f"{BASE_DOMAIN}{href}"
-                match = re.search(r"/players/(\d+)", href)
-                if match:
-                    player_id = int(match.group(1))
-        record["player_id"] = player_id
-        record["player_url"] = player_url
-
-        records.append(record)
-
-    df = pl.DataFrame(records)
-
-    # Rename columns to normalized names if they exist
-    column_renames = {
-        "GP": "gp",
-        "GS": "gs",
-        "#": "number",
-        "Name": "player_name",
-        "Class": "class",
-        "Position": "position",
-        "Height": "height",
-        "Bats": "bats",
-        "Throws": "throws",
-        "Hometown": "hometown",
-        "High School": "highschool",
-    }
-
-    # Only rename columns that exist in this dataframe
-    rename_subset = {k: v for k, v in column_renames.items() if k in df.columns}
-    df = df.rename(rename_subset)
-
-    # Final column ordering
-    full_schema = [
-        "player_id",
-        "player_name",
-        "player_url",
-        "gp",
-        "gs",
-        "number",
-        "class",
-        "position",
-        "height",
-        "bats",
-        "throws",
-        "hometown",
-        "highschool",
-    ]
-
-    for col in full_schema:
-        if col not in df.columns:
-            df = df.with_columns(pl.lit(None).alias(col))
-
-    return df.select(full_schema)
-
-
-def append_roster_data(
-    df: pl.DataFrame,
-    org_id: int,
-    school_name: str,
-    season_url: str,
-    year: str,
-) -> None:
-    """
-    Append roster data to DuckDB with team-season context.
-    """
-    if df.is_empty():
-        return
-
-    df = df.with_columns(
-        org_id=pl.lit(org_id, dtype=pl.Int32),
-        school_name=pl.lit(school_name, dtype=pl.String),
-        season_url=pl.lit(season_url, dtype=pl.String),
-        year=pl.lit(year, dtype=pl.String),
-    )
-
-    import duckdb
+            columns[col].append(to_int(text) if col in INT_COLUMNS else text)
 
-    from batboy.config.constants import ROSTER_DATA_TABLE, ROSTER_DB_PATH
+        # player_id and URL come from the link in the Name column
+        player_id = player_url = None
+        link = cells[name_index].css_first("a") if name_index is not None else None
+        href = link.attrs.get("href") if link else None
+        if href and "/players/" in href:
+            player_url = f"{BASE_DOMAIN}{href}"
+            match = PLAYER_ID_PATTERN.search(href)
+            if match:
+                player_id = int(match.group(1))
+        columns["player_id"].append(player_id)
+        columns["player_url"].append(player_url)
 
-    con = duckdb.connect(ROSTER_DB_PATH)
-    con.sql(f"""
-        CREATE TABLE IF NOT EXISTS {ROSTER_DATA_TABLE} AS
-        SELECT * FROM df LIMIT 0
-    """)
-    con.register("df", df)
-    con.sql(f"INSERT INTO {ROSTER_DATA_TABLE} SELECT * FROM df")
-    con.unregister("df")
-    con.close()
+    return pl.DataFrame(columns, schema=ROSTER_POLARS_SCHEMA)
 
 
-def log_roster_scrape(
-    org_id: int,
-    school_name: str,
-    season_url: str,
-    success: bool,
-    n_players: int,
-    error: Optional[str] = None,
-) -> None:
+def get_pending_roster_targets(limit: Optional[int] = None) -> pl.DataFrame:
     """
-    Append one row to the log table to record a roster scrape attempt.
+    Return all team-seasons that have a roster tab and have not been scraped.
     """
-    import duckdb
-
-    from batboy.config.constants import ROSTER_DB_PATH, ROSTER_LOG_TABLE
-
-    con = duckdb.connect(ROSTER_DB_PATH)
-    con.execute(f"""
-        CREATE TABLE IF NOT EXISTS {ROSTER_LOG_TABLE} (
-            org_id INTEGER,
-            school_name TEXT,
-            season_url TEXT,
-            success BOOLEAN,
-            n_players INTEGER,
-            error TEXT
-        );
-    """)
-    con.execute(
+    return get_pending_targets(
+        ROSTER_DB_PATH,
+        ROSTER_LOG_TABLE,
+        ROSTER_LOG_COLUMNS,
+        INFO_DB_PATH,
         f"""
-        INSERT INTO {ROSTER_LOG_TABLE} (
-            org_id, school_name, season_url, success, n_players, error
-        )
-        VALUES (?, ?, ?, ?, ?, ?)
+            SELECT org_id, school_name, season_url, year
+            FROM source.{SEASON_INFO_TABLE_NAME}
+            WHERE has_roster = TRUE
         """,
-        (org_id, school_name, season_url, success, n_players, error),
+        limit=limit,
     )
-    con.close()
 
 
-def get_pending_roster_targets(limit: Optional[int] = None) -> pl.DataFrame:
+def batch_scrape_team_rosters(
+    limit: Optional[int] = None, workers: int = 1, queue: bool = False
+) -> None:
     """
-    Return all team-seasons that have a roster tab and have not been scraped.
+    Batch scrape team rosters for all team-seasons with has_roster = TRUE.
+    Uses resume logic based on prior logs; `workers` > 1 fetches seasons
+    concurrently while writes stay on the calling thread. With `queue`,
+    pending seasons go through the shared job queue so several processes
+    can run this concurrently.
     """
-    import duckdb
-
-    from batboy.config.constants import INFO_DB_PATH, ROSTER_DB_PATH, ROSTER_LOG_TABLE
-
-    con = duckdb.connect(ROSTER_DB_PATH)
-    con.sql(f"""
-        CREATE TABLE IF NOT EXISTS {ROSTER_LOG_TABLE} (
-            org_id INTEGER,
-            school_name TEXT,
-            season_url TEXT,
-            success BOOLEAN,
-            n_players INTEGER,
-            error TEXT
-        );
-    """)
-    scraped_urls = con.sql(
-        f"SELECT DISTINCT season_url FROM {ROSTER_LOG_TABLE}"
-    ).fetchall()
-    already_done = {row[0] for row in scraped_urls}
-    con.close()
-
-    con_info = duckdb.connect(INFO_DB_PATH)
-    df = con_info.sql("""
-        SELECT org_id, school_name, season_url, year
-        FROM season_info
-        WHERE has_roster = TRUE
-    """).pl()
-    con_info.close()
-
-    pending = df.filter(~pl.col("season_url").is_in(already_done))
-    if limit:
-        pending = pending.head(limit)
+    logger.info(
+        f"\n🚦 Starting batch scrape of team rosters "
+        f"(limit={limit}, workers={workers}, queue={queue})"
+    )
+    if queue:
+        # Other worker processes may be writing the same DB file
+        with db_lock(shard_db_path(ROSTER_DB_PATH)):
+            pending = get_pending_roster_targets(limit)
+        job_queue = JobQueue()
+        job_queue.enqueue("rosters", pending, "season_url")
+    else:
+        pending = get_pending_roster_targets(limit)
+
+    if pending.is_empty() and not queue:
+        logger.info("📭 Nothing to scrape — all team rosters are logged.")
+        return
 
-    return pending
+    def scrape(row: dict) -> pl.DataFrame:
+        logger.info(f"\n🧍 {row['school_name']} {row['year']} — {row['season_url']}")
+        season_id = int(row["season_url"].strip("/").split("/")[-1])
+        return get_team_roster(season_id, row["year"])
+
+    writer = DuckDBWriter(
+        shard_db_path(ROSTER_DB_PATH),
+        ROSTER_DATA_TABLE,
+        log_table=ROSTER_LOG_TABLE,
+        log_columns=ROSTER_LOG_COLUMNS,
+        # Queue jobs are completed right after write(), so flush each season
+        flush_every=1 if queue else WRITER_FLUSH_EVERY,
+        shared=queue,
+        lake=get_lake_writer(ROSTER_DATA_TABLE, with_divisions=True),
+    )
 
+    def write(row: dict, df: Optional[pl.DataFrame], error: Optional[Exception]):
+        log = {
+            "org_id": row["org_id"],
+            "school_name": row["school_name"],
+            "season_url": row["season_url"],
+        }
+        if error is not None or df is None:
+            logger.error(f"❌ Failed: {error}")
+            writer.add(
+                log={**log, "success": False, "n_players": 0, "error": str(error)}
+            )
+            return
 
-def batch_scrape_team_rosters(limit: Optional[int] = None) -> None:
-    """
-    Batch scrape team rosters for all team-seasons with has_roster = TRUE.
-    Uses resume logic based on prior logs.
+        data = with_season_context(df, **log, year=row["year"])
+        writer.add(data, log={**log, "success": True, "n_players": df.shape[0]})
+        logger.info(f"✅ Scraped {df.shape[0]} players.")
+
+    with writer:
+        if queue:
+            run_queue(job_queue, "rosters", "season_url", scrape, write, workers)
+        else:
+            run_batch(pending, scrape, write, workers=workers)
+
+    cache = get_page_cache()
+    if cache is not None:
+        logger.info(f"📦 Page cache: {cache.stats()}")
+    export_metrics("rosters")
+
+
+def refresh_team_rosters(
+    workers: int = 1, limit: Optional[int] = None
+) -> Dict[str, int]:
     """
-    from batboy.scraping.rosters import (
-        get_team_roster,
-    )  # or inline depending on location
+    Incrementally refresh rosters of seasons that are still in progress.
 
-    logger.info(f"\n🚦 Starting batch scrape of team rosters (limit={limit})")
-    pending = get_pending_roster_targets(limit)
+    Unlike batch_scrape_team_rosters, which skips every season_url already in the log,
+    this re-fetches only open seasons (has_roster = TRUE and not yet finished
+    per season_ttl), bypassing the page cache, and rewrites a season's rows
+    only when the hash of its parsed table changed since the last refresh.
 
-    if pending.is_empty():
-        logger.info("📭 Nothing to scrape — all team rosters are logged.")
-        return
+    Args:
+        workers: Number of concurrent browser workers (writes stay serial)
+        limit: Optional maximum number of seasons to refresh
 
-    for row in pending.iter_rows(named=True):
-        org_id = row["org_id"]
-        school_name = row["school_name"]
-        season_url = row["season_url"]
-        year = row["year"]
-
-        logger.info(f"\n🧍 {school_name} {year} — {season_url}")
-
-        try:
-            season_id = int(season_url.strip("/").split("/")[-1])
-            df = get_team_roster(season_id)
-            n_players = df.shape[0]
-            append_roster_data(df, org_id, school_name, season_url, year)
-            log_roster_scrape(
-                org_id=org_id,
-                school_name=school_name,
-                season_url=season_url,
-                success=True,
-                n_players=n_players,
-            )
-            logger.info(f"✅ Scraped {n_players} players.")
-
-        except Exception as e:
-            logger.error(f"❌ Failed: {e}")
-            log_roster_scrape(
-                org_id=org_id,
-                school_name=school_name,
-                season_url=season_url,
-                success=False,
-                n_players=0,
-                error=str(e),
-            )
+    Returns:
+        Counts of "changed", "unchanged" and "failed" seasons.
+    """
+    targets = get_open_season_targets("has_roster")
+    if limit:
+        targets = targets.head(limit)
+    logger.info(
+        f"\n🔄 Refreshing {targets.shape[0]} open-season rosters (workers={workers})"
+    )
+    if targets.is_empty():
+        logger.info("📭 No open seasons to refresh.")
+        return {"changed": 0, "unchanged": 0, "failed": 0}
+
+    def scrape(row: dict) -> pl.DataFrame:
+        logger.info(f"\n🧍 {row['school_name']} {row['year']} — {row['season_url']}")
+        season_id = int(row["season_url"].strip("/").split("/")[-1])
+        return get_team_roster(season_id, row["year"], use_cache=False)
+
+    writer = DuckDBWriter(
+        shard_db_path(ROSTER_DB_PATH),
+        ROSTER_DATA_TABLE,
+        log_table=ROSTER_LOG_TABLE,
+        log_columns=ROSTER_LOG_COLUMNS,
+        lake=get_lake_writer(ROSTER_DATA_TABLE, with_divisions=True),
+    )
+    counts = refresh_seasons(targets, scrape, writer, "n_players", workers=workers)
+    export_metrics("refresh_rosters")
+    return counts
 
 
 if __name__ == "__main__":
@@ -1,25 +1,189 @@
-import re
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import duckdb
 import polars as pl
-from selectolax.parser import HTMLParser
+from selectolax.parser import HTMLParser, Node
 
 from batboy.config.constants import (
     BASE_DOMAIN,
     INFO_DB_PATH,
+    PAGE_SELECTORS,
     SCHEDULE_DATA_TABLE,
+    SCHEDULE_LOG_COLUMNS,
     SCHEDULE_LOG_TABLE,
+    SEASON_INFO_TABLE_NAME,
     SEASON_SCHEDULE_DB,
+    WRITER_FLUSH_EVERY,
 )
-from batboy.scraping.core import get_dom
+from batboy.metrics import export_metrics, timed
+from batboy.scraping.batch import run_batch, run_queue
+from batboy.scraping.cache import get_page_cache, season_ttl
+from batboy.scraping.core import fetch_dom
+from batboy.scraping.refresh import get_open_season_targets, refresh_seasons
+from batboy.storage.lake import get_lake_writer
+from batboy.storage.pending import get_pending_targets
+from batboy.storage.queue import JobQueue
+from batboy.storage.shards import shard_db_path
+from batboy.storage.writer import DuckDBWriter, db_lock, with_season_context
 from batboy.utils import setup_logger
 
 logger = setup_logger()
 
 
+SCHEDULE_COLUMNS = [
+    "date",
+    "opponent_raw",
+    "opponent_name",
+    "opponent_id",
+    "opponent_rank",
+    "opponent_site",
+    "opponent_note",
+    "result",
+    "team_score",
+    "opp_score",
+    "innings",
+    "attendance",
+    "game_id",
+]
+
+# Raw cell text and hrefs collected from the DOM, one list per column
+RAW_SCHEDULE_COLUMNS = [
+    "date",
+    "opponent_raw",
+    "opponent_anchor",
+    "opponent_href",
+    "result",
+    "result_href",
+    "attendance_raw",
+]
+
+
+def _derive_schedule_fields(raw: pl.DataFrame) -> pl.DataFrame:
+    """
+    Derive the schedule fields from raw cell text with vectorized expressions.
+
+    Shared by the legacy (3-column) and modern (4-column) formats; legacy
+    pages simply have no attendance text.
+
+    Args:
+        raw: DataFrame with the RAW_SCHEDULE_COLUMNS (all strings)
+
+    Returns:
+        DataFrame with the SCHEDULE_COLUMNS
+    """
+    has_anchor = pl.col("opponent_anchor").is_not_null()
+    name = pl.col("opponent_name")
+    parts = pl.col("_note_parts")
+
+    return (
+        raw.lazy()
+        .with_columns(
+            _score=pl.col("result").str.extract_groups(
+                r"[WL] (\d+)\s*-\s*(\d+)(?: \((\d+)\))?"
+            ),
+            opponent_id=pl.col("opponent_href")
+            .str.extract(r"/teams/(\d+)")
+            .cast(pl.Int64),
+            opponent_rank=pl.col("opponent_anchor")
+            .str.extract(r"^#(\d+)\s+")
+            .cast(pl.Int64),
+            opponent_name=pl.when(has_anchor)
+            .then(
+                pl.coalesce(
+                    pl.col("opponent_anchor").str.extract(r"^#\d+\s+(.*)"),
+                    pl.col("opponent_anchor"),
+                )
+            )
+            .otherwise(pl.col("opponent_raw")),
+            opponent_site=pl.when(has_anchor)
+            .then(pl.col("opponent_raw").str.extract(r"^(@|vs)").fill_null(""))
+            .otherwise(pl.lit("")),
+            attendance=pl.col("attendance_raw")
+            .str.replace_all(",", "", literal=True)
+            .cast(pl.Int64, strict=False),
+            game_id=pl.col("result_href")
+            .str.extract(r"/contests/(\d+)/box_score")
+            .cast(pl.Int64),
+        )
+        .with_columns(
+            team_score=pl.col("_score").struct.field("1").cast(pl.Int64),
+            opp_score=pl.col("_score").struct.field("2").cast(pl.Int64),
+            innings=pl.col("_score").struct.field("3").cast(pl.Int64),
+            # Whatever is left of the opponent cell once the site, rank and
+            # name are removed is the note (neutral site, tournament, ...)
+            _note_parts=pl.col("opponent_raw")
+            .str.strip_prefix(pl.col("opponent_site"))
+            .str.strip_chars()
+            .str.replace_all(r"#\d+", "")
+            .str.strip_chars()
+            .str.split(name),
+        )
+        .with_columns(
+            # Rejoining after the first split drops only the first occurrence
+            opponent_note=pl.when(has_anchor & (parts.list.len() > 1))
+            .then(
+                pl.concat_str(
+                    parts.list.first(), parts.list.slice(1).list.join(name)
+                ).str.strip_chars()
+            )
+            .otherwise(pl.lit(""))
+        )
+        .select(SCHEDULE_COLUMNS)
+        .collect()
+    )
+
+
 def _parse_schedule_dom(dom: HTMLParser, season_url: str) -> pl.DataFrame:
     """Extract schedule data from a pre-parsed DOM."""
+    raw = _collect_schedule_cells(dom, season_url)
+    if raw.is_empty():
+        return pl.DataFrame()
+    return _derive_schedule_fields(raw)
+
+
+def _parse_schedule_pages(pages: Iterable[Tuple[str, str]]) -> pl.DataFrame:
+    """
+    Reparse many saved schedule pages at once.
+
+    Cells are collected page by page, but the field extraction runs once over
+    the combined frame, so large archives are bound by HTML parsing.
+
+    Args:
+        pages: (season_url, html) pairs
+
+    Returns:
+        Polars DataFrame with the schedule columns plus season_url.
+    """
+    frames = [
+        _collect_schedule_cells(HTMLParser(html), season_url).with_columns(
+            season_url=pl.lit(season_url, dtype=pl.String)
+        )
+        for season_url, html in pages
+    ]
+    frames = [f for f in frames if not f.is_empty()]
+    if not frames:
+        return pl.DataFrame()
+    raw = pl.concat(frames)
+    return _derive_schedule_fields(raw).with_columns(raw["season_url"])
+
+
+def _row_cells(row: Node) -> List[Node]:
+    """Direct <td> children of a row (cheaper than a CSS query per row)."""
+    return [child for child in row.iter() if child.tag == "td"]
+
+
+def _first_link(cell: Node) -> Optional[Node]:
+    return next((node for node in cell.traverse() if node.tag == "a"), None)
+
+
+def _collect_schedule_cells(dom: HTMLParser, season_url: str) -> pl.DataFrame:
+    """
+    Collect the raw cell text and links of each game row (no field parsing).
+
+    The table is walked once: each row's cells are looked up a single time,
+    reused for format detection and extraction, and written into
+    preallocated column lists.
+    """
+    empty = pl.DataFrame(schema={col: pl.String for col in RAW_SCHEDULE_COLUMNS})
     header = next(
         (
             h
@@ -36,217 +200,83 @@ def _parse_schedule_dom(dom: HTMLParser, season_url: str) -> pl.DataFrame:
 
     if table is None:
         logger.warning(f"❌ Schedule table not found at {season_url}")
-        return pl.DataFrame()
-    if table is None:
-        logger.warning(f"❌ Schedule table not found at {season_url}")
-        return pl.DataFrame()
+        return empty
 
-    rows = table.css("tr")
+    rows = [(row, _row_cells(row)) for row in table.css("tr")]
 
-    # Try to find the first row with at least 3 <td> cells
-    data_row = next((r for r in rows if len(r.css("td")) >= 3), None)
-    if not data_row:
+    # The first row with at least 3 <td> cells decides the format
+    num_cols = next((len(cells) for _, cells in rows if len(cells) >= 3), 0)
+    if num_cols == 0:
         logger.warning(f"❌ No data rows with >=3 <td> cells at {season_url}")
-        return pl.DataFrame()
-
-    num_cols = len(data_row.css("td"))
+        return empty
 
     if num_cols == 3:
         logger.info("🕰 Detected pre-2018 schedule legacy format (no attendance column)")
-        records = []
-        for row in rows:
-            cells = row.css("td")
-            if len(cells) != 3:
-                continue  # only process rows with exactly 3 columns
-
-            date = cells[0].text(strip=True)
-
-            # Opponent info
-            opp = cells[1]
-            opponent_raw = opp.text(strip=True)
-            opponent_name = opponent_raw
-            opponent_id = None
-            opponent_site = ""
-            opponent_note = ""
-
-            a_tag = opp.css_first("a")
-            if a_tag:
-                href = a_tag.attrs.get("href") or ""
-                m = re.search(r"/teams/(\d+)", href)
-                if m:
-                    opponent_id = int(m.group(1))
-
-                anchor_text = a_tag.text(strip=True)
-                opponent_name = anchor_text.strip()
-
-                # Check for @ or vs in full opponent text
-                prefix_match = re.match(r"(@|vs)?\s*(.*)", opponent_raw)
-                if prefix_match:
-                    if prefix_match.group(1):
-                        opponent_site = prefix_match.group(1)
-                    remainder = prefix_match.group(2)
-                    if opponent_name in remainder:
-                        opponent_note = remainder.replace(opponent_name, "").strip()
-
-            # Result and game_id
-            result_cell = cells[2]
-            result = result_cell.text(strip=True)
-            team_score = opp_score = innings = game_id = None
-
-            m = re.search(r"[WL] (\d+)\s*-\s*(\d+)(?: \((\d+)\))?", result)
-            if m:
-                team_score = int(m.group(1))
-                opp_score = int(m.group(2))
-                if m.group(3):
-                    innings = int(m.group(3))
-
-            link = result_cell.css_first("a")
-            if link:
-                href = link.attrs.get("href") or ""
-                m = re.search(r"/contests/(\d+)/box_score", href)
-                if m:
-                    game_id = int(m.group(1))
-
-            records.append(
-                {
-                    "date": date,
-                    "opponent_raw": opponent_raw,
-                    "opponent_name": opponent_name,
-                    "opponent_id": opponent_id,
-                    "opponent_rank": None,
-                    "opponent_site": opponent_site,
-                    "opponent_note": opponent_note,
-                    "result": result,
-                    "team_score": team_score,
-                    "opp_score": opp_score,
-                    "innings": innings,
-                    "attendance": None,  # no attendance available pre-2018
-                    "game_id": game_id,
-                }
-            )
-
-        return pl.DataFrame(records)
-
-    elif num_cols >= 4:
-        logger.info("📅 Detected modern schedule format (attendance column present)")
-        tbody = table.css_first("tbody")
-        if tbody is None:
-            logger.warning(f"❌ Schedule table has no <tbody> at {season_url}")
-            return pl.DataFrame()
-
-        rows = tbody.css("tr.underline_rows")
-        records = []
-
-        for row in rows:
-            cells = row.css("td")
-            if len(cells) < 4:
-                continue
-
-            date = cells[0].text(strip=True)
-
-            # Opponent breakdown
-            opp = cells[1]
-            opponent_raw = opp.text(strip=True)
-            opponent_id = None
-            opponent_rank = None
-            opponent_name = opponent_raw
-            opponent_site = ""
-            opponent_note = ""
-
-            a_tag = opp.css_first("a")
-            if a_tag:
-                href = a_tag.attrs.get("href") or ""
-                m = re.search(r"/teams/(\d+)", href)
-                if m:
-                    opponent_id = int(m.group(1))
-
-                anchor_text = a_tag.text(strip=True)
-
-                # Try to extract opponent rank from anchor_text
-                rank_match = re.match(r"#(\d+)\s+(.*)", anchor_text)
-                if rank_match:
-                    opponent_rank = int(rank_match.group(1))
-                    opponent_name = rank_match.group(2)
-                else:
-                    opponent_name = anchor_text
-
-                # Check for @ or vs prefix in raw text (not anchor)
-                prefix_match = re.match(r"(@|vs)?\s*#?(\d+)?\s*", opponent_raw)
-                if prefix_match:
-                    if prefix_match.group(1):
-                        opponent_site = prefix_match.group(1)
-
-                # Remove known pieces to extract note
-                cleaned = opponent_raw
-                cleaned = re.sub(rf"^{re.escape(opponent_site)}", "", cleaned).strip()
-                cleaned = re.sub(r"#\d+", "", cleaned).strip()
-                cleaned = cleaned.replace(opponent_name, "", 1).strip()
-                if cleaned:
-                    opponent_note = cleaned
-
-            # Result and game_id
-            result = cells[2].text(strip=True)
-            team_score, opp_score, innings = None, None, None
-            m = re.search(r"[WL] (\d+)-(\d+)(?: \((\d+)\))?", result)
-            if m:
-                team_score = int(m.group(1))
-                opp_score = int(m.group(2))
-                if m.group(3):
-                    innings = int(m.group(3))
-
-            game_id = None
-            result_link = cells[2].css_first("a")
-            if result_link:
-                href = result_link.attrs.get("href") or ""
-                m = re.search(r"/contests/(\d+)/box_score", href)
-                if m:
-                    game_id = int(m.group(1))
-
-            att_raw = cells[3].text(strip=True).replace(",", "")
-            try:
-                attendance = int(att_raw)
-            except ValueError:
-                attendance = None
-
-            record = {
-                "date": date,
-                "opponent_raw": opponent_raw,
-                "opponent_name": opponent_name,
-                "opponent_id": opponent_id,
-                "opponent_rank": opponent_rank,
-                "opponent_site": opponent_site,
-                "opponent_note": opponent_note,
-                "result": result,
-                "team_score": team_score,
-                "opp_score": opp_score,
-                "innings": innings,
-                "attendance": attendance,
-                "game_id": game_id,
-            }
-            records.append(record)
-
-        return pl.DataFrame(records)
+        games = [cells for _, cells in rows if len(cells) == 3]
     else:
-        logger.warning(f"⚠️ Unrecognized schedule format: {num_cols} columns")
-        return pl.DataFrame()
-
-
-def get_team_schedule(season_url: str) -> pl.DataFrame:
+        logger.info("📅 Detected modern schedule format (attendance column present)")
+        games = [
+            cells
+            for row, cells in rows
+            if len(cells) >= 4
+            and "underline_rows" in (row.attributes.get("class") or "").split()
+        ]
+
+    columns = {col: [None] * len(games) for col in RAW_SCHEDULE_COLUMNS}
+    (
+        date,
+        opponent_raw,
+        opponent_anchor,
+        opponent_href,
+        result,
+        result_href,
+        attendance_raw,
+    ) = columns.values()
+    for i, cells in enumerate(games):
+        opp_cell, result_cell = cells[1], cells[2]
+        date[i] = cells[0].text(strip=True)
+        opponent_raw[i] = opp_cell.text(strip=True)
+        result[i] = result_cell.text(strip=True)
+        if num_cols > 3:
+            attendance_raw[i] = cells[3].text(strip=True)
+
+        opp_link = _first_link(opp_cell)
+        if opp_link is not None:
+            opponent_anchor[i] = opp_link.text(strip=True)
+            opponent_href[i] = opp_link.attrs.get("href")
+        result_link = _first_link(result_cell)
+        if result_link is not None:
+            result_href[i] = result_link.attrs.get("href")
+
+    return pl.DataFrame(columns, schema=empty.schema)
+
+
+def get_team_schedule(
+    season_url: str, year: Optional[str] = None, use_cache: bool = True
+) -> pl.DataFrame:
     """
     Scrape the schedule/results table for a given team season page.
 
     Args:
         season_url: Full URL to the team's season page (e.g., https://stats.ncaa.org/teams/596721)
+        year: Optional season label; finished seasons are cached indefinitely
+        use_cache: Read from and write to the page cache (False forces a fetch)
 
     Returns:
         Polars DataFrame with schedule and result metadata.
     """
-    dom: Optional[HTMLParser] = get_dom(f"{BASE_DOMAIN}{season_url}")
+    dom: Optional[HTMLParser] = fetch_dom(
+        f"{BASE_DOMAIN}{season_url}",
+        PAGE_SELECTORS["schedule"],
+        use_cache=use_cache,
+        cache_ttl=season_ttl(year) if year else None,
+    )
     if dom is None or dom.root is None:
         logger.error(f"❌ Failed to load DOM from {season_url}")
         return pl.DataFrame()
 
-    df = _parse_schedule_dom(dom, season_url)
+    with timed("parse_schedule"):
+        df = _parse_schedule_dom(dom, season_url)
     logger.info(f"Parsed {df.shape[0]} games from {season_url}")
     if df.shape[0] > 0:
         logger.debug(f"First game: {df[0]}")
@@ -261,116 +291,23 @@ def get_pending_schedule_targets(limit: Optional[int] = None) -> pl.DataFrame:
         Polars DataFrame with columns:
         ["org_id", "school_name", "season_url", "year"]
     """
-    # Connect to target DB and create log table if missing
-    con = duckdb.connect(SEASON_SCHEDULE_DB)
-    con.execute(f"""
-        CREATE TABLE IF NOT EXISTS {SCHEDULE_LOG_TABLE} (
-            org_id INTEGER,
-            school_name TEXT,
-            season_url TEXT,
-            success BOOLEAN,
-            n_games INTEGER,
-            error TEXT
-        );
-    """)
-    scraped_urls = con.sql(
-        f"SELECT DISTINCT season_url FROM {SCHEDULE_LOG_TABLE}"
-    ).fetchall()
-    already_done = {row[0] for row in scraped_urls}
-    con.close()
-
-    # Load from audit DB
-    con_audit = duckdb.connect(INFO_DB_PATH)
-    df = con_audit.sql("""
-        SELECT org_id, school_name, season_url, year
-        FROM season_info
-        WHERE has_schedule = TRUE
-    """).pl()
-    con_audit.close()
-
-    # Exclude completed URLs
-    pending = df.filter(~pl.col("season_url").is_in(already_done))
-
-    if limit:
-        pending = pending.head(limit)
-
-    return pending
-
-
-def log_scrape_result(
-    org_id: int,
-    school_name: str,
-    season_url: str,
-    success: bool,
-    n_games: int,
-    error: Optional[str] = None,
-) -> None:
-    """
-    Append one row to the log table to record scrape attempt.
-
-    Args:
-        org_id: Team org_id
-        school_name: Full school name
-        season_url: Unique identifier for team-season
-        success: Whether schedule scrape succeeded
-        n_games: Number of games parsed (0 if failed)
-        error: Optional error message on failure
-    """
-    con = duckdb.connect(SEASON_SCHEDULE_DB)
-
-    con.execute(
+    return get_pending_targets(
+        SEASON_SCHEDULE_DB,
+        SCHEDULE_LOG_TABLE,
+        SCHEDULE_LOG_COLUMNS,
+        INFO_DB_PATH,
         f"""
-        INSERT INTO {SCHEDULE_LOG_TABLE} (
-            org_id, school_name, season_url, success, n_games, error
-        )
-        VALUES (?, ?, ?, ?, ?, ?)
-    """,
-        (org_id, school_name, season_url, success, n_games, error),
+            SELECT org_id, school_name, season_url, year
+            FROM source.{SEASON_INFO_TABLE_NAME}
+            WHERE has_schedule = TRUE
+        """,
+        limit=limit,
     )
 
-    con.close()
-
 
-def append_schedule_data(
-    df: pl.DataFrame,
-    org_id: int,
-    school_name: str,
-    season_url: str,
-    year: str,
+def batch_scrape_team_schedules(
+    limit: Optional[int] = None, workers: int = 1, queue: bool = False
 ) -> None:
-    """
-    Append schedule data to DuckDB with season context.
-
-    Args:
-        df: Game-level schedule records from get_team_schedule()
-        org_id: School org_id
-        school_name: Full school name
-        season_url: Source URL (used for joining and tracing)
-        year: Season year label
-    """
-    if df.is_empty():
-        return
-
-    df = df.with_columns(
-        org_id=pl.lit(org_id, dtype=pl.Int32),
-        school_name=pl.lit(school_name, dtype=pl.String),
-        season_url=pl.lit(season_url, dtype=pl.String),
-        year=pl.lit(year, dtype=pl.String),
-    )
-
-    con = duckdb.connect(SEASON_SCHEDULE_DB)
-
-    con.sql(f"""
-        CREATE TABLE IF NOT EXISTS {SCHEDULE_DATA_TABLE} AS
-        SELECT * FROM df LIMIT 0
-    """)
-    con.register("df", df)
-    con.sql(f"INSERT INTO {SCHEDULE_DATA_TABLE} SELECT * FROM df")
-    con.unregister("df")
-    con.close()
-
-
-def batch_scrape_team_schedules(limit: Optional[int] = None) -> None:
     """
     Batch scrape team schedules from season URLs with resume logic.
 
@@ -380,45 +317,111 @@ def batch_scrape_team_schedules(limit: Optional[int] = None) -> None:
 
     Args:
         limit: Optional limit to number of team-seasons to process
+        workers: Number of concurrent browser workers (writes stay serial)
+        queue: Enqueue the pending seasons in the shared job queue and work
+            it until empty, so several processes can run this concurrently
     """
-    logger.info(f"\n🚦 Starting batch scrape of team schedules (limit={limit})")
-    pending = get_pending_schedule_targets(limit)
+    logger.info(
+        f"\n🚦 Starting batch scrape of team schedules "
+        f"(limit={limit}, workers={workers}, queue={queue})"
+    )
+    if queue:
+        # Other worker processes may be writing the same DB file
+        with db_lock(shard_db_path(SEASON_SCHEDULE_DB)):
+            pending = get_pending_schedule_targets(limit)
+        job_queue = JobQueue()
+        job_queue.enqueue("schedules", pending, "season_url")
+    else:
+        pending = get_pending_schedule_targets(limit)
 
-    if pending.is_empty():
+    if pending.is_empty() and not queue:
         logger.info("📭 Nothing to scrape — all season schedules are logged.")
         return
 
-    for row in pending.iter_rows(named=True):
-        org_id = row["org_id"]
-        school_name = row["school_name"]
-        season_url = row["season_url"]
-        year = row["year"]
-
-        logger.info(f"\n🔍 {school_name} {year} — {season_url}")
-
-        try:
-            df = get_team_schedule(season_url)
-            n_games = df.shape[0]
-            append_schedule_data(df, org_id, school_name, season_url, year)
-            log_scrape_result(
-                org_id=org_id,
-                school_name=school_name,
-                season_url=season_url,
-                success=True,
-                n_games=n_games,
-            )
-            logger.info(f"✅ Scraped {n_games} games.")
-
-        except Exception as e:
-            logger.error(f"❌ Failed: {e}")
-            log_scrape_result(
-                org_id=org_id,
-                school_name=school_name,
-                season_url=season_url,
-                success=False,
-                n_games=0,
-                error=str(e),
-            )
+    def scrape(row: dict) -> pl.DataFrame:
+        logger.info(f"\n🔍 {row['school_name']} {row['year']} — {row['season_url']}")
+        return get_team_schedule(row["season_url"], row["year"])
+
+    writer = DuckDBWriter(
+        shard_db_path(SEASON_SCHEDULE_DB),
+        SCHEDULE_DATA_TABLE,
+        log_table=SCHEDULE_LOG_TABLE,
+        log_columns=SCHEDULE_LOG_COLUMNS,
+        # Queue jobs are completed right after write(), so flush each season
+        flush_every=1 if queue else WRITER_FLUSH_EVERY,
+        shared=queue,
+        lake=get_lake_writer(SCHEDULE_DATA_TABLE, with_divisions=True),
+    )
+
+    def write(row: dict, df: Optional[pl.DataFrame], error: Optional[Exception]):
+        log = {
+            "org_id": row["org_id"],
+            "school_name": row["school_name"],
+            "season_url": row["season_url"],
+        }
+        if error is not None or df is None:
+            logger.error(f"❌ Failed: {error}")
+            writer.add(log={**log, "success": False, "n_games": 0, "error": str(error)})
+            return
+
+        data = with_season_context(df, **log, year=row["year"])
+        writer.add(data, log={**log, "success": True, "n_games": df.shape[0]})
+        logger.info(f"✅ Scraped {df.shape[0]} games.")
+
+    with writer:
+        if queue:
+            run_queue(job_queue, "schedules", "season_url", scrape, write, workers)
+        else:
+            run_batch(pending, scrape, write, workers=workers)
+
+    cache = get_page_cache()
+    if cache is not None:
+        logger.info(f"📦 Page cache: {cache.stats()}")
+    export_metrics("schedules")
+
+
+def refresh_team_schedules(
+    workers: int = 1, limit: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Incrementally refresh schedules of seasons that are still in progress.
+
+    Unlike batch_scrape_team_schedules, which skips every season_url already in the log,
+    this re-fetches only open seasons (has_schedule = TRUE and not yet finished
+    per season_ttl), bypassing the page cache, and rewrites a season's rows
+    only when the hash of its parsed table changed since the last refresh.
+
+    Args:
+        workers: Number of concurrent browser workers (writes stay serial)
+        limit: Optional maximum number of seasons to refresh
+
+    Returns:
+        Counts of "changed", "unchanged" and "failed" seasons.
+    """
+    targets = get_open_season_targets("has_schedule")
+    if limit:
+        targets = targets.head(limit)
+    logger.info(
+        f"\n🔄 Refreshing {targets.shape[0]} open-season schedules (workers={workers})"
+    )
+    if targets.is_empty():
+        logger.info("📭 No open seasons to refresh.")
+        return {"changed": 0, "unchanged": 0, "failed": 0}
+
+    def scrape(row: dict) -> pl.DataFrame:
+        logger.info(f"\n🔍 {row['school_name']} {row['year']} — {row['season_url']}")
+        return get_team_schedule(row["season_url"], row["year"], use_cache=False)
+
+    writer = DuckDBWriter(
+        shard_db_path(SEASON_SCHEDULE_DB),
+        SCHEDULE_DATA_TABLE,
+        log_table=SCHEDULE_LOG_TABLE,
+        log_columns=SCHEDULE_LOG_COLUMNS,
+        lake=get_lake_writer(SCHEDULE_DATA_TABLE, with_divisions=True),
+    )
+    counts = refresh_seasons(targets, scrape, writer, "n_games", workers=workers)
+    export_metrics("refresh_schedules")
+    return counts
 
 
 if __name__ == "__main__":
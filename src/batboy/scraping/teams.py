@@ -1,24 +1,53 @@
-import re
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Set, Union
 
 import polars as pl
 from selectolax.parser import HTMLParser
 
 from batboy.config.constants import (
     BASE_DOMAIN,
+    INFO_DB_PATH,
     NCAA_SCHOOLS,
+    PAGE_SELECTORS,
+    SEASON_INFO_TABLE_NAME,
     TRACKED_TABS,
 )
 from batboy.data import load_schools
-from batboy.scraping.core import get_dom, get_driver, throttle_and_retry
-from batboy.utils import append_to_duckdb, get_completed_org_ids, setup_logger
+from batboy.metrics import export_metrics, timed
+from batboy.scraping.batch import run_queue
+from batboy.scraping.cache import get_page_cache, season_ttl
+from batboy.scraping.core import (
+    fetch_dom,
+    get_driver_pool,
+    throttle_and_retry,
+    wait_for_selector,
+)
+from batboy.scraping.parsing import TEAM_ID_PATTERN
+from batboy.scraping.progress import get_progress
+from batboy.scraping.ratelimit import host_of
+from batboy.storage.lake import get_lake_writer
+from batboy.storage.queue import JobQueue
+from batboy.storage.shards import filter_shard, get_shard, shard_db_path
+from batboy.storage.writer import DuckDBWriter, db_lock
+from batboy.utils import get_completed_org_ids, setup_logger
 
 logger = setup_logger()
 
 DATA_PATH = Path(NCAA_SCHOOLS)
 
+# Every row of the history table, straight from the DataTables API; the
+# rendered DOM only holds the current page.
+TEAM_HISTORY_ROWS_JS = """
+var table = document.querySelector('#team_history_data_table');
+if (!table) { return null; }
+var api = null;
+if (window.jQuery && jQuery.fn.dataTable) { api = jQuery(table).DataTable(); }
+else if (window.DataTable && DataTable.Api) { api = new DataTable.Api(table); }
+if (!api) { return null; }
+return api.rows().nodes().toArray().map(function (r) { return r.outerHTML; }).join('');
+"""
+
 
 def get_ncaa_baseball_teams(refresh: bool = False) -> pl.DataFrame:
     """
@@ -38,9 +67,11 @@ def get_ncaa_baseball_teams(refresh: bool = False) -> pl.DataFrame:
 
     logger.info(f"Fetching list of NCAA baseball teams at {BASE_DOMAIN}/teams/history")
 
-    dom: Optional[HTMLParser] = get_dom(f"{BASE_DOMAIN}/teams/history")
+    dom: Optional[HTMLParser] = fetch_dom(
+        f"{BASE_DOMAIN}/teams/history", PAGE_SELECTORS["teams"]
+    )
     if dom is None or dom.root is None:
-        raise ValueError("get_dom() did not return a valid HTML document")
+        raise ValueError("fetch_dom() did not return a valid HTML document")
 
     select = dom.css_first('select[name="org_id"]')
     if not select:
@@ -63,10 +94,100 @@ def get_ncaa_baseball_teams(refresh: bool = False) -> pl.DataFrame:
     return df
 
 
+def _get_team_history_dom(url: str) -> HTMLParser:
+    """
+    Fetch a team history page with every season row present.
+
+    The server HTML carries the full table before DataTables paginates it,
+    so a static fetch is tried first. If that is unavailable, the page is
+    rendered once and all rows are pulled through the DataTables JS API.
+    When the API is unavailable the render is retried and, failing that,
+    an error is raised; a partial table is never returned or cached.
+    """
+    selector = PAGE_SELECTORS["team_history"]
+    dom = fetch_dom(url, selector, render=False)
+    if dom is not None:
+        return dom
+
+    def fetch():
+        with get_driver_pool().borrow() as driver:
+            with timed("navigate"):
+                driver.get(url)
+            with timed("ready_wait"):
+                wait_for_selector(driver, selector)
+            rows_html = driver.execute_script(TEAM_HISTORY_ROWS_JS)
+            if rows_html is None:
+                # The rendered DOM holds only the first page of seasons;
+                # returning it would cache a truncated history for good
+                raise ValueError(f"DataTables API unavailable on {url}")
+            return (
+                '<html><body><table id="team_history_data_table">'
+                f"<tbody>{rows_html}</tbody></table></body></html>"
+            )
+
+    html = throttle_and_retry(fetch, host=host_of(url))
+    cache = get_page_cache()
+    if cache is not None:
+        cache.put(url, html)
+    return HTMLParser(html)
+
+
+def _parse_team_history(dom: HTMLParser, org_id: int) -> List[Dict]:
+    """Extract one record per season from the team history table."""
+    table = dom.css_first("#team_history_data_table")
+    if not table:
+        raise ValueError("No team history table found in DOM.")
+
+    tbody = table.css_first("tbody")
+    if not tbody:
+        raise ValueError("Table missing <tbody>.")
+
+    records = []
+    for row in tbody.css("tr"):
+        cells = row.css("td")
+        if len(cells) < 9:
+            continue
+
+        season_id = None
+        season_url = None
+        year_cell = cells[0]
+        year_label = year_cell.text(strip=True)
+
+        year_link = year_cell.css_first("a")
+        if year_link:
+            href = year_link.attributes.get("href")
+            if isinstance(href, str):
+                season_url = href
+                match = TEAM_ID_PATTERN.search(href)
+                if match:
+                    season_id = int(match.group(1))
+
+        try:
+            record = {
+                "org_id": org_id,
+                "season_id": season_id,
+                "season_url": season_url,
+                "year": year_label,
+                "coach": cells[1].text(strip=True),
+                "division": cells[2].text(strip=True),
+                "conference": cells[3].text(strip=True),
+                "wins": int(cells[4].text(strip=True)),
+                "losses": int(cells[5].text(strip=True)),
+                "ties": int(cells[6].text(strip=True)),
+                "win_pct": float(cells[7].text(strip=True)),
+                "notes": cells[8].text(strip=True),
+            }
+            records.append(record)
+        except Exception:
+            continue
+
+    return records
+
+
 def get_team_seasons(team: Union[int, str]) -> pl.DataFrame:
     """
     Scrape all seasons for a given NCAA baseball team.
-    Handles pagination and expands result beyond 25 default entries.
+    Reads every history row in one fetch, without paging through the table.
 
     Accepts either org_id (int) or school name (str).
     """
@@ -92,92 +213,9 @@ def get_team_seasons(team: Union[int, str]) -> pl.DataFrame:
     url = f"{BASE_DOMAIN}/teams/history?org_id={org_id}&sport_code=MBA"
     logger.info(f"Fetching seasons for {team_label} ({org_id}) from {url}")
 
-    # Use a live Selenium driver to interact with dropdown and pagination
-    driver = get_driver(headless=True)
-    driver.get(url)
-    time.sleep(2.0)
-
-    # Select 100 entries per page
-    try:
-        select = driver.find_element("name", "team_history_data_table_length")
-        for option in select.find_elements("tag name", "option"):
-            if option.get_attribute("value") == "100":
-                option.click()
-                time.sleep(2.0)  # Allow time for table to reload
-                break
-    except Exception as e:
-        driver.quit()
-        raise RuntimeError(f"Failed to select page length dropdown: {e}")
-
-    records = []
-
-    while True:
-        html = driver.page_source
-        dom = HTMLParser(html)
-        table = dom.css_first("#team_history_data_table")
-        if not table:
-            driver.quit()
-            raise ValueError("No team history table found in DOM.")
-
-        tbody = table.css_first("tbody")
-        if not tbody:
-            driver.quit()
-            raise ValueError("Table missing <tbody>.")
-
-        for row in tbody.css("tr"):
-            cells = row.css("td")
-            if len(cells) < 9:
-                continue
-
-            season_id = None
-            season_url = None
-            year_cell = cells[0]
-            year_label = year_cell.text(strip=True)
-
-            year_link = year_cell.css_first("a")
-            if year_link:
-                href = year_link.attributes.get("href")
-                if isinstance(href, str):
-                    season_url = href
-                    match = re.search(r"/teams/(\d+)", href)
-                    if match:
-                        season_id = int(match.group(1))
-
-            try:
-                record = {
-                    "org_id": org_id,
-                    "season_id": season_id,
-                    "season_url": season_url,
-                    "year": year_label,
-                    "coach": cells[1].text(strip=True),
-                    "division": cells[2].text(strip=True),
-                    "conference": cells[3].text(strip=True),
-                    "wins": int(cells[4].text(strip=True)),
-                    "losses": int(cells[5].text(strip=True)),
-                    "ties": int(cells[6].text(strip=True)),
-                    "win_pct": float(cells[7].text(strip=True)),
-                    "notes": cells[8].text(strip=True),
-                }
-                records.append(record)
-            except Exception:
-                continue
-
-        # Try to click next page
-        try:
-            next_btn = driver.find_element(
-                "css selector", "#team_history_data_table_next"
-            )
-            class_attr = next_btn.get_attribute("class") or ""
-            if "disabled" in class_attr:
-                break  # Exit loop
-            else:
-                next_btn.click()
-                time.sleep(2.0)  # Wait for next page to load
-        except Exception:
-            logger.warning("Pagination failed or ended early.")
-            break
-
-    driver.quit()
+    dom = _get_team_history_dom(url)
+    with timed("parse_team_history"):
+        records = _parse_team_history(dom, org_id)
 
     if records:
         first_year = records[-1]["year"]
@@ -194,13 +232,69 @@ def get_team_seasons(team: Union[int, str]) -> pl.DataFrame:
     return pl.DataFrame(records)
 
 
-def get_season_tabs(season_url: str, verbose: bool = True) -> Dict[str, bool]:
-    full_url = f"{BASE_DOMAIN}{season_url}"
+def _looks_image_only(dom: HTMLParser) -> bool:
+    """
+    True if a tab's content region is just an image ("no data" placeholder).
 
-    def fetch_main():
-        return get_dom(full_url)
+    Only the card holding the tab navigation is inspected, minus the
+    navigation itself, so site header/footer text can't mask an empty tab.
+    """
+    nav = dom.css_first(".nav-tabs")
+    region = None
+    if nav is not None and nav.parent is not None:
+        region = nav.parent.parent
+    if region is None:
+        region = dom.body
+    if region is None:
+        return True
+
+    text = region.text(strip=True)
+    html = region.html or ""
+    if nav is not None:
+        text = text.replace(nav.text(strip=True), "", 1)
+        html = html.replace(nav.html or "", "", 1)
+    return "<img" in html and len(text) < 200
+
+
+def _has_schedule_table(dom: HTMLParser) -> bool:
+    if dom.css_first("table.mytable") is not None:
+        return True
+    return any(
+        h.text(strip=True) == "Schedule/Results"
+        and h.parent is not None
+        and h.parent.css_first("table") is not None
+        for h in dom.css(".card-header")
+    )
+
+
+def get_season_tabs(
+    season_url: str,
+    verbose: bool = True,
+    year: Optional[str] = None,
+    probe_workers: int = 4,
+) -> Dict[str, bool]:
+    """
+    Audit which tracked tabs carry real data for a team-season.
 
-    dom = throttle_and_retry(fetch_main, verbose=verbose)
+    The season page is fetched once. Tabs that are missing or disabled
+    there are False, and tabs that point back at the season page itself
+    (Schedule/Results) are decided from that same DOM. Only the remaining
+    tabs are fetched, concurrently and static-first, and each is checked
+    with the image-only heuristic on its content region.
+
+    Args:
+        season_url: Season path (e.g. "/teams/596721")
+        verbose: Log each tab's status
+        year: Optional season label used for page-cache TTLs
+        probe_workers: Concurrent tab fetches
+
+    Returns:
+        Mapping of tab label -> has data.
+    """
+    full_url = f"{BASE_DOMAIN}{season_url}"
+    ttl = season_ttl(year) if year else None
+
+    dom = fetch_dom(full_url, PAGE_SELECTORS["season"], verbose=verbose, cache_ttl=ttl)
     if dom is None or dom.root is None:
         return {tab: False for tab in TRACKED_TABS}
 
@@ -215,34 +309,44 @@ def get_season_tabs(season_url: str, verbose: bool = True) -> Dict[str, bool]:
             continue
         tab_links[label] = f"{BASE_DOMAIN}{href}"
 
-    tab_status: Dict[str, bool] = {}
-    for label in TRACKED_TABS:
-        url_optional = tab_links.get(label)
-        if not isinstance(url_optional, str):
-            tab_status[label] = False
-            continue
-
-        url: str = url_optional
-        tab_dom = throttle_and_retry(lambda: get_dom(url), verbose=verbose)
+    tab_status: Dict[str, bool] = {tab: False for tab in TRACKED_TABS}
+    to_probe: Dict[str, str] = {}
+    for label, url in tab_links.items():
+        if url.rstrip("/") == full_url.rstrip("/"):
+            tab_status[label] = _has_schedule_table(dom) or not _looks_image_only(dom)
+        else:
+            to_probe[label] = url
 
+    def probe(url: str) -> bool:
+        tab_dom = fetch_dom(url, PAGE_SELECTORS["tab"], verbose=verbose, cache_ttl=ttl)
         if tab_dom is None or tab_dom.root is None or tab_dom.body is None:
-            tab_status[label] = False
-            continue
-
-        body_text = tab_dom.body.text(strip=True)
-        body_html = tab_dom.body.html or ""
-
-        looks_like_image_only = "<img" in body_html and len(body_text) < 200
-        tab_status[label] = not looks_like_image_only
-
-        if verbose:
+            return False
+        return not _looks_image_only(tab_dom)
+
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=max(1, probe_workers)) as executor:
+            futures = {
+                label: executor.submit(probe, url) for label, url in to_probe.items()
+            }
+            for label, future in futures.items():
+                try:
+                    tab_status[label] = future.result()
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️ Could not probe {label} ({to_probe[label]}): {e}"
+                    )
+
+    if verbose:
+        for label in TRACKED_TABS:
             status = "✅" if tab_status[label] else "❌"
-            logger.info(f"{label:20s}: {status} ({url})")
+            logger.info(f"{label:20s}: {status} ({tab_links.get(label)})")
 
     return tab_status
 
 
-def audit_info_for_team(org_id: int, min_year: str = "1996-97") -> pl.DataFrame:
+def audit_info_for_team(
+    org_id: int, min_year: str = "1996-97", probe_workers: int = 4
+) -> pl.DataFrame:
     """Audit which info tabs are available for all seasons of a given team (i.e., Schedule/Results, Roster, etc)."""
     school_name = load_schools().filter(pl.col("org_id") == org_id)[0, "school_name"]
     season_df = get_team_seasons(org_id)
@@ -254,13 +358,14 @@ def audit_info_for_team(org_id: int, min_year: str = "1996-97") -> pl.DataFrame:
         season_url = row["season_url"]
         logger.info(f"\n🔍 Auditing {school_name} {year} → {season_url}")
         try:
-            tabs = get_season_tabs(season_url)
+            tabs = get_season_tabs(season_url, year=year, probe_workers=probe_workers)
             records.append(
                 {
                     "year": year,
                     "season_url": season_url,
                     "org_id": org_id,
                     "school_name": school_name,
+                    "division": row["division"],
                     "has_schedule": tabs.get("Schedule/Results", False),
                     "has_roster": tabs.get("Roster", False),
                     "has_team_stats": tabs.get("Team Statistics", False),
@@ -274,17 +379,81 @@ def audit_info_for_team(org_id: int, min_year: str = "1996-97") -> pl.DataFrame:
     return pl.DataFrame(records)
 
 
+def get_audited_org_ids() -> Set[int]:
+    """org_ids already in season_info, including this shard's own DB."""
+    done = get_completed_org_ids()
+    if get_shard() is not None:
+        done |= get_completed_org_ids(shard_db_path(INFO_DB_PATH))
+    return done
+
+
+def _audit_from_queue(
+    schools: pl.DataFrame,
+    min_year: str,
+    div: str,
+    limit: Optional[int],
+    probe_workers: int,
+) -> None:
+    """
+    Queue mode of audit_all_info_with_resume: one job per unaudited school.
+
+    The division check runs inside each job, so `limit` caps the schools
+    queued rather than the D-I teams found.
+    """
+    with db_lock(shard_db_path(INFO_DB_PATH)):
+        done_ids = get_audited_org_ids()
+    pending = schools.filter(~pl.col("org_id").is_in(done_ids))
+    if limit:
+        pending = pending.head(limit)
+    job_queue = JobQueue()
+    job_queue.enqueue("audit", pending, "org_id")
+
+    def scrape(row: dict) -> pl.DataFrame:
+        org_id = row["org_id"]
+        seasons = get_team_seasons(org_id)
+        if seasons.is_empty() or seasons[0, "division"] != div:
+            logger.info(f"⏭️ Skipping org_id={org_id} — not {div}.")
+            return pl.DataFrame()
+        return audit_info_for_team(org_id, min_year, probe_workers)
+
+    with DuckDBWriter(
+        shard_db_path(INFO_DB_PATH),
+        SEASON_INFO_TABLE_NAME,
+        flush_every=1,
+        shared=True,
+        lake=get_lake_writer(SEASON_INFO_TABLE_NAME),
+    ) as writer:
+
+        def write(row: dict, df: Optional[pl.DataFrame], error: Optional[Exception]):
+            if error is not None or df is None:
+                logger.info(f"Failed on org_id={row['org_id']}: {error}")
+            elif df.shape[0] > 0:
+                logger.info(f"Appending {df.shape[0]} rows to duckdb.")
+                writer.add(df)
+
+        run_queue(job_queue, "audit", "org_id", scrape, write)
+
+
 def audit_all_info_with_resume(
-    min_year: str = "1996-97", div: str = "D-I", limit: Optional[int] = None
+    min_year: str = "1996-97",
+    div: str = "D-I",
+    limit: Optional[int] = None,
+    queue: bool = False,
+    probe_workers: int = 4,
 ):
     logger.info(
         f"\n🚦 Starting audit_all_info_with_resume(min_year='{min_year}', div='{
             div
-        }', limit={limit})"
+        }', limit={limit}, queue={queue}, probe_workers={probe_workers})"
     )
 
-    schools = load_schools()
-    done_ids = get_completed_org_ids()
+    schools = filter_shard(load_schools())
+    if queue:
+        _audit_from_queue(schools, min_year, div, limit, probe_workers)
+        export_metrics("audit")
+        return
+
+    done_ids = get_audited_org_ids()
     logger.info(f"✔️ Already completed org_ids: {sorted(done_ids)}")
 
     filtered_rows = []
@@ -323,14 +492,31 @@ def audit_all_info_with_resume(
 
     schools = pl.DataFrame(filtered_rows)
 
-    for row in schools.iter_rows(named=True):
-        org_id = row["org_id"]
-        try:
-            df = audit_info_for_team(org_id, min_year)
-            if df.shape[0] > 0:
-                append_to_duckdb(df)
-        except Exception as e:
-            logger.info(f"Failed on org_id={org_id}: {e}")
+    # One team per transaction: resume is keyed on org_id, and a team's
+    # audit takes long enough that batching several would risk losing them.
+    with DuckDBWriter(
+        shard_db_path(INFO_DB_PATH),
+        SEASON_INFO_TABLE_NAME,
+        flush_every=1,
+        lake=get_lake_writer(SEASON_INFO_TABLE_NAME),
+    ) as writer:
+        progress = get_progress()
+        if progress is not None:
+            progress.add_total(schools.shape[0])
+        for row in schools.iter_rows(named=True):
+            org_id = row["org_id"]
+            try:
+                df = audit_info_for_team(org_id, min_year, probe_workers)
+                if df.shape[0] > 0:
+                    logger.info(f"Appending {df.shape[0]} rows to duckdb.")
+                    writer.add(df)
+                if progress is not None:
+                    progress.advance(rows=df.shape[0])
+            except Exception as e:
+                logger.info(f"Failed on org_id={org_id}: {e}")
+                if progress is not None:
+                    progress.advance(failed=True)
+    export_metrics("audit")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,332 @@
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote, unquote
+
+import duckdb
+import polars as pl
+
+from batboy.config.constants import (
+    INFO_DB_PATH,
+    LAKE_COMPACT_MIN_FILES,
+    LAKE_DIR,
+    LAKE_PARTITIONS,
+    LAKE_ROW_GROUP_SIZE,
+    SEASON_INFO_TABLE_NAME,
+)
+from batboy.utils import file_lock, setup_logger
+
+logger = setup_logger()
+
+MANIFEST_NAME = "_manifest.json"
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _partition_dir(values: Dict[str, Any]) -> str:
+    return "/".join(
+        f"{col}={NULL_PARTITION if v is None else quote(str(v), safe='')}"
+        for col, v in values.items()
+    )
+
+
+def _parse_partition_dir(rel_dir: str) -> Dict[str, Optional[str]]:
+    values = {}
+    for part in Path(rel_dir).parts:
+        col, _, v = part.partition("=")
+        values[col] = None if v == NULL_PARTITION else unquote(v)
+    return values
+
+
+class LakeWriter:
+    """
+    Append-only writer of one hive-partitioned Parquet dataset.
+
+    Frames are split by `partition_by` (year and division by default) and
+    each partition gets a new file under
+    `<lake_dir>/<dataset>/year=.../division=.../part-<uuid>.parquet`, with
+    row-group statistics so readers can skip row groups as well as
+    partitions. `_manifest.json` lists every live file with its partition,
+    row count and size, and is rewritten atomically under a file lock, so
+    several writers may share a lake. Read it back with scan_lake() or
+    `pl.scan_parquet(f"{lake_dir}/{dataset}/**/*.parquet", hive_partitioning=True)`.
+
+    Args:
+        dataset: Dataset name (a directory under `lake_dir`)
+        lake_dir: Root of the lake
+        partition_by: Partition columns; missing ones are written as null
+        row_group_size: Rows per Parquet row group
+        lookup: Optional frame supplying missing partition columns, joined
+            on its first column (e.g. load_season_divisions() adds division
+            to schedule rows by season_url)
+    """
+
+    def __init__(
+        self,
+        dataset: str,
+        lake_dir: str = LAKE_DIR,
+        partition_by: Sequence[str] = LAKE_PARTITIONS,
+        row_group_size: int = LAKE_ROW_GROUP_SIZE,
+        lookup: Optional[pl.DataFrame] = None,
+    ):
+        self.dataset = dataset
+        self.root = Path(lake_dir) / dataset
+        self.partition_by = list(partition_by)
+        self.row_group_size = row_group_size
+        self.lookup = lookup
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.lock_path = self.root / f"{MANIFEST_NAME}.lock"
+
+    def read_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except FileNotFoundError:
+            return {
+                "dataset": self.dataset,
+                "partition_by": self.partition_by,
+                "files": [],
+            }
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        manifest["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        tmp = self.root / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=1))
+        os.replace(tmp, self.manifest_path)
+
+    def _write_file(self, rel_dir: str, df: pl.DataFrame) -> Dict[str, Any]:
+        directory = self.root / rel_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{uuid.uuid4().hex}.parquet"
+        df.write_parquet(path, statistics=True, row_group_size=self.row_group_size)
+        return {
+            "path": str(path.relative_to(self.root)),
+            "partition": _parse_partition_dir(rel_dir),
+            "rows": df.shape[0],
+            "bytes": path.stat().st_size,
+        }
+
+    def _with_partitions(self, df: pl.DataFrame) -> pl.DataFrame:
+        missing = [col for col in self.partition_by if col not in df.columns]
+        if missing and self.lookup is not None:
+            key = self.lookup.columns[0]
+            extra = [col for col in missing if col in self.lookup.columns]
+            if key in df.columns and extra:
+                df = df.join(self.lookup.select(key, *extra), on=key, how="left")
+        return df.with_columns(
+            pl.lit(None, dtype=pl.String).alias(col)
+            for col in self.partition_by
+            if col not in df.columns
+        )
+
+    def write(
+        self, df: pl.DataFrame, replace: Sequence[Dict[str, Any]] = ()
+    ) -> List[str]:
+        """
+        Append a frame as one new file per partition.
+
+        Args:
+            df: Rows to append
+            replace: Keys (column -> value, e.g. {"season_url": url}) whose
+                existing rows are dropped first; files holding such rows are
+                rewritten without them
+
+        Returns:
+            Paths of the new files, relative to the dataset directory.
+        """
+        df = self._with_partitions(df)
+        groups = (
+            df.partition_by(self.partition_by, as_dict=True)
+            if not df.is_empty()
+            else {}
+        )
+        partitions = [dict(zip(self.partition_by, values)) for values in groups]
+
+        with file_lock(self.lock_path):
+            manifest = self.read_manifest()
+            if replace:
+                self._drop_rows(manifest, replace, partitions)
+
+            written = []
+            for values, part in zip(partitions, groups.values()):
+                rel_dir = _partition_dir(values)
+                entry = self._write_file(rel_dir, part.drop(self.partition_by))
+                manifest["files"].append(entry)
+                written.append(entry["path"])
+            if written:
+                manifest["schema"] = {
+                    col: str(dtype) for col, dtype in df.schema.items()
+                }
+            self._save_manifest(manifest)
+
+        logger.debug(f"🪣 Wrote {df.shape[0]} rows to lake/{self.dataset}")
+        return written
+
+    def _drop_rows(
+        self,
+        manifest: Dict[str, Any],
+        replace: Sequence[Dict[str, Any]],
+        partitions: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Rewrite files holding rows of the replaced keys without those rows.
+
+        Only files in the partitions being written are checked, unless the
+        new rows are empty (the key may then live in any partition).
+        """
+        columns = {tuple(key) for key in replace}
+        if len(columns) == 1 and len(next(iter(columns))) == 1:
+            (col,) = next(iter(columns))
+            match = pl.col(col).is_in([key[col] for key in replace])
+        else:
+            match = pl.any_horizontal(
+                pl.all_horizontal([pl.col(c) == v for c, v in key.items()])
+                for key in replace
+            )
+        wanted = [
+            {col: None if v is None else str(v) for col, v in p.items()}
+            for p in partitions
+        ]
+        kept = []
+        for entry in manifest["files"]:
+            path = self.root / entry["path"]
+            if wanted and entry["partition"] not in wanted:
+                kept.append(entry)
+                continue
+            data = pl.read_parquet(path)
+            if not data.select(match.any()).item():
+                kept.append(entry)
+                continue
+            rest = data.filter(~match)
+            path.unlink()
+            if not rest.is_empty():
+                kept.append(self._write_file(str(Path(entry["path"]).parent), rest))
+        manifest["files"] = kept
+
+    def compact(self, min_files: int = LAKE_COMPACT_MIN_FILES) -> int:
+        """
+        Merge the files of every partition holding at least `min_files`
+        files into one, keeping row-group statistics.
+
+        Returns:
+            Number of files removed.
+        """
+        removed = 0
+        with file_lock(self.lock_path):
+            manifest = self.read_manifest()
+            by_dir: Dict[str, List[Dict[str, Any]]] = {}
+            for entry in manifest["files"]:
+                by_dir.setdefault(str(Path(entry["path"]).parent), []).append(entry)
+
+            files = []
+            for rel_dir, entries in by_dir.items():
+                if len(entries) < min_files:
+                    files.extend(entries)
+                    continue
+                paths = [self.root / e["path"] for e in entries]
+                merged = pl.concat(
+                    [pl.read_parquet(p) for p in paths], how="diagonal_relaxed"
+                )
+                files.append(self._write_file(rel_dir, merged))
+                for p in paths:
+                    p.unlink()
+                removed += len(paths) - 1
+
+            manifest["files"] = files
+            self._save_manifest(manifest)
+
+        logger.info(f"🧹 Compacted lake/{self.dataset}: {removed} files removed")
+        return removed
+
+
+def scan_lake(dataset: str, lake_dir: str = LAKE_DIR) -> pl.LazyFrame:
+    """
+    Lazily scan a lake dataset with hive partition pruning.
+
+    Only files listed in the manifest are read, so files being written or
+    left behind by a crash are never seen.
+    """
+    writer = LakeWriter(dataset, lake_dir)
+    files = [str(writer.root / e["path"]) for e in writer.read_manifest()["files"]]
+    if not files:
+        return pl.LazyFrame()
+    return pl.scan_parquet(files, hive_partitioning=True, allow_missing_columns=True)
+
+
+def load_season_divisions(db_path: str = INFO_DB_PATH) -> pl.DataFrame:
+    """
+    season_url -> division from season_info, used to partition schedules and
+    rosters (empty when the audit has not recorded divisions).
+    """
+    if not os.path.exists(db_path):
+        return pl.DataFrame(schema={"season_url": pl.String, "division": pl.String})
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        columns = {
+            row[0]
+            for row in con.execute(
+                "SELECT column_name FROM duckdb_columns() WHERE table_name = ?",
+                [SEASON_INFO_TABLE_NAME],
+            ).fetchall()
+        }
+        if not {"season_url", "division"} <= columns:
+            return pl.DataFrame(schema={"season_url": pl.String, "division": pl.String})
+        return con.sql(f"""
+            SELECT DISTINCT season_url, CAST(division AS TEXT) AS division
+            FROM {SEASON_INFO_TABLE_NAME}
+        """).pl()
+    finally:
+        con.close()
+
+
+_LAKE_DIR: Optional[str] = None
+_LAKE_LOCK = threading.Lock()
+
+
+def configure_lake(lake_dir: Optional[str] = LAKE_DIR) -> None:
+    """Mirror batch writes into a Parquet lake at `lake_dir` (None disables)."""
+    global _LAKE_DIR
+    with _LAKE_LOCK:
+        _LAKE_DIR = lake_dir
+
+
+def get_lake_writer(dataset: str, with_divisions: bool = False) -> Optional[LakeWriter]:
+    """
+    A writer for `dataset` in the configured lake, or None (the default).
+
+    Args:
+        dataset: Dataset name, usually the DuckDB table it mirrors
+        with_divisions: Look up each row's division in season_info by
+            season_url (for tables that do not carry it themselves)
+    """
+    with _LAKE_LOCK:
+        lake_dir = _LAKE_DIR
+    if lake_dir is None:
+        return None
+    lookup = load_season_divisions() if with_divisions else None
+    return LakeWriter(dataset, lake_dir, lookup=lookup)
+
+
+def export_to_lake(
+    db_path: str, table: str, writer: LakeWriter, key: str = "season_url"
+) -> int:
+    """
+    Backfill (or rebuild) a lake dataset from a DuckDB table.
+
+    Rows already in the lake for the exported keys are replaced, so running
+    this again does not duplicate data.
+
+    Returns:
+        Number of rows exported.
+    """
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        df = con.sql(f"SELECT * FROM {table}").pl()
+    finally:
+        con.close()
+    keys = [{key: value} for value in df[key].unique().to_list()]
+    writer.write(df, replace=keys)
+    logger.info(f"🪣 Exported {df.shape[0]} rows of {table} to lake/{writer.dataset}")
+    return df.shape[0]
@@ -0,0 +1,92 @@
+import os
+from typing import Dict, Optional
+
+import duckdb
+import polars as pl
+
+from batboy.storage.shards import get_shard, shard_db_path, shard_predicate
+
+SOURCE_ALIAS = "source"
+MERGED_ALIAS = "merged"
+
+
+def get_pending_targets(
+    db_path: str,
+    log_table: str,
+    log_columns: Dict[str, str],
+    source_db: str,
+    source_query: str,
+    key: str = "season_url",
+    log_filter: str = "TRUE",
+    limit: Optional[int] = None,
+    shard_column: str = "org_id",
+) -> pl.DataFrame:
+    """
+    Anti-join scrape targets against a log table inside DuckDB.
+
+    The source database is ATTACHed read-only to the connection holding the
+    log, so planning a batch is one query: no logged keys or target rows
+    are pulled into Python, and `limit` is applied in SQL. The log table
+    (created if missing) gets an index on `key`.
+
+    When a shard is configured, only targets whose `shard_column` hashes to
+    it are returned, the log is read from the shard's own file, and targets
+    already logged in the canonical (merged) database count as done too.
+
+    Args:
+        db_path: Canonical DuckDB file holding `log_table`
+        log_table: Log with one row per scrape attempt
+        log_columns: Column name -> SQL type for the log table
+        source_db: DuckDB file listing the targets
+        source_query: SELECT over the targets; refer to its tables as
+            `source.<table>`
+        key: Column identifying a target in both the query and the log
+        log_filter: Extra condition on log rows that count as done
+        limit: Optional maximum number of targets
+        shard_column: Integer target column used to assign shards
+
+    Returns:
+        Polars DataFrame with the columns of `source_query`, ordered by `key`.
+    """
+    log_db = shard_db_path(db_path)
+    con = duckdb.connect(log_db)
+    try:
+        columns = ", ".join(f"{k} {v}" for k, v in log_columns.items())
+        con.execute(f"CREATE TABLE IF NOT EXISTS {log_table} ({columns})")
+        con.execute(
+            f"CREATE INDEX IF NOT EXISTS {log_table}_{key}_idx ON {log_table} ({key})"
+        )
+        source_path = source_db.replace("'", "''")
+        con.execute(f"ATTACH '{source_path}' AS {SOURCE_ALIAS} (READ_ONLY)")
+
+        logs = [log_table]
+        if get_shard() is not None and os.path.exists(db_path):
+            merged_path = db_path.replace("'", "''")
+            con.execute(f"ATTACH '{merged_path}' AS {MERGED_ALIAS} (READ_ONLY)")
+            merged_log = con.execute(
+                "SELECT 1 FROM duckdb_tables() "
+                "WHERE database_name = ? AND table_name = ?",
+                [MERGED_ALIAS, log_table],
+            ).fetchone()
+            if merged_log is not None:
+                logs.append(f"{MERGED_ALIAS}.{log_table}")
+
+        not_logged = "\n AND ".join(
+            f"""NOT EXISTS (
+                SELECT 1 FROM {log} AS done
+                WHERE done.{key} = targets.{key} AND ({log_filter})
+            )"""
+            for log in logs
+        )
+        sql = f"""
+            SELECT targets.*
+            FROM ({source_query}) AS targets
+            WHERE {not_logged}
+              AND {shard_predicate(f"targets.{shard_column}")}
+            ORDER BY targets.{key}
+        """
+        if limit:
+            sql += f"\nLIMIT {int(limit)}"
+        return con.sql(sql).pl()
+    finally:
+        con.close()
@@ -0,0 +1,252 @@
+import json
+import os
+import socket
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+import duckdb
+import polars as pl
+
+from batboy.config.constants import (
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_QUEUE_DB_PATH,
+    JOB_QUEUE_TABLE,
+    JOB_RETRY_DELAY,
+)
+from batboy.storage.writer import db_lock
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+JOB_COLUMNS = {
+    "kind": "TEXT",  # e.g. "schedules", "rosters"
+    "target": "TEXT",  # key of the target within its kind (season_url, org_id)
+    "payload": "TEXT",  # JSON of the target row handed back by claim()
+    "priority": "INTEGER",
+    "status": "TEXT",  # pending | leased | done | failed
+    "lease_owner": "TEXT",
+    "lease_expires": "TIMESTAMP",  # also when a failed pending job is due again
+    "attempts": "INTEGER",
+    "error": "TEXT",
+    "updated_at": "TIMESTAMP",
+}
+
+
+def default_owner() -> str:
+    """Lease owner id for this process: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """
+    Durable work queue of scrape targets with leased claims.
+
+    Jobs live in a DuckDB table keyed by (kind, target). claim() leases
+    pending jobs to one owner until `lease_seconds` from now; complete()
+    and fail() end the lease. A lease that expires (the worker crashed or
+    hung) makes its job claimable again, and failed jobs are retried after
+    an exponential backoff until they have been claimed `max_attempts`
+    times. Every operation opens the database under the DuckDB file lock
+    and closes it again, so any number of worker processes on the box can
+    share one queue.
+
+    Args:
+        db_path: DuckDB file holding the queue table
+        lease_seconds: How long a claim stays valid
+        max_attempts: Claims allowed per job before it stays failed
+        retry_delay: Seconds before a failed job's first retry, doubled
+            for every further attempt
+    """
+
+    def __init__(
+        self,
+        db_path: str = JOB_QUEUE_DB_PATH,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_delay: float = JOB_RETRY_DELAY,
+    ):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    @contextmanager
+    def _connect(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        with db_lock(self.db_path):
+            con = duckdb.connect(self.db_path)
+            try:
+                columns = ", ".join(f"{k} {v}" for k, v in JOB_COLUMNS.items())
+                con.execute(
+                    f"CREATE TABLE IF NOT EXISTS {JOB_QUEUE_TABLE} "
+                    f"({columns}, PRIMARY KEY (kind, target))"
+                )
+                yield con
+            finally:
+                con.close()
+
+    def _execute(self, sql: str, params: Optional[list] = None) -> list:
+        with self._connect() as con:
+            return con.execute(sql, params or []).fetchall()
+
+    def enqueue(
+        self, kind: str, targets: pl.DataFrame, key: str, priority: int = 0
+    ) -> int:
+        """
+        Add targets to the queue; targets already queued are left untouched.
+
+        Args:
+            kind: Job kind the targets belong to
+            targets: One row per target; the whole row becomes the payload
+            key: Column identifying a target (e.g. "season_url")
+            priority: Higher priorities are claimed first
+
+        Returns:
+            Number of newly queued jobs.
+        """
+        if targets.is_empty():
+            return 0
+        jobs = pl.DataFrame(
+            {
+                "kind": kind,
+                "target": targets[key].cast(pl.String),
+                "payload": [
+                    json.dumps(row, default=str)
+                    for row in targets.iter_rows(named=True)
+                ],
+                "priority": priority,
+            }
+        )
+        with self._connect() as con:
+            con.register("new_jobs", jobs)
+            inserted = con.execute(f"""
+                INSERT INTO {JOB_QUEUE_TABLE}
+                    (kind, target, payload, priority, status, attempts, updated_at)
+                SELECT kind, target, payload, priority, 'pending', 0, now()
+                FROM new_jobs
+                ON CONFLICT DO NOTHING
+                RETURNING target
+            """).fetchall()
+        added = len(inserted)
+        logger.info(f"📥 Queued {added} new {kind} jobs ({jobs.shape[0]} offered)")
+        return added
+
+    def claim(self, kind: str, owner: str, n: int = 1) -> pl.DataFrame:
+        """
+        Lease up to `n` claimable jobs of one kind to `owner`.
+
+        A job is claimable when it is pending and due (new, or past its
+        retry backoff), or leased with an expired lease, and has been
+        claimed fewer than `max_attempts` times.
+
+        Returns:
+            Polars DataFrame of the claimed payload rows (empty when the
+            queue has nothing left to claim).
+        """
+        now = datetime.now()
+        expires = now + timedelta(seconds=self.lease_seconds)
+        with self._connect() as con:
+            # Expired leases on a job's last attempt will never be reclaimed
+            con.execute(
+                f"""
+                UPDATE {JOB_QUEUE_TABLE}
+                SET status = 'failed', lease_owner = NULL, lease_expires = NULL,
+                    error = 'lease expired', updated_at = ?
+                WHERE kind = ? AND status = 'leased' AND lease_expires < ?
+                  AND attempts >= ?
+                """,
+                [now, kind, now, self.max_attempts],
+            )
+            rows = con.execute(
+                f"""
+                UPDATE {JOB_QUEUE_TABLE}
+                SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE kind = ? AND target IN (
+                    SELECT target FROM {JOB_QUEUE_TABLE}
+                    WHERE kind = ?
+                      AND attempts < ?
+                      AND status IN ('pending', 'leased')
+                      AND (lease_expires IS NULL OR lease_expires <= ?)
+                    ORDER BY priority DESC, target
+                    LIMIT ?
+                )
+                RETURNING payload
+                """,
+                [owner, expires, now, kind, kind, self.max_attempts, now, n],
+            ).fetchall()
+        return pl.DataFrame([json.loads(row[0]) for row in rows])
+
+    def complete(self, kind: str, target: Any, owner: str) -> None:
+        """Mark a job leased by `owner` as done."""
+        self._execute(
+            f"""
+            UPDATE {JOB_QUEUE_TABLE}
+            SET status = 'done', lease_owner = NULL, lease_expires = NULL,
+                error = NULL, updated_at = ?
+            WHERE kind = ? AND target = ? AND lease_owner = ?
+            """,
+            [datetime.now(), kind, str(target), owner],
+        )
+
+    def fail(self, kind: str, target: Any, owner: str, error: str) -> None:
+        """
+        Record a failed attempt, returning the job to the queue while it has
+        attempts left. The job is due again after `retry_delay` seconds,
+        doubled for every earlier attempt, so a throttled target does not
+        burn its attempts in a burst of immediate reclaims.
+        """
+        now = datetime.now()
+        self._execute(
+            f"""
+            UPDATE {JOB_QUEUE_TABLE}
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                lease_owner = NULL,
+                lease_expires = CASE WHEN attempts >= ? THEN NULL
+                    ELSE CAST(? AS TIMESTAMP)
+                         + to_microseconds(CAST(? * 1e6 * pow(2, attempts - 1) AS BIGINT))
+                    END,
+                error = ?, updated_at = ?
+            WHERE kind = ? AND target = ? AND lease_owner = ?
+            """,
+            [
+                self.max_attempts,
+                self.max_attempts,
+                now,
+                self.retry_delay,
+                error,
+                now,
+                kind,
+                str(target),
+                owner,
+            ],
+        )
+
+    def next_retry_in(self, kind: str) -> Optional[float]:
+        """
+        Seconds until the next pending job of one kind is due (0 if one is
+        due now), or None if no pending job has attempts left.
+        """
+        ((pending, waiting, due),) = self._execute(
+            f"""
+            SELECT count(*), count(lease_expires), min(lease_expires)
+            FROM {JOB_QUEUE_TABLE}
+            WHERE kind = ? AND status = 'pending' AND attempts < ?
+            """,
+            [kind, self.max_attempts],
+        )
+        if not pending:
+            return None
+        if waiting < pending:
+            return 0.0
+        return max(0.0, (due - datetime.now()).total_seconds())
+
+    def counts(self, kind: str) -> Dict[str, int]:
+        """Number of jobs of one kind per status."""
+        rows = self._execute(
+            f"SELECT status, count(*) FROM {JOB_QUEUE_TABLE} "
+            "WHERE kind = ? GROUP BY status",
+            [kind],
+        )
+        return dict(rows)
@@ -0,0 +1,107 @@
+from typing import Dict, Optional
+
+import polars as pl
+
+from batboy.config.constants import DATE_FORMAT, DEFAULT_DTYPES, ENUM_CATEGORIES
+from batboy.metrics import get_metrics
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+# Polars has no half-precision float; Float16 columns are stored as Float32
+DTYPE_ALIASES = {"Float16": "Float32"}
+
+# Cell decorations removed before casting: doubleheader game numbers after
+# dates, footnote marks after numbers
+DATE_SUFFIX_PATTERN = r"\s*\(\d+\)\s*$"
+NUMBER_SUFFIXES = "*/#"
+# Placeholders for "no value"; nulling them is not a lost value
+BLANK_VALUES = ["", "-", "--", "—"]
+
+
+def polars_dtype(column: str, dtype: str) -> pl.DataType:
+    """
+    Resolve a dtype name from DEFAULT_DTYPES into a Polars dtype.
+
+    Args:
+        column: Column name (used to look up enum categories)
+        dtype: Dtype name such as "Int16", "Float16", "Date" or "Enum"
+
+    Returns:
+        Polars dtype instance.
+    """
+    if dtype == "Enum":
+        return pl.Enum(ENUM_CATEGORIES[column])
+    return getattr(pl, DTYPE_ALIASES.get(dtype, dtype))()
+
+
+def _clean(expr: pl.Expr, target: pl.DataType) -> pl.Expr:
+    """Strip the known decorations of scraped cells before they are cast."""
+    if target == pl.Date:
+        return expr.str.replace(DATE_SUFFIX_PATTERN, "").str.strip_chars()
+    if target.is_numeric():
+        return expr.str.replace_all(r"[,\s]", "").str.strip_chars_end(NUMBER_SUFFIXES)
+    return expr
+
+
+def apply_schema(
+    df: pl.DataFrame, dtypes: Optional[Dict[str, str]] = None
+) -> pl.DataFrame:
+    """
+    Cast the columns of `df` that appear in `dtypes` to their compact types.
+
+    String dates are parsed with DATE_FORMAT once doubleheader suffixes
+    ("03/01/2025(1)") are removed; numbers lose thousands separators and
+    footnote marks ("2*"). Values that still cannot be represented
+    (unparseable text, out-of-range numbers, unknown enum values) become
+    null rather than failing the write, but every such value is logged and
+    counted in the "cast_failures" metric. Blank placeholders ("", "-")
+    are expected nulls and are not counted.
+
+    Args:
+        df: Frame to cast
+        dtypes: Column name -> dtype name (defaults to DEFAULT_DTYPES)
+
+    Returns:
+        Frame with the same columns, cast where a dtype is known.
+    """
+    dtypes = DEFAULT_DTYPES if dtypes is None else dtypes
+    casts = []
+    for column, current in df.schema.items():
+        if column not in dtypes:
+            continue
+        target = polars_dtype(column, dtypes[column])
+        if current == target:
+            continue
+        expr = pl.col(column)
+        if current == pl.String:
+            expr = _clean(expr, target)
+        if target == pl.Date and current == pl.String:
+            casts.append(expr.str.to_date(DATE_FORMAT, strict=False))
+        elif current == pl.Null:
+            casts.append(expr.cast(target))
+        else:
+            casts.append(expr.cast(target, strict=False))
+    if not casts:
+        return df
+    out = df.with_columns(casts)
+    _report_lost_values(df, out)
+    return out
+
+
+def _report_lost_values(before: pl.DataFrame, after: pl.DataFrame) -> None:
+    for column in after.columns:
+        if before.schema[column] == after.schema[column]:
+            continue
+        original = before[column]
+        lost = original.is_not_null() & after[column].is_null()
+        if original.dtype == pl.String:
+            lost = lost & ~original.str.strip_chars().is_in(BLANK_VALUES)
+        n_lost = int(lost.sum())
+        if n_lost:
+            samples = original.filter(lost).unique().head(3).to_list()
+            logger.warning(
+                f"⚠️ {n_lost} '{column}' values could not be cast to "
+                f"{after.schema[column]} and were stored as null (e.g. {samples})"
+            )
+            get_metrics().inc("cast_failures", n_lost, column=column)
@@ -0,0 +1,254 @@
+import argparse
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import polars as pl
+
+from batboy.config.constants import (
+    BOX_SCORE_DB_PATH,
+    BOX_SCORE_LOG_TABLE,
+    BOX_SCORE_PLAYER_TABLE,
+    GAME_BY_GAME_DATA_TABLE,
+    GAME_BY_GAME_DB_PATH,
+    GAME_BY_GAME_LOG_TABLE,
+    INFO_DB_PATH,
+    LINE_SCORE_TABLE,
+    PAGE_HASH_TABLE,
+    ROSTER_DATA_TABLE,
+    ROSTER_DB_PATH,
+    ROSTER_LOG_TABLE,
+    SCHEDULE_DATA_TABLE,
+    SCHEDULE_LOG_TABLE,
+    SEASON_INFO_TABLE_NAME,
+    SEASON_SCHEDULE_DB,
+)
+from batboy.storage.writer import db_lock
+from batboy.utils import setup_logger
+
+logger = setup_logger()
+
+Shard = Tuple[int, int]  # (k, N): this process handles shard k of N
+
+# Knuth's multiplicative hash, reproducible in Python and DuckDB SQL
+SHARD_HASH_MULTIPLIER = 2654435761
+SHARD_HASH_MODULUS = 2**32
+
+# Canonical DB -> table -> merge key. Rows of a keyed table replace the
+# canonical rows with the same key (the shard holds the newer scrape);
+# unkeyed tables (logs) gain the shard rows they do not already contain.
+# Game-by-game rows are unkeyed too: a season_url holds both team totals
+# and player logs, which may come from different runs.
+SHARDED_DATABASES: Dict[str, Dict[str, Optional[str]]] = {
+    INFO_DB_PATH: {SEASON_INFO_TABLE_NAME: "season_url"},
+    SEASON_SCHEDULE_DB: {
+        SCHEDULE_DATA_TABLE: "season_url",
+        PAGE_HASH_TABLE: "season_url",
+        SCHEDULE_LOG_TABLE: None,
+    },
+    ROSTER_DB_PATH: {
+        ROSTER_DATA_TABLE: "season_url",
+        PAGE_HASH_TABLE: "season_url",
+        ROSTER_LOG_TABLE: None,
+    },
+    GAME_BY_GAME_DB_PATH: {
+        GAME_BY_GAME_DATA_TABLE: None,
+        GAME_BY_GAME_LOG_TABLE: None,
+    },
+    BOX_SCORE_DB_PATH: {
+        LINE_SCORE_TABLE: "game_id",
+        BOX_SCORE_PLAYER_TABLE: "game_id",
+        BOX_SCORE_LOG_TABLE: None,
+    },
+}
+
+_SHARD: Optional[Shard] = None
+
+
+def parse_shard(spec: str) -> Shard:
+    """Parse "k/N" (0 <= k < N), e.g. "0/4" for the first of four shards."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec)
+    if not match:
+        raise ValueError(f"Invalid shard '{spec}' (expected k/N, e.g. 0/4)")
+    k, n = int(match.group(1)), int(match.group(2))
+    if n < 1 or not 0 <= k < n:
+        raise ValueError(f"Invalid shard '{spec}' (need 0 <= k < N)")
+    return k, n
+
+
+def configure_shard(spec: Optional[str]) -> Optional[Shard]:
+    """Make this process work shard `spec` ("k/N"), or all targets with None."""
+    global _SHARD
+    _SHARD = parse_shard(spec) if spec else None
+    return _SHARD
+
+
+def get_shard() -> Optional[Shard]:
+    """The process-wide shard, or None when not sharding."""
+    return _SHARD
+
+
+def shard_of(value: int, n: int) -> int:
+    """Shard index of an integer key such as org_id."""
+    return (value * SHARD_HASH_MULTIPLIER) % SHARD_HASH_MODULUS % n
+
+
+def filter_shard(
+    df: pl.DataFrame, column: str = "org_id", shard: Optional[Shard] = None
+) -> pl.DataFrame:
+    """Rows of `df` whose `column` belongs to `shard` (all rows when not sharding)."""
+    shard = shard or get_shard()
+    if shard is None:
+        return df
+    k, n = shard
+    hashed = pl.col(column).cast(pl.Int64) * SHARD_HASH_MULTIPLIER % SHARD_HASH_MODULUS
+    return df.filter(hashed % n == k)
+
+
+def shard_predicate(column: str, shard: Optional[Shard] = None) -> str:
+    """SQL condition selecting the rows of `shard` (TRUE when not sharding)."""
+    shard = shard or get_shard()
+    if shard is None:
+        return "TRUE"
+    k, n = shard
+    return (
+        f"(({column}::BIGINT * {SHARD_HASH_MULTIPLIER}) "
+        f"% {SHARD_HASH_MODULUS} % {n} = {k})"
+    )
+
+
+def shard_db_path(db_path: str, shard: Optional[Shard] = None) -> str:
+    """
+    Database file a sharded process writes instead of `db_path`.
+
+    e.g. season_schedules.duckdb -> season_schedules.shard0of4.duckdb; the
+    canonical path itself when not sharding.
+    """
+    shard = shard or get_shard()
+    if shard is None:
+        return db_path
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}.shard{shard[0]}of{shard[1]}{path.suffix}"))
+
+
+def find_shard_files(db_path: str) -> List[str]:
+    """Shard files of one canonical database, in shard order."""
+    path = Path(db_path)
+    pattern = re.compile(rf"{re.escape(path.stem)}\.shard(\d+)of(\d+){path.suffix}$")
+    found = []
+    for candidate in path.parent.glob(f"{path.stem}.shard*{path.suffix}"):
+        match = pattern.search(candidate.name)
+        if match:
+            found.append((int(match.group(2)), int(match.group(1)), str(candidate)))
+    return [name for *_, name in sorted(found)]
+
+
+def _table_columns(
+    con: duckdb.DuckDBPyConnection, catalog: str, table: str
+) -> Dict[str, str]:
+    rows = con.execute(
+        """
+        SELECT column_name, data_type FROM duckdb_columns()
+        WHERE database_name = ? AND schema_name = 'main' AND table_name = ?
+        ORDER BY column_index
+        """,
+        [catalog, table],
+    ).fetchall()
+    return dict(rows)
+
+
+def merge_shards(
+    databases: Optional[Dict[str, Dict[str, Optional[str]]]] = None,
+    remove: bool = False,
+) -> Dict[str, int]:
+    """
+    Combine every shard file into its canonical database.
+
+    Each canonical database is merged in one transaction while holding its
+    writer lock. Keyed tables are deduplicated by replacing rows whose key
+    appears in a shard; log tables only gain rows they do not already have,
+    so merging the same shards twice changes nothing.
+
+    Args:
+        databases: Canonical DB -> table -> merge key (defaults to
+            SHARDED_DATABASES)
+        remove: Delete shard files once they are merged
+
+    Returns:
+        Number of rows inserted per table name.
+    """
+    inserted: Dict[str, int] = {}
+    for db_path, tables in (databases or SHARDED_DATABASES).items():
+        shard_files = find_shard_files(db_path)
+        if not shard_files:
+            continue
+        logger.info(f"🧩 Merging {len(shard_files)} shards into {db_path}")
+
+        with db_lock(db_path):
+            con = duckdb.connect(db_path)
+            try:
+                con.execute("BEGIN TRANSACTION")
+                for i, shard_file in enumerate(shard_files):
+                    alias = f"shard_{i}"
+                    escaped = shard_file.replace("'", "''")
+                    con.execute(f"ATTACH '{escaped}' AS {alias} (READ_ONLY)")
+                    for table, key in tables.items():
+                        n = _merge_table(con, alias, table, key)
+                        inserted[table] = inserted.get(table, 0) + n
+                con.execute("COMMIT")
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+            finally:
+                con.close()
+
+        if remove:
+            for shard_file in shard_files:
+                os.remove(shard_file)
+
+    logger.info(f"✅ Merged shards: {inserted}")
+    return inserted
+
+
+def _merge_table(
+    con: duckdb.DuckDBPyConnection, alias: str, table: str, key: Optional[str]
+) -> int:
+    columns = _table_columns(con, alias, table)
+    if not columns:
+        return 0
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {table} AS SELECT * FROM {alias}.{table} LIMIT 0"
+    )
+    # Columns added to the scrapers after the canonical table was created
+    canonical = _table_columns(con, _current_database(con), table)
+    for column, dtype in columns.items():
+        if column not in canonical:
+            con.execute(f'ALTER TABLE {table} ADD COLUMN "{column}" {dtype}')
+
+    select = ", ".join(f'"{column}"' for column in columns)
+    if key is not None:
+        con.execute(
+            f"DELETE FROM {table} WHERE {key} IN (SELECT {key} FROM {alias}.{table})"
+        )
+        rows = f"SELECT DISTINCT {select} FROM {alias}.{table}"
+    else:
+        rows = (
+            f"SELECT DISTINCT {select} FROM {alias}.{table} "
+            f"EXCEPT SELECT {select} FROM {table}"
+        )
+    return len(
+        con.execute(f"INSERT INTO {table} ({select}) {rows} RETURNING 1").fetchall()
+    )
+
+
+def _current_database(con: duckdb.DuckDBPyConnection) -> str:
+    return con.execute("SELECT current_database()").fetchone()[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge shard DBs into canonical DBs.")
+    parser.add_argument("--remove", action="store_true", help="delete merged shards")
+    args = parser.parse_args()
+    merge_shards(remove=args.remove)
@@ -0,0 +1,393 @@
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import duckdb
+import polars as pl
+
+from batboy.config.constants import (
+    DATE_FORMAT,
+    WRITER_FLUSH_EVERY,
+    WRITER_FLUSH_INTERVAL,
+)
+from batboy.metrics import get_metrics, timed
+from batboy.storage.schema import (
+    BLANK_VALUES,
+    DATE_SUFFIX_PATTERN,
+    NUMBER_SUFFIXES,
+    apply_schema,
+)
+from batboy.utils import file_lock, setup_logger
+
+if TYPE_CHECKING:
+    from batboy.storage.lake import LakeWriter
+
+logger = setup_logger()
+
+
+def db_lock(db_path: str):
+    """Inter-process lock serializing writers of one DuckDB file."""
+    return file_lock(Path(f"{db_path}.lock"))
+
+
+def with_season_context(
+    df: pl.DataFrame, org_id: int, school_name: str, season_url: str, year: str
+) -> pl.DataFrame:
+    """Tag team-season rows with the columns used for joining and tracing."""
+    if df.is_empty():
+        return df
+    return df.with_columns(
+        org_id=pl.lit(org_id, dtype=pl.Int32),
+        school_name=pl.lit(school_name, dtype=pl.String),
+        season_url=pl.lit(season_url, dtype=pl.String),
+        year=pl.lit(year, dtype=pl.String),
+    )
+
+
+def _duckdb_type(con: duckdb.DuckDBPyConnection, column: str) -> str:
+    """SQL type DuckDB gives `column` of the registered new_data frame."""
+    return con.execute(f'SELECT typeof("{column}") FROM new_data LIMIT 1').fetchone()[0]
+
+
+NUMERIC_SQL_TYPES = {"TINYINT", "SMALLINT", "INTEGER", "BIGINT", "FLOAT", "DOUBLE"}
+
+
+def _is_typed(sql_type: str) -> bool:
+    return sql_type == "DATE" or sql_type in NUMERIC_SQL_TYPES
+
+
+def _converted(column: str, sql_type: str) -> str:
+    """SQL converting a text column the way apply_schema converts strings."""
+    col = f'"{column}"'
+    if sql_type == "DATE":
+        cleaned = f"trim(regexp_replace({col}, '{DATE_SUFFIX_PATTERN}', ''))"
+        return (
+            f"COALESCE(TRY_CAST({col} AS DATE), "
+            f"TRY_STRPTIME({cleaned}, '{DATE_FORMAT}')::DATE)"
+        )
+    cleaned = f"rtrim(regexp_replace({col}, '[,\\s]', '', 'g'), '{NUMBER_SUFFIXES}')"
+    return f"TRY_CAST({cleaned} AS {sql_type})"
+
+
+def _migrate_column(
+    con: duckdb.DuckDBPyConnection, table: str, column: str, sql_type: str
+) -> None:
+    """
+    Convert a text column of an existing table to `sql_type`, so old and
+    new rows share one type and format. Refuses (raises TypeError) when a
+    stored value would not survive the conversion.
+    """
+    converted = _converted(column, sql_type)
+    blanks = ", ".join(f"'{v}'" for v in BLANK_VALUES)
+    n_lost, samples = con.execute(f"""
+        SELECT count(*), list(DISTINCT "{column}")[1:3]
+        FROM {table}
+        WHERE "{column}" IS NOT NULL AND trim("{column}") NOT IN ({blanks})
+          AND {converted} IS NULL
+    """).fetchone()
+    if n_lost:
+        raise TypeError(
+            f"❌ {table}.{column} is VARCHAR but new rows are {sql_type}, and "
+            f"{n_lost} stored values cannot be converted (e.g. {samples}); "
+            "migrate the column before writing"
+        )
+    con.execute(
+        f'ALTER TABLE {table} ALTER COLUMN "{column}" '
+        f"SET DATA TYPE {sql_type} USING {converted}"
+    )
+    logger.info(f"🔧 Migrated {table}.{column} from VARCHAR to {sql_type}")
+
+
+class _Unit(NamedTuple):
+    """One add() call: frames by table, its log row and its replace deletes."""
+
+    frames: List[Tuple[str, pl.DataFrame]]
+    log: Optional[Dict[str, Any]]
+    deletes: List[Tuple[str, Dict[str, Any]]]
+
+
+class DuckDBWriter:
+    """
+    Buffered writer holding a single DuckDB connection.
+
+    Data frames and log rows are buffered in memory and written together in
+    one transaction every `flush_every` adds or `flush_interval` seconds, and
+    again on close(). A crash can therefore lose at most the unflushed
+    buffer, but never leaves data rows without their log row (or the
+    reverse), so resume logic stays correct. Data is cast to compact types
+    with apply_schema before it is written, and text columns of older
+    tables are migrated to those types on the first typed write. Units
+    added with `replace` first delete their existing rows in the same transaction, so a refreshed
+    season is swapped atomically.
+
+    DuckDB lets only one process open a database file for writing. With
+    `shared=True` the writer instead connects for each flush while holding
+    an inter-process lock on `<db_path>.lock`, so several worker processes
+    can write to the same file in turn.
+
+    With a `lake`, rows of `data_table` are mirrored to a Parquet lake after
+    each commit (replacements included). DuckDB stays the source of truth:
+    a failed lake write is logged and can be repaired with export_to_lake.
+
+    Args:
+        db_path: DuckDB database file
+        data_table: Default table receiving data frames (created from the first
+            frame); add() may also route frames to other tables by name
+        log_table: Optional log table receiving one row per add()
+        log_columns: Column name -> SQL type for the log table
+        flush_every: Number of add() calls between flushes
+        flush_interval: Maximum seconds between flushes
+        dtypes: Column name -> dtype name applied on write (defaults to
+            DEFAULT_DTYPES; pass {} to write frames unchanged)
+        shared: Hold the connection only while flushing (multi-process mode)
+        lake: Optional LakeWriter mirroring `data_table`
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        data_table: str,
+        log_table: Optional[str] = None,
+        log_columns: Optional[Dict[str, str]] = None,
+        flush_every: int = WRITER_FLUSH_EVERY,
+        flush_interval: float = WRITER_FLUSH_INTERVAL,
+        dtypes: Optional[Dict[str, str]] = None,
+        shared: bool = False,
+        lake: Optional["LakeWriter"] = None,
+    ):
+        if log_table and not log_columns:
+            raise ValueError("log_columns are required when log_table is set")
+        self.db_path = db_path
+        self.data_table = data_table
+        self.log_table = log_table
+        self.log_columns = log_columns or {}
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.dtypes = dtypes
+        self.shared = shared
+        self.lake = lake
+
+        self._units: List[_Unit] = []
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._con: Optional[duckdb.DuckDBPyConnection] = None
+
+    def __enter__(self) -> "DuckDBWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def con(self) -> duckdb.DuckDBPyConnection:
+        if self._con is None:
+            self._con = duckdb.connect(self.db_path)
+            if self.log_table:
+                columns = ", ".join(f"{k} {v}" for k, v in self.log_columns.items())
+                self._con.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.log_table} ({columns})"
+                )
+        return self._con
+
+    def add(
+        self,
+        data: Union[pl.DataFrame, Dict[str, pl.DataFrame], None] = None,
+        log: Optional[Dict[str, Any]] = None,
+        replace: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Buffer one unit of work (e.g. a team-season) and flush if due.
+
+        Args:
+            data: Frame for `data_table`, or a mapping of table name -> frame
+                when one unit of work fills several tables
+            log: Log row for `log_table`
+            replace: Column -> value identifying rows to delete from every
+                table in `data` before the new rows are inserted (e.g.
+                {"season_url": url}); applies even when a frame is empty
+        """
+        if isinstance(data, pl.DataFrame):
+            data = {self.data_table: data}
+        unit = _Unit(
+            frames=[(t, df) for t, df in (data or {}).items() if not df.is_empty()],
+            log=log,
+            deletes=[(table, replace) for table in data or {}] if replace else [],
+        )
+        with self._lock:
+            if unit.frames or unit.log is not None or unit.deletes:
+                self._units.append(unit)
+            self._pending += 1
+            due = self._pending >= self.flush_every or (
+                time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all buffered rows in a single transaction.
+
+        If that transaction fails, every buffered unit is retried in a
+        transaction of its own, and units that still fail are logged and
+        dropped (their log rows with them, so resume picks them up again).
+        The buffer is always cleared, so one bad unit cannot block every
+        later flush. Raises the error when no unit could be written.
+        """
+        with self._lock:
+            units, self._units = self._units, []
+            self._pending = 0
+            self._last_flush = time.monotonic()
+            if not units:
+                return
+
+            with db_lock(self.db_path) if self.shared else nullcontext():
+                try:
+                    self._write_units(units)
+                finally:
+                    if self.shared:
+                        self._disconnect()
+
+    def _write_units(self, units: List[_Unit]) -> None:
+        try:
+            self._write(units)
+            return
+        except Exception as error:
+            if len(units) == 1:
+                self._drop(units[0], error)
+                raise
+            logger.warning(
+                f"⚠️ Flush to {self.db_path} failed ({error}); "
+                f"writing {len(units)} units one at a time"
+            )
+
+        failures: List[Exception] = []
+        for unit in units:
+            try:
+                self._write([unit])
+            except Exception as error:
+                self._drop(unit, error)
+                failures.append(error)
+        if len(failures) == len(units):
+            raise failures[-1]
+
+    def _drop(self, unit: _Unit, error: Exception) -> None:
+        what = unit.log or {table: df.shape[0] for table, df in unit.frames}
+        logger.error(f"❌ Dropped unwritable unit {what}: {error}")
+        get_metrics().inc("write_failures")
+
+    def _write(self, units: List[_Unit]) -> None:
+        frames = [frame for unit in units for frame in unit.frames]
+        logs = [unit.log for unit in units if unit.log is not None]
+        deletes = [delete for unit in units for delete in unit.deletes]
+        con = self.con
+        with timed("duckdb_write"):
+            con.execute("BEGIN TRANSACTION")
+            try:
+                for table, key in deletes:
+                    self._delete_rows(con, table, key)
+                by_table: Dict[str, List[pl.DataFrame]] = {}
+                for table, df in frames:
+                    by_table.setdefault(table, []).append(df)
+                written: Dict[str, pl.DataFrame] = {}
+                for table, dfs in by_table.items():
+                    data = pl.concat(dfs, how="diagonal_relaxed")
+                    written[table] = apply_schema(data, self.dtypes)
+                    self._insert_frame(con, table, written[table])
+                if logs:
+                    self._insert_logs(con, logs)
+                con.execute("COMMIT")
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+
+        if self.lake is not None:
+            with timed("lake_write"):
+                self._mirror_to_lake(written, deletes)
+
+        n_rows = sum(df.shape[0] for _, df in frames)
+        get_metrics().inc("rows_written", n_rows)
+        logger.debug(
+            f"💾 Flushed {n_rows} rows and {len(logs)} log rows to {self.db_path}"
+        )
+
+    def close(self) -> None:
+        """Flush remaining buffers and release the connection."""
+        try:
+            self.flush()
+        finally:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    def _insert_frame(
+        self, con: duckdb.DuckDBPyConnection, table: str, df: pl.DataFrame
+    ) -> None:
+        con.register("new_data", df)
+        try:
+            con.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} AS SELECT * FROM new_data LIMIT 0"
+            )
+            # Columns added to a scraper after its table was created, and
+            # text columns of tables created before apply_schema typed them
+            existing = dict(
+                con.execute(
+                    "SELECT column_name, data_type FROM duckdb_columns() "
+                    "WHERE table_name = ? AND database_name = current_database()",
+                    [table],
+                ).fetchall()
+            )
+            for column in df.columns:
+                if column not in existing:
+                    con.execute(
+                        f'ALTER TABLE {table} ADD COLUMN "{column}" '
+                        f"{_duckdb_type(con, column)}"
+                    )
+                elif existing[column] == "VARCHAR" and df[column].dtype != pl.String:
+                    new_type = _duckdb_type(con, column)
+                    if _is_typed(new_type):
+                        _migrate_column(con, table, column, new_type)
+            con.execute(f"INSERT INTO {table} BY NAME SELECT * FROM new_data")
+        finally:
+            con.unregister("new_data")
+
+    def _mirror_to_lake(
+        self,
+        written: Dict[str, pl.DataFrame],
+        deletes: List[Tuple[str, Dict[str, Any]]],
+    ) -> None:
+        replace = [key for table, key in deletes if table == self.data_table]
+        data = written.get(self.data_table)
+        if data is None and not replace:
+            return
+        try:
+            self.lake.write(data if data is not None else pl.DataFrame(), replace)
+        except Exception as e:
+            logger.error(f"❌ Lake write to {self.lake.dataset} failed: {e}")
+
+    def _delete_rows(
+        self, con: duckdb.DuckDBPyConnection, table: str, key: Dict[str, Any]
+    ) -> None:
+        exists = con.execute(
+            "SELECT 1 FROM duckdb_tables() WHERE table_name = ?", [table]
+        ).fetchone()
+        if exists is None:
+            return
+        where = " AND ".join(f"{col} = ?" for col in key)
+        con.execute(f"DELETE FROM {table} WHERE {where}", list(key.values()))
+
+    def _insert_logs(
+        self, con: duckdb.DuckDBPyConnection, logs: List[Dict[str, Any]]
+    ) -> None:
+        columns = list(self.log_columns)
+        placeholders = ", ".join("?" for _ in columns)
+        con.executemany(
+            f"INSERT INTO {self.log_table} ({', '.join(columns)}) "
+            f"VALUES ({placeholders})",
+            [[log.get(col) for col in columns] for log in logs],
+        )
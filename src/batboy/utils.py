@@ -1,11 +1,20 @@
 import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
 
 import duckdb
-import polars as pl
 from rich.logging import RichHandler
 
 from batboy.config.constants import INFO_DB_PATH
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
 
 def setup_logger(name: str = "batboy", level: int = logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
@@ -21,23 +30,39 @@ def setup_logger(name: str = "batboy", level: int = logging.INFO) -> logging.Log
     return logger
 
 
-def append_to_duckdb(df: pl.DataFrame):
-    con = duckdb.connect(INFO_DB_PATH)
-    con.register("new_data", df)
-    con.sql(f"""
-        CREATE TABLE IF NOT EXISTS {"season_info"} AS
-        SELECT * FROM new_data LIMIT 0
-    """)
-    print(f"Appending {df.shape[0]} rows to duckdb.")
-    con.sql(f"INSERT INTO {'season_info'} SELECT * FROM new_data")
-    con.unregister("new_data")
-    con.close()
-
-
-def get_completed_org_ids() -> set[int]:
-    con = duckdb.connect(INFO_DB_PATH)
-    existing = {row[0] for row in con.sql("SHOW TABLES").fetchall()}
-    if "season_info" not in existing:
-        return set()
-    org_ids = con.sql("SELECT DISTINCT org_id FROM season_info").fetchall()
-    return {row[0] for row in org_ids}
+def get_completed_org_ids(db_path: str = INFO_DB_PATH) -> set[int]:
+    con = duckdb.connect(db_path)
+    try:
+        existing = {row[0] for row in con.sql("SHOW TABLES").fetchall()}
+        if "season_info" not in existing:
+            return set()
+        org_ids = con.sql("SELECT DISTINCT org_id FROM season_info").fetchall()
+        return {row[0] for row in org_ids}
+    finally:
+        con.close()
+
+
+@contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """Exclusive inter-process lock on `path` (created if missing)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,124 @@
+"""
+Offline parser throughput benchmarks over the recorded fixture corpus.
+
+Each parser is timed from raw HTML (parse + extraction) next to a reference
+workload over the same pages in the same run: building the selectolax tree
+and visiting every cell, with no batboy code involved. The parser's
+throughput relative to that reference is compared with baseline.json, so
+results do not depend on the speed of the machine. Benchmarks are
+deselected by default and skip under coverage; run them with:
+
+    pytest -m benchmark tests/benchmarks -s --no-cov
+
+Set BATBOY_BENCH_UPDATE=1 to rewrite the baseline, and
+BATBOY_BENCH_TOLERANCE to change the allowed slowdown (default 0.5, i.e.
+fail if relative throughput drops below half the baseline).
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import polars as pl
+import pytest
+from selectolax.parser import HTMLParser
+
+from batboy.scraping.rosters import _parse_roster_dom
+from batboy.scraping.schedules import _parse_schedule_dom
+from batboy.scraping.teams import _parse_team_history
+from tests.fixtures.corpus import load_corpus
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+MIN_SECONDS = 0.5
+MIN_ITERATIONS = 3
+ROUNDS = 3
+
+
+def _n_rows(result) -> int:
+    return result.height if isinstance(result, pl.DataFrame) else len(result)
+
+
+def reference(dom: HTMLParser) -> List[str]:
+    """Parser-independent workload: the text of every table cell."""
+    return [td.text() for td in dom.css("td")]
+
+
+PARSERS: Dict[str, Callable[[HTMLParser], object]] = {
+    "schedule_legacy": lambda dom: _parse_schedule_dom(dom, "fixture"),
+    "schedule_modern": lambda dom: _parse_schedule_dom(dom, "fixture"),
+    "schedule_postseason": lambda dom: _parse_schedule_dom(dom, "fixture"),
+    "roster": _parse_roster_dom,
+    "team_history": lambda dom: _parse_team_history(dom, 0),
+}
+
+
+def measure(pages: List[Tuple[str, str]], parse: Callable) -> Dict[str, float]:
+    """Parse every page repeatedly for at least MIN_SECONDS."""
+    logger = logging.getLogger("batboy")
+    level = logger.level
+    logger.setLevel(logging.WARNING)  # keep console logging out of the timings
+    try:
+        iterations = n_rows = 0
+        start = time.perf_counter()
+        while iterations < MIN_ITERATIONS or time.perf_counter() - start < MIN_SECONDS:
+            for _, html in pages:
+                n_rows += _n_rows(parse(HTMLParser(html)))
+            iterations += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        logger.setLevel(level)
+    return {
+        "pages_per_sec": round(iterations * len(pages) / elapsed, 1),
+        "rows_per_sec": round(n_rows / elapsed, 1),
+    }
+
+
+def _load_baseline() -> Dict[str, Dict[str, float]]:
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("kind", sorted(PARSERS))
+def test_parser_throughput(kind, request):
+    if request.config.getoption("cov_source", None) and not request.config.getoption(
+        "no_cov", False
+    ):
+        pytest.skip("Benchmarks are meaningless under coverage (use --no-cov)")
+    pages = load_corpus(kind)
+    if not pages:
+        pytest.skip(f"No recorded '{kind}' pages in the fixture corpus")
+
+    # Alternate the two workloads and keep the best round of each, so a
+    # burst of load on the machine does not skew only one side
+    rounds = [
+        (measure(pages, reference), measure(pages, PARSERS[kind]))
+        for _ in range(ROUNDS)
+    ]
+    ref = max((r for r, _ in rounds), key=lambda r: r["pages_per_sec"])
+    result = max((p for _, p in rounds), key=lambda r: r["pages_per_sec"])
+    relative = round(result["pages_per_sec"] / ref["pages_per_sec"], 3)
+    print(
+        f"\n⏱ {kind}: {result['pages_per_sec']} pages/s, "
+        f"{result['rows_per_sec']} rows/s over {len(pages)} page(s), "
+        f"{relative} x reference ({ref['pages_per_sec']} pages/s)"
+    )
+
+    baseline = _load_baseline()
+    if os.getenv("BATBOY_BENCH_UPDATE"):
+        baseline[kind] = {"relative_throughput": relative}
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        return
+
+    if kind not in baseline:
+        pytest.skip(f"No baseline for '{kind}' (run with BATBOY_BENCH_UPDATE=1)")
+    tolerance = float(os.getenv("BATBOY_BENCH_TOLERANCE", "0.5"))
+    expected = baseline[kind]["relative_throughput"]
+    assert relative >= expected * tolerance, (
+        f"{kind} parser regressed: {relative} x reference "
+        f"< {expected * tolerance:.3f} (baseline {expected})"
+    )
@@ -0,0 +1,20 @@
+import pytest
+
+from batboy.metrics import configure_metrics_export, get_metrics
+from batboy.scraping.cache import configure_page_cache
+from batboy.scraping.ratelimit import configure_rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def isolated_scrape_state(tmp_path):
+    """Keep the page cache, rate-limiter state and metrics out of src/batboy/data."""
+    configure_page_cache(str(tmp_path / "page_cache"))
+    configure_rate_limiter(state_path=str(tmp_path / "rate_limit_state.json"))
+    configure_metrics_export(
+        str(tmp_path / "metrics"), str(tmp_path / "metrics.duckdb")
+    )
+    get_metrics().reset()
+    yield
+    configure_page_cache()
+    configure_rate_limiter()
+    configure_metrics_export()
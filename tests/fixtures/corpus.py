@@ -0,0 +1,174 @@
+"""
+Recorded-page fixture corpus for offline parser tests and benchmarks.
+
+Pages live under tests/fixtures/html/<kind>/<name>.html. Kinds without a
+recording (roster, team_history) fall back to generated server HTML of the
+same shape. Record new ones from the live site with:
+
+    python -m tests.fixtures.corpus schedule_modern tennessee_2025 /teams/596721
+    python -m tests.fixtures.corpus team_history tennessee "/teams/history?org_id=694&sport_code=MBA"
+"""
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+HTML_DIR = Path(__file__).parent / "html"
+
+# Corpus kind -> PAGE_SELECTORS key that proves the page is complete
+KINDS = {
+    "season": "season",
+    "schedule_legacy": "schedule",
+    "schedule_modern": "schedule",
+    "roster": "roster",
+    "team_history": "team_history",
+}
+
+# Fixtures recorded before the corpus layout existed
+LEGACY_FIXTURES = {
+    "season": ["pre_2018-2019.html"],
+    "schedule_legacy": ["pre_2018-2019.html"],
+    "schedule_modern": ["tennessee_2025_schedule.html"],
+}
+
+
+# Synthetic kinds built from recorded pages: kind -> (source kind, repeat)
+SYNTHETIC_KINDS = {
+    # ~80-game modern schedules (full season plus conference and NCAA
+    # postseason rows with notes), the slowest pages to parse
+    "schedule_postseason": ("schedule_modern", 4),
+}
+
+ROSTER_HEADERS = [
+    "GP", "GS", "#", "Name", "Class", "Position", "Height",
+    "Bats", "Throws", "Hometown", "High School",
+]  # fmt: skip
+CLASSES = ["Fr", "So", "Jr", "Sr"]
+POSITIONS = ["P", "C", "1B", "2B", "3B", "SS", "OF", "INF", "UT"]
+
+
+def generate_roster(n_players: int = 45) -> str:
+    """Server HTML of a modern roster page, as served before DataTables runs."""
+    header = "".join(f"<th>{h}</th>" for h in ROSTER_HEADERS)
+    rows = "".join(
+        "<tr>"
+        f"<td>{(i * 7) % 60}</td><td>{(i * 5) % 58}</td><td>{i}</td>"
+        f"<td><a href='/players/{8100000 + i}'>Player{i}, Name{i}</a></td>"
+        f"<td>{CLASSES[i % 4]}</td><td>{POSITIONS[i % 9]}</td>"
+        f"<td>6-{i % 12}</td><td>{'LRS'[i % 3]}</td><td>{'RL'[i % 2]}</td>"
+        f"<td>Town {i}, TN</td><td>High School {i}</td>"
+        "</tr>"
+        for i in range(1, n_players + 1)
+    )
+    return (
+        "<html><body><div class='card'><table class='dataTable'>"
+        f"<thead><tr>{header}</tr></thead><tbody>{rows}</tbody>"
+        "</table></div></body></html>"
+    )
+
+
+def generate_team_history(first_year: int = 1897, last_year: int = 2025) -> str:
+    """
+    Server HTML of a team history page holding every season (~130 rows for
+    a program as old as Tennessee), before DataTables paginates it.
+    """
+    rows = "".join(
+        "<tr>"
+        f"<td><a href='/teams/{500000 + year}'>{year}-{str(year + 1)[2:]}</a></td>"
+        f"<td>Coach {year % 17}</td><td>D-I</td><td>SEC</td>"
+        f"<td>{20 + year % 30}</td><td>{10 + year % 20}</td><td>{year % 2}</td>"
+        f"<td>0.{500 + year % 400}</td><td>{'NCAA' if year % 5 == 0 else ''}</td>"
+        "</tr>"
+        for year in range(first_year, last_year)
+    )
+    return (
+        "<html><body><table id='team_history_data_table'>"
+        "<thead><tr><th>Year</th><th>Head Coaches</th><th>Division</th>"
+        "<th>Conference</th><th>Wins</th><th>Losses</th><th>Ties</th>"
+        "<th>WL Pct</th><th>Notes</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table></body></html>"
+    )
+
+
+# Generated pages for kinds that cannot be recorded offline; used only when
+# the corpus has no recording of that kind
+GENERATED_KINDS = {
+    "roster": [("generated_roster", generate_roster)],
+    "team_history": [("generated_team_history", generate_team_history)],
+}
+
+TBODY_PATTERN = re.compile(r"(<tbody[^>]*>)(.*?)(</tbody>)", re.DOTALL)
+
+
+def repeat_schedule_rows(html: str, repeat: int) -> str:
+    """Repeat every row of the first <tbody> to build a longer schedule."""
+    return TBODY_PATTERN.sub(
+        lambda m: m.group(1) + m.group(2) * repeat + m.group(3), html, count=1
+    )
+
+
+def corpus_files(kind: str) -> List[Path]:
+    """All recorded pages of one kind."""
+    files = [HTML_DIR / name for name in LEGACY_FIXTURES.get(kind, [])]
+    files += sorted((HTML_DIR / kind).glob("*.html"))
+    return [f for f in files if f.exists()]
+
+
+def load_corpus(kind: str) -> List[Tuple[str, str]]:
+    """(file name, html) pairs for one kind."""
+    if kind in SYNTHETIC_KINDS:
+        source, repeat = SYNTHETIC_KINDS[kind]
+        return [
+            (f"{name} x{repeat}", repeat_schedule_rows(html, repeat))
+            for name, html in load_corpus(source)
+        ]
+    pages = [(f.name, f.read_text(encoding="utf-8")) for f in corpus_files(kind)]
+    if not pages and kind in GENERATED_KINDS:
+        pages = [(name, generate()) for name, generate in GENERATED_KINDS[kind]]
+    return pages
+
+
+def record_fixture(kind: str, name: str, path: str) -> Path:
+    """
+    Fetch a live page and save its HTML into the corpus.
+
+    Team history pages are captured with every season row (not just the
+    first DataTables page); other kinds are fetched static-first with a
+    Selenium fallback, bypassing the page cache.
+    """
+    from batboy.config.constants import BASE_DOMAIN, PAGE_SELECTORS
+    from batboy.scraping.core import fetch_dom
+    from batboy.scraping.teams import _get_team_history_dom
+
+    if kind not in KINDS:
+        raise ValueError(
+            f"Unknown fixture kind '{kind}' (expected one of {list(KINDS)})"
+        )
+
+    url = path if path.startswith("http") else f"{BASE_DOMAIN}{path}"
+    if kind == "team_history":
+        dom = _get_team_history_dom(url)
+    else:
+        dom = fetch_dom(url, PAGE_SELECTORS[KINDS[kind]], use_cache=False)
+    if dom is None or dom.html is None:
+        raise RuntimeError(f"Could not fetch {url}")
+
+    out = HTML_DIR / kind / f"{name}.html"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(dom.html, encoding="utf-8")
+    return out
+
+
+def corpus_summary() -> Dict[str, int]:
+    return {kind: len(load_corpus(kind)) for kind in [*KINDS, *SYNTHETIC_KINDS]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record a page into the corpus.")
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("name", help="fixture file name (without .html)")
+    parser.add_argument("path", help="site path such as /teams/596721, or a full URL")
+    args = parser.parse_args()
+    print(f"Saved {record_fixture(args.kind, args.name, args.path)}")
+    print(f"Corpus: {corpus_summary()}")
@@ -0,0 +1,105 @@
+import duckdb
+import polars as pl
+import pytest
+from typer.testing import CliRunner
+
+import batboy.query
+from batboy.cli import app
+from batboy.storage.shards import configure_shard, get_shard
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def schedules_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "sched.duckdb")
+    schedules = pl.DataFrame(
+        {
+            "org_id": [1, 1],
+            "school_name": ["Alpha", "Alpha"],
+            "season_url": ["/teams/10", "/teams/10"],
+            "year": ["2024-25", "2024-25"],
+            "team_score": [5, 1],
+            "opp_score": [3, 2],
+        }
+    )
+    con = duckdb.connect(db_path)
+    con.register("new_data", schedules)
+    con.execute("CREATE TABLE schedules AS SELECT * FROM new_data")
+    con.close()
+    monkeypatch.setattr(
+        batboy.query, "SOURCES", {"sched": (db_path, "schedules", "log")}
+    )
+    return db_path
+
+
+@pytest.mark.no_web
+def test_query_writes_csv(schedules_db, tmp_path):
+    out = tmp_path / "record.csv"
+    result = runner.invoke(
+        app, ["--no-cache", "query", "record", "--no-cached", "--output", str(out)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert pl.read_csv(out).select("wins", "losses").row(0) == (1, 1)
+
+
+@pytest.mark.no_web
+def test_invalid_shard_is_rejected():
+    try:
+        result = runner.invoke(app, ["--shard", "4/4", "merge"])
+    finally:
+        configure_shard(None)
+
+    assert result.exit_code != 0
+    assert get_shard() is None
+
+
+@pytest.mark.no_web
+def test_dry_run_refresh_applies_limit(monkeypatch):
+    import batboy.scraping.refresh
+
+    open_seasons = pl.DataFrame(
+        {
+            "org_id": [1, 2, 3],
+            "school_name": ["Alpha", "Beta", "Gamma"],
+            "season_url": ["/teams/10", "/teams/20", "/teams/30"],
+            "year": ["2025-26"] * 3,
+        }
+    )
+    monkeypatch.setattr(
+        batboy.scraping.refresh, "get_open_season_targets", lambda tab: open_seasons
+    )
+
+    result = runner.invoke(
+        app, ["--no-cache", "schedules", "--refresh", "--dry-run", "--limit", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "2 schedules seasons would be scraped" in result.output
+
+
+@pytest.mark.no_web
+def test_audit_passes_workers_through(monkeypatch):
+    import batboy.scraping.teams
+
+    calls = []
+    monkeypatch.setattr(
+        batboy.scraping.teams,
+        "audit_all_info_with_resume",
+        lambda *args, **kwargs: calls.append(kwargs),
+    )
+
+    result = runner.invoke(app, ["--no-cache", "audit", "--workers", "8"])
+
+    assert result.exit_code == 0, result.output
+    assert calls == [{"queue": False, "probe_workers": 8}]
+
+
+@pytest.mark.no_web
+@pytest.mark.parametrize("rate", ["0", "-1"])
+def test_non_positive_rate_is_rejected(rate):
+    result = runner.invoke(app, ["--rate", rate, "merge"])
+
+    assert result.exit_code != 0
+    assert "--rate" in result.output
@@ -0,0 +1,67 @@
+import json
+
+import duckdb
+import pytest
+
+from batboy.metrics import Histogram, Metrics, export_metrics, get_metrics
+from batboy.scraping.cache import PageCache
+
+
+@pytest.mark.no_web
+def test_histogram_quantiles():
+    hist = Histogram([0.1, 1, 10])
+    for value in [0.05, 0.05, 0.5, 0.5, 20]:
+        hist.observe(value)
+
+    assert hist.counts == [2, 2, 0, 1]
+    assert hist.quantile(0.5) == 1
+    assert hist.quantile(0.95) == 20  # +Inf bucket reports the max
+
+
+@pytest.mark.no_web
+def test_prometheus_text():
+    metrics = Metrics([0.5, 1])
+    metrics.observe("navigate", 0.7)
+    metrics.inc("failures", reason="blocked")
+    metrics.inc("cache_lookups", result="hit")
+    metrics.inc("cache_lookups", result="miss")
+
+    text = metrics.to_prometheus(batch="schedules")
+    assert (
+        'batboy_stage_seconds_bucket{batch="schedules",stage="navigate",le="1"} 1'
+        in text
+    )
+    assert 'batboy_failures_total{batch="schedules",reason="blocked"} 1' in text
+    assert 'batboy_cache_hit_ratio{batch="schedules"} 0.5' in text
+
+
+@pytest.mark.no_web
+def test_cache_lookups_are_counted(tmp_path):
+    cache = PageCache(str(tmp_path / "pages"))
+    cache.get("https://example.com/a")
+    cache.put("https://example.com/a", "<html></html>")
+    cache.get("https://example.com/a")
+
+    assert get_metrics().cache_hit_rate() == 0.5
+
+
+@pytest.mark.no_web
+def test_export_appends_runs_to_metrics_table(tmp_path):
+    metrics = get_metrics()
+    for _ in range(2):
+        metrics.observe("parse_schedule", 0.01)
+        metrics.inc("pages", source="static")
+        summary = export_metrics("schedules")
+
+    assert metrics.counter("pages") == 0  # reset after export
+    saved = json.loads((tmp_path / "metrics" / "schedules.json").read_text())
+    assert saved["run_id"] == summary["run_id"]
+    assert saved["stages"]["parse_schedule"]["count"] == 1
+    assert (tmp_path / "metrics" / "batboy_schedules.prom").exists()
+
+    con = duckdb.connect(str(tmp_path / "metrics.duckdb"))
+    rows = con.sql(
+        "SELECT kind, name, count(DISTINCT run_id) FROM metrics GROUP BY ALL ORDER BY 1"
+    ).fetchall()
+    con.close()
+    assert rows == [("counter", "pages", 2), ("histogram", "parse_schedule", 2)]
@@ -0,0 +1,100 @@
+import duckdb
+import polars as pl
+import pytest
+
+from batboy.query import Query
+
+SCHEDULES = pl.DataFrame(
+    {
+        "org_id": [1, 1, 1, 2, 2],
+        "school_name": ["Alpha", "Alpha", "Alpha", "Beta", "Beta"],
+        "season_url": ["/teams/10", "/teams/10", "/teams/10", "/teams/20", "/teams/20"],
+        "year": ["2024-25"] * 5,
+        "opponent_name": ["Beta", "Beta", "Gamma", "Alpha", "Alpha"],
+        "opponent_id": [20, 20, 30, 10, 10],
+        "opponent_site": ["", "@", "vs", "@", ""],
+        "opponent_note": ["", "", "@ Omaha, NE", "", ""],
+        "team_score": [5, 2, 4, 3, 6],
+        "opp_score": [3, 6, 4, 5, 2],
+        "attendance": [1000, 2500, 8000, 1000, 2500],
+        "game_id": [100, 101, 102, 100, 101],
+    }
+)
+SEASON_INFO = pl.DataFrame(
+    {
+        "org_id": [1, 2, 3],
+        "season_url": ["/teams/10", "/teams/20", "/teams/30"],
+        "year": ["2024-25"] * 3,
+        "division": ["1", "1", "2"],
+    }
+)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = {
+        "sched": str(tmp_path / "sched.duckdb"),
+        "info": str(tmp_path / "i.duckdb"),
+    }
+    con = duckdb.connect(paths["sched"])
+    con.execute("CREATE TABLE schedules AS SELECT * FROM SCHEDULES")
+    con.execute("CREATE TABLE log AS SELECT DISTINCT season_url FROM SCHEDULES")
+    con.close()
+    con = duckdb.connect(paths["info"])
+    con.execute("CREATE TABLE season_info AS SELECT * FROM SEASON_INFO")
+    con.close()
+    return {
+        "sched": (paths["sched"], "schedules", "log"),
+        "info": (paths["info"], "season_info", "season_info"),
+    }
+
+
+@pytest.mark.no_web
+def test_aggregates(sources, tmp_path):
+    with Query(sources, cache_db=None) as q:
+        record = q.team_season_record(org_id=1).pl()
+        assert record.select("wins", "losses", "ties", "runs_scored").row(0) == (
+            1,
+            1,
+            1,
+            11,
+        )
+
+        h2h = q.head_to_head(1, 2).pl()
+        assert h2h.select("games", "wins", "losses").row(0) == (2, 1, 1)
+
+        splits = q.home_away_splits(org_id=1).pl()
+        assert splits["site"].to_list() == ["away", "home", "neutral"]
+
+        venues = q.attendance_by_venue().pl()
+        # Each contest is counted once, at the home team's venue
+        assert dict(zip(venues["venue"], venues["total_attendance"])) == {
+            "Omaha, NE": 8000,
+            "Alpha": 1000,
+            "Beta": 2500,
+        }
+
+
+@pytest.mark.no_web
+def test_cache_invalidated_by_new_seasons(sources, tmp_path):
+    cache_db = str(tmp_path / "cache.duckdb")
+
+    def records():
+        with Query(sources, cache_db=cache_db) as q:
+            return q.cached(q.team_season_record())
+
+    assert records().shape[0] == 2
+
+    # A stale materialization is served until the log changes
+    con = duckdb.connect(sources["sched"][0])
+    con.execute(
+        "INSERT INTO schedules (org_id, season_url, year, team_score, opp_score) "
+        "VALUES (3, '/teams/30', '2024-25', 1, 0)"
+    )
+    con.close()
+    assert records().shape[0] == 2
+
+    con = duckdb.connect(sources["sched"][0])
+    con.execute("INSERT INTO log VALUES ('/teams/30')")
+    con.close()
+    assert records().shape[0] == 3
@@ -0,0 +1,77 @@
+import threading
+
+import polars as pl
+import pytest
+
+from batboy.scraping.batch import run_batch, run_queue
+from batboy.scraping.progress import BatchProgress, configure_progress
+from batboy.storage.queue import JobQueue
+
+
+@pytest.mark.no_web
+@pytest.mark.parametrize("workers", [1, 4])
+def test_run_batch_writes_every_row_on_calling_thread(workers):
+    pending = pl.DataFrame({"season_url": [f"/teams/{i}" for i in range(10)]})
+    main_thread = threading.get_ident()
+    written = {}
+
+    def scrape(row):
+        if row["season_url"] == "/teams/3":
+            raise ValueError("table missing")
+        return pl.DataFrame({"game_id": [1, 2]})
+
+    def write(row, df, error):
+        assert threading.get_ident() == main_thread
+        written[row["season_url"]] = error if error is not None else df.shape[0]
+
+    run_batch(pending, scrape, write, workers=workers)
+
+    assert len(written) == 10
+    assert isinstance(written["/teams/3"], ValueError)
+    assert written["/teams/0"] == 2
+
+
+@pytest.mark.no_web
+def test_run_queue_completes_jobs_and_retries_failures(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.duckdb"), max_attempts=2, retry_delay=0.1)
+    queue.enqueue(
+        "schedules",
+        pl.DataFrame({"season_url": [f"/teams/{i}" for i in range(5)]}),
+        "season_url",
+    )
+    attempts = {}
+
+    def scrape(row):
+        attempts[row["season_url"]] = attempts.get(row["season_url"], 0) + 1
+        if row["season_url"] == "/teams/3" and attempts["/teams/3"] == 1:
+            raise ValueError("blocked")
+        return pl.DataFrame({"game_id": [1]})
+
+    worked = run_queue(
+        queue, "schedules", "season_url", scrape, lambda *a: None, batch_size=2
+    )
+
+    assert worked == 6  # five jobs, one of them retried
+    assert attempts["/teams/3"] == 2
+    assert queue.counts("schedules") == {"done": 5}
+
+
+@pytest.mark.no_web
+def test_run_batch_reports_progress():
+    pending = pl.DataFrame({"season_url": [f"/teams/{i}" for i in range(4)]})
+    progress = BatchProgress()
+    configure_progress(progress)
+    try:
+
+        def scrape(row):
+            if row["season_url"] == "/teams/2":
+                raise ValueError("table missing")
+            return pl.DataFrame({"game_id": [1, 2, 3]})
+
+        run_batch(pending, scrape, lambda *a: None)
+    finally:
+        configure_progress(None)
+
+    assert (progress.total, progress.done, progress.failed) == (4, 4, 1)
+    assert progress.rows == 9
+    assert progress.rates()["eta"] == 0
@@ -0,0 +1,127 @@
+import duckdb
+import polars as pl
+import pytest
+from selectolax.parser import HTMLParser
+
+from batboy.config.constants import (
+    BOX_SCORE_LOG_TABLE,
+    BOX_SCORE_PLAYER_TABLE,
+    LINE_SCORE_TABLE,
+    SCHEDULE_DATA_TABLE,
+)
+from batboy.scraping import box_scores
+from batboy.scraping.box_scores import (
+    _parse_line_score,
+    _parse_player_lines,
+    get_pending_box_score_targets,
+)
+
+BOX_SCORE = """
+<table>
+    <tr><th></th><th>1</th><th>2</th><th>3</th><th>R</th><th>H</th><th>E</th></tr>
+    <tr><td><a href="/teams/596558">Hofstra</a></td><td>0</td><td>0</td><td>0</td>
+        <td>0</td><td>2</td><td>1</td></tr>
+    <tr><td><a href="/teams/596721">Tennessee</a></td><td>4</td><td>11</td><td>X</td>
+        <td>15</td><td>14</td><td>0</td></tr>
+</table>
+<table>
+    <thead><tr><th>Name</th><th>Pos</th><th>AB</th><th>R</th><th>H</th><th>RBI</th></tr></thead>
+    <tbody>
+        <tr><td><a href="/players/1">Away Hitter</a></td><td>CF</td><td>4</td><td>0</td><td>1</td><td>0</td></tr>
+        <tr><td>Totals</td><td></td><td>30</td><td>0</td><td>2</td><td>0</td></tr>
+    </tbody>
+</table>
+<table>
+    <thead><tr><th>Name</th><th>Pos</th><th>AB</th><th>R</th><th>H</th><th>RBI</th></tr></thead>
+    <tbody>
+        <tr><td><a href="/players/2">Home Hitter</a></td><td>SS</td><td>5</td><td>3</td><td>3</td><td>4</td></tr>
+    </tbody>
+</table>
+<table>
+    <thead><tr><th>Name</th><th>Pos</th><th>IP</th><th>H</th><th>ER</th><th>ERA</th></tr></thead>
+    <tbody>
+        <tr><td><a href="/players/3">Away Pitcher</a></td><td>P</td><td>7.0</td><td>2</td><td>0</td><td>1.50</td></tr>
+    </tbody>
+</table>
+"""
+
+
+@pytest.mark.no_web
+def test_parse_line_score_and_player_lines():
+    dom = HTMLParser(BOX_SCORE)
+
+    line = _parse_line_score(dom, 6316403)
+    assert line["team_name"].to_list() == ["Hofstra", "Tennessee"]
+    assert line["team_id"].to_list() == [596558, 596721]
+    assert line["runs_by_inning"].to_list()[1] == [4, 11, None]
+
+    players = _parse_player_lines(dom, 6316403, line)
+    assert players.height == 3  # totals row skipped
+    hitting = players.filter(pl.col("category") == "hitting")
+    assert hitting["team_name"].to_list() == ["Hofstra", "Tennessee"]
+    assert hitting["player_id"].to_list() == [1, 2]
+    pitcher = players.filter(pl.col("category") == "pitching").row(0, named=True)
+    assert (pitcher["team_name"], pitcher["IP"], pitcher["ERA"]) == (
+        "Hofstra",
+        "7.0",
+        "1.50",
+    )
+
+
+@pytest.mark.no_web
+def test_pending_box_scores_are_distinct_game_ids(tmp_path, monkeypatch):
+    schedule_db = str(tmp_path / "schedules.duckdb")
+    con = duckdb.connect(schedule_db)
+    # Game 10 appears in both teams' schedules
+    con.execute(
+        f"CREATE TABLE {SCHEDULE_DATA_TABLE} AS SELECT * FROM (VALUES "
+        "(10, '/teams/1'), (10, '/teams/2'), (11, '/teams/1'), (NULL, '/teams/1')"
+        ") t(game_id, season_url)"
+    )
+    con.close()
+    monkeypatch.setattr(box_scores, "SEASON_SCHEDULE_DB", schedule_db)
+    monkeypatch.setattr(box_scores, "BOX_SCORE_DB_PATH", str(tmp_path / "box.duckdb"))
+
+    assert get_pending_box_score_targets()["game_id"].to_list() == [10, 11]
+
+    monkeypatch.setattr(
+        box_scores,
+        "get_box_score",
+        lambda game_id: {
+            LINE_SCORE_TABLE: pl.DataFrame({"game_id": [game_id]}),
+            BOX_SCORE_PLAYER_TABLE: pl.DataFrame({"game_id": [game_id], "AB": [4]}),
+        },
+    )
+    box_scores.batch_scrape_box_scores(limit=1)
+
+    assert get_pending_box_score_targets()["game_id"].to_list() == [11]
+    con = duckdb.connect(str(tmp_path / "box.duckdb"))
+    assert con.sql(f"SELECT count(*) FROM {LINE_SCORE_TABLE}").fetchone()[0] == 1
+    con.close()
+
+
+@pytest.mark.no_web
+def test_empty_box_score_is_logged_as_failure(tmp_path, monkeypatch):
+    schedule_db = str(tmp_path / "schedules.duckdb")
+    con = duckdb.connect(schedule_db)
+    con.execute(f"CREATE TABLE {SCHEDULE_DATA_TABLE} AS SELECT 10 AS game_id")
+    con.close()
+    box_db = str(tmp_path / "box.duckdb")
+    monkeypatch.setattr(box_scores, "SEASON_SCHEDULE_DB", schedule_db)
+    monkeypatch.setattr(box_scores, "BOX_SCORE_DB_PATH", box_db)
+    monkeypatch.setattr(
+        box_scores,
+        "get_box_score",
+        lambda game_id: {
+            LINE_SCORE_TABLE: pl.DataFrame(),
+            BOX_SCORE_PLAYER_TABLE: pl.DataFrame(),
+        },
+    )
+
+    box_scores.batch_scrape_box_scores()
+
+    con = duckdb.connect(box_db)
+    assert con.sql(f"SELECT success FROM {BOX_SCORE_LOG_TABLE}").fetchall() == [
+        (False,)
+    ]
+    con.close()
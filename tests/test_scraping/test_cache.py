@@ -0,0 +1,95 @@
+import os
+import time
+from datetime import date
+
+import pytest
+
+from batboy.scraping.cache import FOREVER, PageCache, season_ttl, url_ttl
+
+SEASON_URL = "https://stats.ncaa.org/teams/596721"
+
+
+@pytest.mark.no_web
+def test_page_cache_roundtrip_and_stats(tmp_path):
+    cache = PageCache(str(tmp_path))
+    assert cache.get(SEASON_URL) is None
+
+    cache.put(SEASON_URL, "<html><body>Schedule/Results</body></html>", ttl=60)
+    assert cache.get(SEASON_URL) == "<html><body>Schedule/Results</body></html>"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["stores"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.no_web
+def test_page_cache_expires_entries(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put(SEASON_URL, "<html></html>", ttl=0.01)
+    time.sleep(0.05)
+    assert cache.get(SEASON_URL) is None
+    assert cache.stats()["expired"] == 1
+
+
+@pytest.mark.no_web
+def test_page_cache_honours_zero_ttl(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put(SEASON_URL, "<html></html>", ttl=0)
+    time.sleep(0.01)
+    assert cache.get(SEASON_URL) is None
+
+
+@pytest.mark.no_web
+def test_page_cache_drops_corrupt_entries(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put(SEASON_URL, "<html></html>")
+    for path in cache._paths(SEASON_URL):
+        if path.exists():
+            path.write_bytes(b"garbage")
+
+    assert cache.get(SEASON_URL) is None
+    assert not any(path.exists() for path in cache._paths(SEASON_URL))
+    assert cache.stats()["corrupt"] == 1
+
+    cache.put(SEASON_URL, "<html>fresh</html>")
+    assert cache.get(SEASON_URL) == "<html>fresh</html>"
+
+
+@pytest.mark.no_web
+def test_page_cache_evicts_least_recently_used(tmp_path):
+    page = "<tr>" + os.urandom(2048).hex() + "</tr>"
+    cache = PageCache(str(tmp_path), max_bytes=6000)
+
+    cache.put("https://stats.ncaa.org/teams/1", page, ttl=FOREVER)
+    cache.put("https://stats.ncaa.org/teams/2", page, ttl=FOREVER)
+    # Age both entries, then touch /teams/1 so /teams/2 is least recent
+    for path in tmp_path.glob("*/*"):
+        os.utime(path, (time.time() - 100, time.time() - 100))
+    assert cache.get("https://stats.ncaa.org/teams/1") is not None
+
+    cache.put("https://stats.ncaa.org/teams/3", page, ttl=FOREVER)
+    assert cache.get("https://stats.ncaa.org/teams/2") is None
+    assert cache.get("https://stats.ncaa.org/teams/1") is not None
+    assert cache.stats()["evictions"] >= 1
+
+
+@pytest.mark.no_web
+def test_page_cache_keeps_only_subtree(tmp_path):
+    cache = PageCache(str(tmp_path))
+    html = "<html><body><nav>menu</nav><table class='mytable'><tr></tr></table></body></html>"
+    cache.put(SEASON_URL, html, ttl=60, keep_selector="table.mytable")
+
+    cached = cache.get(SEASON_URL)
+    assert cached is not None
+    assert "mytable" in cached
+    assert "menu" not in cached
+
+
+@pytest.mark.no_web
+def test_cache_ttls_by_season_and_url_class():
+    assert season_ttl("2017-18", today=date(2025, 3, 1)) == FOREVER
+    assert season_ttl("2024-25", today=date(2025, 3, 1)) < FOREVER
+    assert url_ttl("https://stats.ncaa.org/contests/6316403/box_score") == FOREVER
+    assert url_ttl("https://stats.ncaa.org/teams/history") < FOREVER
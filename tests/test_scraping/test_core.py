@@ -1,7 +1,24 @@
 import pytest
 from selectolax.parser import HTMLParser
+from selenium.common.exceptions import NoSuchElementException
 
-from batboy.scraping.core import get_dom, get_driver, make_request, throttle_and_retry
+from batboy.metrics import get_metrics
+from batboy.scraping import core
+from batboy.scraping.cache import get_page_cache
+from batboy.scraping.core import (
+    DriverPool,
+    fetch_dom,
+    get_dom,
+    get_driver,
+    make_request,
+    throttle_and_retry,
+    wait_for_selector,
+)
+from batboy.scraping.ratelimit import (
+    DEFAULT_HOST,
+    BlockedPageError,
+    get_rate_limiter,
+)
 
 # Use a stable, static page
 EXAMPLE_STATIC_URL = "https://httpbin.org/html"
@@ -47,3 +64,208 @@ def test_throttle_and_retry_retries_then_succeeds(caplog):
 
     # Log assertion to silence Pyright + verify behavior
     assert any("retrying" in rec.message for rec in caplog.records)
+
+
+@pytest.mark.no_web
+def test_throttle_and_retry_slows_down_only_on_throttling(monkeypatch):
+    limiter = get_rate_limiter()
+    monkeypatch.setattr(core.time, "sleep", lambda s: None)
+    start = limiter.rate(DEFAULT_HOST)
+
+    def broken():
+        raise ValueError("parse bug")
+
+    with pytest.raises(RuntimeError):
+        throttle_and_retry(broken, max_retries=2, verbose=False)
+    assert limiter.rate(DEFAULT_HOST) == pytest.approx(start)
+
+    def blocked():
+        raise BlockedPageError("HTTP 429")
+
+    with pytest.raises(RuntimeError):
+        throttle_and_retry(blocked, max_retries=1, verbose=False)
+    assert limiter.rate(DEFAULT_HOST) < start
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.healthy = True
+
+    @property
+    def current_url(self):
+        if not self.healthy:
+            raise RuntimeError("session deleted")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.mark.no_web
+def test_driver_pool_reuses_and_recycles_drivers():
+    created = []
+
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+
+    pool = DriverPool(size=1, max_pages=2, max_rss_mb=None, factory=factory)
+
+    with pool.borrow() as first:
+        pass
+    with pool.borrow() as second:
+        pass
+    assert first is second
+    assert first.quit_called  # recycled after max_pages
+
+    with pool.borrow() as third:
+        pass
+    assert third is not first
+    assert len(created) == 2
+    pool.close()
+    assert third.quit_called
+
+
+@pytest.mark.no_web
+def test_driver_pool_discards_on_error_and_unhealthy():
+    pool = DriverPool(size=1, max_rss_mb=None, factory=FakeDriver)
+
+    with pytest.raises(ValueError), pool.borrow() as broken:
+        raise ValueError("boom")
+    assert broken.quit_called
+
+    with pool.borrow() as driver:
+        driver.healthy = False
+    with pool.borrow() as replacement:
+        pass
+    assert replacement is not driver
+    assert driver.quit_called
+
+
+class FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+@pytest.mark.no_web
+def test_fetch_dom_prefers_static_html(monkeypatch):
+    html = "<table class='mytable'><tr><td>02/16/2018</td></tr></table>"
+    monkeypatch.setattr(core, "get_page_cache", lambda: None)
+    monkeypatch.setattr(core, "make_request", lambda url, timeout: FakeResponse(html))
+    monkeypatch.setattr(core, "_render_html", lambda *a, **kw: pytest.fail("rendered"))
+
+    dom = fetch_dom(
+        "https://example.test/teams/1", "table.mytable", min_delay=0, max_delay=0
+    )
+    assert dom is not None
+    assert dom.css_first("table.mytable") is not None
+    assert get_metrics().histograms["html_parse"].count == 1  # parsed once
+
+
+@pytest.mark.no_web
+def test_fetch_dom_falls_back_to_selenium(monkeypatch):
+    rendered = "<div class='dataTables_scrollBody'><table></table></div>"
+    monkeypatch.setattr(core, "get_page_cache", lambda: None)
+    monkeypatch.setattr(
+        core, "make_request", lambda url, timeout: FakeResponse("<div id='app'></div>")
+    )
+    monkeypatch.setattr(
+        core, "_render_html", lambda *a, **kw: (rendered, HTMLParser(rendered))
+    )
+
+    dom = fetch_dom(
+        "https://example.test/teams/1/roster",
+        ".dataTables_scrollBody",
+        min_delay=0,
+        max_delay=0,
+    )
+    assert dom is not None
+    assert dom.css_first(".dataTables_scrollBody") is not None
+
+
+@pytest.mark.no_web
+def test_get_dom_caches_only_ready_pages(monkeypatch):
+    url = "https://example.test/teams/1/box_score"
+    pages = ["<div id='app'></div>", "<table class='mytable'></table>"]
+    monkeypatch.setattr(
+        core, "_render_html", lambda *a, **kw: (pages[0], HTMLParser(pages[0]))
+    )
+
+    get_dom(url, ready_selector="table.mytable", min_delay=0, max_delay=0)
+    assert get_page_cache().get(url) is None  # selector timed out
+
+    pages.pop(0)
+    get_dom(url, ready_selector="table.mytable", min_delay=0, max_delay=0)
+    assert get_page_cache().get(url) == pages[0]
+
+
+@pytest.mark.no_web
+def test_fetch_dom_refetches_cached_pages_lacking_selector(monkeypatch):
+    url = "https://example.test/teams/1"
+    html = "<table class='mytable'><tr><td>02/16/2018</td></tr></table>"
+    get_page_cache().put(url, "<div id='app'></div>")
+    monkeypatch.setattr(core, "make_request", lambda url, timeout: FakeResponse(html))
+
+    dom = fetch_dom(url, "table.mytable", min_delay=0, max_delay=0)
+
+    assert dom.css_first("table.mytable") is not None
+    assert get_page_cache().get(url) == html
+    assert get_metrics().counter("cache_stale") == 1
+
+
+class SlowRenderingDriver:
+    """Fake driver whose table appears after a few polls."""
+
+    def __init__(self, ready_after):
+        self.polls = 0
+        self.ready_after = ready_after
+
+    def find_element(self, by, value):
+        self.polls += 1
+        if self.polls < self.ready_after:
+            raise NoSuchElementException(value)
+        return object()
+
+
+@pytest.mark.no_web
+def test_wait_for_selector_polls_until_ready():
+    driver = SlowRenderingDriver(ready_after=3)
+    assert wait_for_selector(driver, "tr.underline_rows", timeout=2.0, poll=0.01)
+    assert driver.polls == 3
+
+
+@pytest.mark.no_web
+def test_wait_for_selector_times_out():
+    driver = SlowRenderingDriver(ready_after=10**6)
+    assert not wait_for_selector(driver, "tr.underline_rows", timeout=0.05, poll=0.01)
+
+
+class RecordingChrome:
+    def __init__(self, options):
+        self.options = options
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+
+@pytest.mark.no_web
+def test_get_driver_lean_profile_blocks_resources(monkeypatch):
+    monkeypatch.setattr(core.webdriver, "Chrome", RecordingChrome)
+    monkeypatch.setattr(core, "stealth", lambda driver, **kw: None)
+
+    lean = get_driver(headless=True, lean=True)
+    assert "--disable-extensions" in lean.options.arguments
+    assert any(a.startswith("--disk-cache-dir=") for a in lean.options.arguments)
+    blocked = dict(lean.cdp)["Network.setBlockedURLs"]["urls"]
+    assert "*.png" in blocked
+
+    full = get_driver(headless=True)
+    assert full.cdp == []
+    assert "--disable-extensions" not in full.options.arguments
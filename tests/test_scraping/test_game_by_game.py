@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+
+import polars as pl
+import pytest
+from selectolax.parser import HTMLParser
+
+from batboy.config.constants import STAT_CATEGORY_SCHEMAS
+from batboy.metrics import get_metrics
+from batboy.scraping import core, game_by_game
+from batboy.scraping.game_by_game import _parse_game_by_game_dom, get_game_by_game
+from batboy.scraping.ratelimit import configure_rate_limiter
+
+
+def _game_log_page(category: str, value: str) -> str:
+    headers = STAT_CATEGORY_SCHEMAS[category]
+    stats = "".join(f"<td>{value}</td>" for _ in headers[3:])
+    return f"""
+    <html><body>
+    <a href="#">Hitting</a> <a href="#">Pitching</a> <a href="#">Fielding</a>
+    <table>
+        <thead><tr>{"".join(f"<th>{h}</th>" for h in headers)}</tr></thead>
+        <tbody>
+            <tr>
+                <td>02/14/2025</td>
+                <td><a href="/teams/596558">Hofstra</a></td>
+                <td><a href="/contests/6316403/box_score">W 15-0</a></td>
+                {stats}
+            </tr>
+            <tr><td>Totals</td><td></td><td></td>{stats}</tr>
+        </tbody>
+    </table>
+    </body></html>
+    """
+
+
+class CategorySwitchingDriver:
+    """Serves the hitting log, then whichever category was last clicked."""
+
+    def __init__(self, first_page=None):
+        self.first_page = first_page or _game_log_page("hitting", "1")
+        self.page_source = ""
+        self.loads = 0
+        self.clicks = []
+
+    def get(self, url):
+        self.loads += 1
+        self.page_source = self.first_page
+
+    def execute_script(self, script, label, table_selector):
+        self.clicks.append(label)
+        self.page_source = _game_log_page(label.lower(), "2")
+        return True
+
+    def find_element(self, by, selector):
+        return HTMLParser(self.page_source).body
+
+
+class FakePool:
+    def __init__(self, driver):
+        self.driver = driver
+
+    @contextmanager
+    def borrow(self, timeout=None):
+        yield self.driver
+
+
+@pytest.mark.no_web
+def test_parse_game_by_game_detects_category_and_skips_totals():
+    df = _parse_game_by_game_dom(HTMLParser(_game_log_page("pitching", "3")))
+
+    assert df.height == 1
+    row = df.row(0, named=True)
+    assert row["category"] == "pitching"
+    assert (row["date"], row["opponent"], row["result"]) == (
+        "02/14/2025",
+        "Hofstra",
+        "W 15-0",
+    )
+    assert (row["opponent_id"], row["game_id"]) == (596558, 6316403)
+    assert row["ERA"] == "3"
+
+
+@pytest.mark.no_web
+def test_get_game_by_game_switches_categories_in_one_page_load(monkeypatch, tmp_path):
+    configure_rate_limiter(
+        state_path=str(tmp_path / "fast_limiter.json"), initial_rate=100, max_rate=100
+    )
+    driver = CategorySwitchingDriver()
+    monkeypatch.setattr(game_by_game, "get_driver_pool", lambda: FakePool(driver))
+    monkeypatch.setattr(game_by_game, "wait_for_selector", lambda *a, **kw: True)
+    monkeypatch.setattr(game_by_game, "wait_for_text_change", lambda *a, **kw: True)
+
+    df = get_game_by_game("/players/5519651")
+
+    assert driver.loads == 1
+    assert driver.clicks == ["Pitching", "Fielding"]
+    assert sorted(df["category"].to_list()) == ["fielding", "hitting", "pitching"]
+    # Cast with DEFAULT_DTYPES on the way out
+    assert df.schema["date"] == pl.Date
+    assert df.schema["AB"] == pl.Int16
+    assert df.schema["ERA"] == pl.Float32
+    assert df.filter(pl.col("category") == "pitching")["ERA"].to_list() == [2.0]
+
+
+def _fake_browser(monkeypatch, tmp_path, driver, text_changes=lambda: True):
+    configure_rate_limiter(
+        state_path=str(tmp_path / "fast_limiter.json"), initial_rate=100, max_rate=100
+    )
+    monkeypatch.setattr(game_by_game, "get_driver_pool", lambda: FakePool(driver))
+    monkeypatch.setattr(game_by_game, "wait_for_selector", lambda *a, **kw: True)
+    monkeypatch.setattr(
+        game_by_game, "wait_for_text_change", lambda *a, **kw: text_changes()
+    )
+    monkeypatch.setattr(core.time, "sleep", lambda s: None)
+
+
+@pytest.mark.no_web
+def test_get_game_by_game_continues_past_empty_category(monkeypatch, tmp_path):
+    # A pitcher without hitting games: the page opens on an empty log
+    driver = CategorySwitchingDriver(first_page="<html><body></body></html>")
+    _fake_browser(monkeypatch, tmp_path, driver)
+
+    df = get_game_by_game("/players/5519651")
+
+    assert driver.clicks == ["Hitting", "Pitching", "Fielding"]
+    assert sorted(df["category"].unique().to_list()) == [
+        "fielding",
+        "hitting",
+        "pitching",
+    ]
+
+
+@pytest.mark.no_web
+def test_get_game_by_game_retries_a_failed_switch_alone(monkeypatch, tmp_path):
+    driver = CategorySwitchingDriver()
+    outcomes = iter([False, True, True])  # the first switch times out once
+    _fake_browser(monkeypatch, tmp_path, driver, lambda: next(outcomes))
+
+    df = get_game_by_game("/players/5519651")
+
+    assert driver.loads == 1
+    assert driver.clicks == ["Pitching", "Pitching", "Fielding"]
+    assert sorted(df["category"].to_list()) == ["fielding", "hitting", "pitching"]
+    assert get_metrics().counter("failures", reason="timeout") == 1
@@ -0,0 +1,25 @@
+import pytest
+from selectolax.parser import HTMLParser
+
+from batboy.config.constants import STAT_CATEGORY_SCHEMAS
+from batboy.scraping.parsing import (
+    PLAYER_ID_PATTERN,
+    detect_category,
+    link_id,
+    to_int,
+)
+
+
+@pytest.mark.no_web
+def test_to_int_and_link_id():
+    assert to_int("1,204") == 1204
+    assert to_int("X") is None
+
+    cell = HTMLParser("<td><a href='/players/8123456'>Dalton Bargo</a></td>").body
+    assert link_id(cell, PLAYER_ID_PATTERN) == 8123456
+
+
+@pytest.mark.no_web
+def test_detect_category_from_headers():
+    assert detect_category(STAT_CATEGORY_SCHEMAS["pitching"]) == "pitching"
+    assert detect_category(["Date", "Opponent", "Result"]) is None
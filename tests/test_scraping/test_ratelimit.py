@@ -0,0 +1,81 @@
+import pytest
+from selectolax.parser import HTMLParser
+from selenium.common.exceptions import TimeoutException
+
+from batboy.scraping.ratelimit import (
+    BlockedPageError,
+    RateLimiter,
+    is_block_page,
+    is_throttle_error,
+)
+
+HOST = "stats.ncaa.org"
+
+
+@pytest.mark.no_web
+def test_rate_limiter_aimd_adjusts_rate(tmp_path):
+    limiter = RateLimiter(
+        str(tmp_path / "state.json"),
+        initial_rate=1.0,
+        min_rate=0.1,
+        max_rate=1.2,
+        increase=0.1,
+        decrease=0.5,
+    )
+    limiter.record_success(HOST)
+    assert limiter.rate(HOST) == pytest.approx(1.1)
+    limiter.record_success(HOST)
+    limiter.record_success(HOST)
+    assert limiter.rate(HOST) == pytest.approx(1.2)  # capped at max_rate
+
+    limiter.record_failure(HOST)
+    assert limiter.rate(HOST) == pytest.approx(0.6)
+    for _ in range(10):
+        limiter.record_failure(HOST)
+    assert limiter.rate(HOST) == pytest.approx(0.1)  # floored at min_rate
+
+
+@pytest.mark.no_web
+def test_rate_limiter_state_is_shared_between_instances(tmp_path):
+    state = str(tmp_path / "state.json")
+    first = RateLimiter(state, initial_rate=20.0, max_rate=20.0, burst=1.0)
+    second = RateLimiter(state, initial_rate=20.0, max_rate=20.0, burst=1.0)
+
+    assert first.acquire(HOST) == 0.0  # burst token available
+    waited = second.acquire(HOST)  # bucket drained by the other instance
+    assert 0.0 < waited <= 0.06
+
+    first.record_failure(HOST)
+    assert second.rate(HOST) == pytest.approx(10.0)
+
+
+@pytest.mark.no_web
+def test_is_block_page():
+    assert is_block_page("<html><title>Access Denied</title><body></body></html>")
+    assert not is_block_page(
+        "<html><title>NCAA Statistics</title><body><table></table></body></html>"
+    )
+    assert is_block_page(HTMLParser("<title>Too Many Requests</title>"))
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code):
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+@pytest.mark.no_web
+def test_is_throttle_error():
+    assert is_throttle_error(BlockedPageError("block"))
+    assert is_throttle_error(TimeoutException("slow"))
+    assert is_throttle_error(FakeHTTPError(429))
+    assert not is_throttle_error(FakeHTTPError(404))
+    assert not is_throttle_error(ValueError("parse bug"))
+
+
+@pytest.mark.no_web
+def test_rate_limiter_rejects_non_positive_rates(tmp_path):
+    state = str(tmp_path / "state.json")
+    with pytest.raises(ValueError, match="positive"):
+        RateLimiter(state, initial_rate=0, max_rate=0)
+    with pytest.raises(ValueError, match="exceeds"):
+        RateLimiter(state, min_rate=2.0, max_rate=1.0)
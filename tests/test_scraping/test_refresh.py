@@ -0,0 +1,100 @@
+from datetime import date
+
+import duckdb
+import polars as pl
+import pytest
+
+from batboy.config.constants import PAGE_HASH_TABLE, SCHEDULE_LOG_COLUMNS
+from batboy.scraping.refresh import is_open_season, refresh_seasons
+from batboy.storage.writer import DuckDBWriter
+
+TARGETS = pl.DataFrame(
+    {
+        "org_id": [694, 703],
+        "school_name": ["Tennessee", "Texas A&M"],
+        "season_url": ["/teams/1", "/teams/2"],
+        "year": ["2025-26", "2025-26"],
+    }
+)
+
+
+def _refresh(db_path, pages):
+    writer = DuckDBWriter(db_path, "schedules", "log", SCHEDULE_LOG_COLUMNS)
+    return refresh_seasons(
+        TARGETS, lambda row: pages[row["season_url"]], writer, "n_games"
+    )
+
+
+def _rows(db_path, sql):
+    con = duckdb.connect(db_path)
+    rows = con.sql(sql).fetchall()
+    con.close()
+    return rows
+
+
+@pytest.mark.no_web
+def test_is_open_season():
+    today = date(2026, 3, 1)
+    assert is_open_season("2025-26", today)
+    assert not is_open_season("2024-25", today)
+
+
+@pytest.mark.no_web
+def test_refresh_rewrites_only_changed_seasons(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    pages = {
+        "/teams/1": pl.DataFrame({"game_id": [1, 2], "team_score": [5, 3]}),
+        "/teams/2": pl.DataFrame({"game_id": [3], "team_score": [7]}),
+    }
+
+    assert _refresh(db_path, pages) == {"changed": 2, "unchanged": 0, "failed": 0}
+    assert _refresh(db_path, pages) == {"changed": 0, "unchanged": 2, "failed": 0}
+
+    # A new game on one page replaces only that season's rows
+    pages["/teams/1"] = pl.DataFrame({"game_id": [1, 2, 4], "team_score": [5, 3, 9]})
+    assert _refresh(db_path, pages) == {"changed": 1, "unchanged": 1, "failed": 0}
+
+    assert _rows(
+        db_path,
+        "SELECT season_url, count(*) FROM schedules GROUP BY 1 ORDER BY 1",
+    ) == [("/teams/1", 3), ("/teams/2", 1)]
+    assert _rows(
+        db_path,
+        f"SELECT season_url, n_rows FROM {PAGE_HASH_TABLE} ORDER BY 1",
+    ) == [("/teams/1", 3), ("/teams/2", 1)]
+    assert _rows(db_path, "SELECT count(*) FROM log") == [(3,)]
+
+
+@pytest.mark.no_web
+def test_refresh_keeps_rows_when_fetch_fails(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    pages = {
+        "/teams/1": pl.DataFrame({"game_id": [1], "team_score": [5]}),
+        "/teams/2": pl.DataFrame({"game_id": [3], "team_score": [7]}),
+    }
+    _refresh(db_path, pages)
+
+    def failing(row):
+        raise ValueError("blocked")
+
+    writer = DuckDBWriter(db_path, "schedules", "log", SCHEDULE_LOG_COLUMNS)
+    counts = refresh_seasons(TARGETS, failing, writer, "n_games")
+
+    assert counts == {"changed": 0, "unchanged": 0, "failed": 2}
+    assert _rows(db_path, "SELECT count(*) FROM schedules") == [(2,)]
+
+
+@pytest.mark.no_web
+def test_refresh_never_replaces_rows_with_empty_page(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    pages = {
+        "/teams/1": pl.DataFrame({"game_id": [1], "team_score": [5]}),
+        "/teams/2": pl.DataFrame({"game_id": [3], "team_score": [7]}),
+    }
+    _refresh(db_path, pages)
+
+    pages["/teams/1"] = pl.DataFrame()
+    assert _refresh(db_path, pages) == {"changed": 0, "unchanged": 1, "failed": 1}
+    assert _rows(
+        db_path, "SELECT season_url, count(*) FROM schedules GROUP BY 1 ORDER BY 1"
+    ) == [("/teams/1", 1), ("/teams/2", 1)]
@@ -0,0 +1,65 @@
+import polars as pl
+import pytest
+from selectolax.parser import HTMLParser
+
+from batboy.scraping.rosters import ROSTER_POLARS_SCHEMA, _parse_roster_dom
+
+MODERN_ROSTER = """
+<table>
+    <thead><tr>
+        <th>GP</th><th>GS</th><th>#</th><th>Name</th><th>Class</th>
+        <th>Position</th><th>Height</th><th>Bats</th><th>Throws</th>
+        <th>Hometown</th><th>High School</th>
+    </tr></thead>
+    <tbody><tr>
+        <td>58</td><td>57</td><td>2</td>
+        <td><a href="/players/8123456">Dalton Bargo</a></td>
+        <td>Sr</td><td>OF</td><td>6-0</td><td>L</td><td>R</td>
+        <td>Las Vegas, NV</td><td>Bonanza HS</td>
+    </tr></tbody>
+</table>
+"""
+
+# Older layouts put the name first and have no games played/started
+LEGACY_ROSTER = """
+<table>
+    <thead><tr><th>Player</th><th>Jersey</th><th>Yr</th><th>Pos</th></tr></thead>
+    <tbody>
+        <tr><td><a href="/players/1234">Smith, John</a></td><td>14</td><td>Jr</td><td>P</td></tr>
+        <tr><td colspan="4">Coaching staff</td></tr>
+    </tbody>
+</table>
+"""
+
+
+@pytest.mark.no_web
+def test_parse_roster_maps_headers_to_schema():
+    df = _parse_roster_dom(HTMLParser(MODERN_ROSTER))
+
+    assert df.schema == ROSTER_POLARS_SCHEMA
+    row = df.row(0, named=True)
+    assert row["player_id"] == 8123456
+    assert row["player_name"] == "Dalton Bargo"
+    assert row["player_url"] == "https://stats.ncaa.org/players/8123456"
+    assert (row["gp"], row["gs"]) == (58, 57)
+    assert row["highschool"] == "Bonanza HS"
+
+
+@pytest.mark.no_web
+def test_parse_roster_finds_name_by_header_in_older_layouts():
+    legacy = _parse_roster_dom(HTMLParser(LEGACY_ROSTER))
+
+    assert legacy.schema == ROSTER_POLARS_SCHEMA
+    assert legacy.height == 1
+    row = legacy.row(0, named=True)
+    assert (row["player_id"], row["player_name"], row["number"]) == (
+        1234,
+        "Smith, John",
+        "14",
+    )
+    assert row["class"] == "Jr"
+    assert row["gp"] is None
+
+    # Identical layouts concatenate without schema reconciliation
+    modern = _parse_roster_dom(HTMLParser(MODERN_ROSTER))
+    assert pl.concat([modern, legacy]).height == 2
@@ -4,7 +4,7 @@ import polars as pl
 import pytest
 from selectolax.parser import HTMLParser
 
-from batboy.scraping.schedules import _parse_schedule_dom
+from batboy.scraping.schedules import _parse_schedule_dom, _parse_schedule_pages
 
 
 @pytest.mark.no_web
@@ -60,3 +60,44 @@ def test_parse_real_schedule_fixture():
     assert (
         df.filter(pl.col("innings").is_not_null()).shape[0] > 0
     )  # Test extra innings parsing
+
+
+@pytest.mark.no_web
+def test_parse_legacy_schedule_row_with_site_and_note():
+    html = """
+    <table class="mytable">
+        <tr>
+            <td>02/16/2018</td>
+            <td>vs <a href="/teams/185441">Maryland</a> @ Knoxville, TN</td>
+            <td><a href="/contests/1500/box_score">L 2 - 3 (10)</a></td>
+        </tr>
+    </table>
+    """
+    df = _parse_schedule_dom(HTMLParser(html), "dummy_url")
+
+    row = df.row(0, named=True)
+    assert row["opponent_site"] == "vs"
+    assert row["opponent_name"] == "Maryland"
+    assert row["opponent_note"] == "@ Knoxville, TN"
+    assert (row["team_score"], row["opp_score"], row["innings"]) == (2, 3, 10)
+    assert row["game_id"] == 1500
+    # Legacy pages have no ranks or attendance, but the columns stay typed
+    assert row["attendance"] is None
+    assert df.schema["attendance"] == pl.Int64
+    assert df.schema["opponent_rank"] == pl.Int64
+
+
+@pytest.mark.no_web
+def test_parse_schedule_pages_matches_single_page_parse():
+    fixtures = Path(__file__).parent.parent / "fixtures" / "html"
+    pages = [
+        (name, (fixtures / name).read_text(encoding="utf-8"))
+        for name in ["pre_2018-2019.html", "tennessee_2025_schedule.html"]
+    ]
+
+    combined = _parse_schedule_pages(pages)
+
+    for season_url, html in pages:
+        single = _parse_schedule_dom(HTMLParser(html), season_url)
+        page_rows = combined.filter(pl.col("season_url") == season_url)
+        assert page_rows.drop("season_url").equals(single)
@@ -1,9 +1,19 @@
+from contextlib import contextmanager
+from pathlib import Path
 from typing import cast
 
 import polars as pl
 import pytest
+from selectolax.parser import HTMLParser
 
-from batboy.scraping.teams import get_ncaa_baseball_teams, get_team_seasons
+from batboy.scraping import core, teams
+from batboy.scraping.cache import get_page_cache
+from batboy.scraping.teams import (
+    _parse_team_history,
+    get_ncaa_baseball_teams,
+    get_season_tabs,
+    get_team_seasons,
+)
 
 # These constants are known to exist — use a stable Division I team for reliability
 EXAMPLE_TEAM_NAME = "Tennessee"
@@ -62,3 +72,95 @@ def test_get_team_seasons_returns_valid_dataframe(team):
 def test_get_team_seasons_fails_on_invalid_team():
     with pytest.raises(ValueError, match="not found or ambiguous"):
         get_team_seasons("Definitely Not A School")
+
+
+def _history_row(year, season_id, wins):
+    return f"""
+    <tr>
+      <td><a href="/teams/{season_id}">{year}</a></td>
+      <td>Tony Vitello</td><td>D-I</td><td>SEC</td>
+      <td>{wins}</td><td>10</td><td>0</td><td>0.800</td><td></td>
+    </tr>"""
+
+
+@pytest.mark.no_web
+def test_parse_team_history_reads_every_row():
+    # Server HTML carries all seasons before DataTables paginates to 25
+    rows = "".join(
+        _history_row(f"{y}-{str(y + 1)[2:]}", 500000 + y, 40) for y in range(1990, 2025)
+    )
+    dom = HTMLParser(
+        f"<table id='team_history_data_table'><tbody>{rows}</tbody></table>"
+    )
+
+    records = _parse_team_history(dom, EXAMPLE_TEAM_ID)
+
+    assert len(records) == 35
+    assert records[0]["season_id"] == 501990
+    assert records[0]["season_url"] == "/teams/501990"
+    assert records[-1]["year"] == "2024-25"
+    assert records[0]["win_pct"] == 0.8
+
+
+@pytest.mark.no_web
+def test_parse_team_history_requires_table():
+    with pytest.raises(ValueError, match="No team history table"):
+        _parse_team_history(HTMLParser("<div></div>"), EXAMPLE_TEAM_ID)
+
+
+@pytest.mark.no_web
+def test_get_season_tabs_decides_schedule_from_season_page(monkeypatch):
+    fixture = Path(__file__).parent.parent / "fixtures" / "html" / "pre_2018-2019.html"
+    season_html = fixture.read_text(encoding="utf-8")
+    image_only = (
+        "<html><body><div class='card'><nav><ul class='nav-tabs'><li>Roster</li>"
+        "</ul></nav><img src='/no_data.png'></div></body></html>"
+    )
+    fetched = []
+
+    def fake_fetch_dom(url, selector, **kwargs):
+        fetched.append(url)
+        if url.endswith("/teams/197683"):
+            return HTMLParser(season_html)
+        if "ranking_summary" in url:
+            return HTMLParser(image_only)
+        return HTMLParser(season_html)
+
+    monkeypatch.setattr(teams, "fetch_dom", fake_fetch_dom)
+    tabs = get_season_tabs("/teams/197683", verbose=False)
+
+    assert tabs["Schedule/Results"] is True
+    assert tabs["Roster"] is True
+    assert tabs["Ranking Summary"] is False
+    # Season page once, plus one probe per tab that isn't the season page
+    assert len(fetched) == 5
+    assert fetched.count("https://stats.ncaa.org/teams/197683") == 1
+
+
+class NoDataTablesDriver:
+    page_source = "<table id='team_history_data_table'><tbody></tbody></table>"
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script):
+        return None
+
+
+class FakePool:
+    @contextmanager
+    def borrow(self, timeout=None):
+        yield NoDataTablesDriver()
+
+
+@pytest.mark.no_web
+def test_team_history_without_datatables_api_is_not_cached(monkeypatch):
+    url = "https://stats.ncaa.org/teams/history?org_id=694&sport_code=MBA"
+    monkeypatch.setattr(teams, "fetch_dom", lambda *a, **kw: None)
+    monkeypatch.setattr(teams, "get_driver_pool", lambda: FakePool())
+    monkeypatch.setattr(teams, "wait_for_selector", lambda *a, **kw: True)
+    monkeypatch.setattr(core.time, "sleep", lambda s: None)
+
+    with pytest.raises(RuntimeError, match="DataTables API unavailable"):
+        teams._get_team_history_dom(url)
+    assert get_page_cache().get(url) is None
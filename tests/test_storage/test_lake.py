@@ -0,0 +1,71 @@
+import json
+
+import polars as pl
+import pytest
+
+from batboy.config.constants import SCHEDULE_LOG_COLUMNS
+from batboy.storage.lake import LakeWriter, scan_lake
+from batboy.storage.writer import DuckDBWriter, with_season_context
+
+
+def _season(season_url, year, games):
+    df = pl.DataFrame({"game_id": games, "team_score": [5] * len(games)})
+    return with_season_context(df, 694, "Tennessee", season_url, year)
+
+
+@pytest.mark.no_web
+def test_lake_partitions_by_year_and_division(tmp_path):
+    divisions = pl.DataFrame(
+        {"season_url": ["/teams/1", "/teams/2"], "division": ["D-I", "D-II"]}
+    )
+    lake = LakeWriter("schedules", str(tmp_path), lookup=divisions)
+    lake.write(_season("/teams/1", "2023-24", [1, 2]))
+    lake.write(_season("/teams/2", "2024-25", [3]))
+
+    assert (tmp_path / "schedules/year=2024-25/division=D-II").is_dir()
+    manifest = json.loads((tmp_path / "schedules/_manifest.json").read_text())
+    assert [f["rows"] for f in manifest["files"]] == [2, 1]
+
+    pruned = (
+        scan_lake("schedules", str(tmp_path))
+        .filter(pl.col("year") == "2023-24", pl.col("division") == "D-I")
+        .collect()
+    )
+    assert pruned["game_id"].to_list() == [1, 2]
+
+
+@pytest.mark.no_web
+def test_lake_replace_and_compact(tmp_path):
+    lake = LakeWriter("schedules", str(tmp_path))
+    for i in range(4):
+        lake.write(_season(f"/teams/{i}", "2024-25", [i]))
+
+    lake.write(_season("/teams/1", "2024-25", [10, 11]), [{"season_url": "/teams/1"}])
+    assert lake.compact(min_files=4) == 3
+
+    files = lake.read_manifest()["files"]
+    assert len(files) == 1
+    rows = scan_lake("schedules", str(tmp_path)).sort("game_id").collect()
+    assert rows["game_id"].to_list() == [0, 2, 3, 10, 11]
+    assert rows["division"].null_count() == rows.shape[0]
+
+
+@pytest.mark.no_web
+def test_writer_mirrors_committed_rows_to_lake(tmp_path):
+    lake = LakeWriter("schedules", str(tmp_path / "lake"))
+    db_path = str(tmp_path / "schedules.duckdb")
+    log = {"org_id": 694, "season_url": "/teams/1", "success": True}
+
+    with DuckDBWriter(
+        db_path, "schedules", "log", SCHEDULE_LOG_COLUMNS, lake=lake
+    ) as writer:
+        writer.add(_season("/teams/1", "2024-25", [1, 2]), log=log)
+        writer.flush()
+        writer.add(
+            _season("/teams/1", "2024-25", [1, 2, 3]),
+            log=log,
+            replace={"season_url": "/teams/1"},
+        )
+
+    rows = scan_lake("schedules", str(tmp_path / "lake")).collect()
+    assert sorted(rows["game_id"]) == [1, 2, 3]
@@ -0,0 +1,74 @@
+import duckdb
+import pytest
+
+from batboy.config.constants import SCHEDULE_LOG_COLUMNS
+from batboy.storage.pending import get_pending_targets
+
+SOURCE_QUERY = """
+    SELECT org_id, school_name, season_url, year
+    FROM source.season_info
+    WHERE has_schedule = TRUE
+"""
+
+
+@pytest.fixture
+def info_db(tmp_path):
+    path = str(tmp_path / "info.duckdb")
+    con = duckdb.connect(path)
+    con.execute("""
+        CREATE TABLE season_info AS
+        SELECT 694 AS org_id, 'Tennessee' AS school_name,
+               '/teams/' || i AS season_url, '2024-25' AS year,
+               i % 5 <> 0 AS has_schedule
+        FROM range(1, 21) t(i)
+    """)
+    con.close()
+    return path
+
+
+def _log(db_path, season_urls, success=True):
+    con = duckdb.connect(db_path)
+    columns = ", ".join(f"{k} {v}" for k, v in SCHEDULE_LOG_COLUMNS.items())
+    con.execute(f"CREATE TABLE IF NOT EXISTS log ({columns})")
+    con.executemany(
+        "INSERT INTO log (season_url, success) VALUES (?, ?)",
+        [[url, success] for url in season_urls],
+    )
+    con.close()
+
+
+@pytest.mark.no_web
+def test_pending_targets_anti_join_logged_seasons(tmp_path, info_db):
+    db_path = str(tmp_path / "schedules.duckdb")
+    _log(db_path, ["/teams/1", "/teams/2", "/teams/2"])
+
+    pending = get_pending_targets(
+        db_path, "log", SCHEDULE_LOG_COLUMNS, info_db, SOURCE_QUERY
+    )
+
+    # 16 seasons have schedules; two of them are logged (one twice)
+    assert pending.shape[0] == 14
+    assert not {"/teams/1", "/teams/2", "/teams/5"} & set(pending["season_url"])
+    assert pending.columns == ["org_id", "school_name", "season_url", "year"]
+
+
+@pytest.mark.no_web
+def test_pending_targets_limit_and_log_filter(tmp_path, info_db):
+    db_path = str(tmp_path / "schedules.duckdb")
+    _log(db_path, ["/teams/1"], success=False)
+
+    failed_retried = get_pending_targets(
+        db_path,
+        "log",
+        SCHEDULE_LOG_COLUMNS,
+        info_db,
+        SOURCE_QUERY,
+        log_filter="done.success",
+        limit=3,
+    )
+
+    assert failed_retried["season_url"].to_list() == [
+        "/teams/1",
+        "/teams/11",
+        "/teams/12",
+    ]
@@ -0,0 +1,111 @@
+import multiprocessing
+import time
+
+import polars as pl
+import pytest
+
+from batboy.storage.queue import JobQueue
+
+TARGETS = pl.DataFrame(
+    {
+        "org_id": [694, 703, 736],
+        "season_url": ["/teams/1", "/teams/2", "/teams/3"],
+    }
+)
+
+
+@pytest.mark.no_web
+def test_enqueue_is_idempotent_and_claims_are_exclusive(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.duckdb"))
+
+    assert queue.enqueue("schedules", TARGETS, "season_url") == 3
+    assert queue.enqueue("schedules", TARGETS, "season_url") == 0
+
+    first = queue.claim("schedules", "worker-1", n=2)
+    second = queue.claim("schedules", "worker-2", n=2)
+
+    assert first.to_dicts() == TARGETS.head(2).to_dicts()
+    assert second["season_url"].to_list() == ["/teams/3"]
+    assert queue.claim("schedules", "worker-3").is_empty()
+
+
+@pytest.mark.no_web
+def test_complete_fail_and_expired_leases(tmp_path):
+    queue = JobQueue(
+        str(tmp_path / "queue.duckdb"),
+        lease_seconds=0.2,
+        max_attempts=2,
+        retry_delay=0.1,
+    )
+    queue.enqueue("schedules", TARGETS, "season_url")
+    queue.claim("schedules", "worker-1", n=3)
+
+    queue.complete("schedules", "/teams/1", "worker-1")
+    queue.fail("schedules", "/teams/2", "worker-1", "blocked")
+    queue.complete("schedules", "/teams/3", "someone-else")  # not their lease
+    assert queue.counts("schedules") == {"done": 1, "pending": 1, "leased": 1}
+
+    # worker-1 "crashes"; its lease on /teams/3 expires and is reclaimed
+    time.sleep(0.3)
+    retried = queue.claim("schedules", "worker-2", n=3)
+    assert sorted(retried["season_url"]) == ["/teams/2", "/teams/3"]
+
+    queue.fail("schedules", "/teams/2", "worker-2", "blocked again")
+    assert queue.counts("schedules") == {"done": 1, "failed": 1, "leased": 1}
+
+
+@pytest.mark.no_web
+def test_failed_jobs_back_off_before_retrying(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.duckdb"), max_attempts=3, retry_delay=0.2)
+    queue.enqueue("schedules", TARGETS.head(1), "season_url")
+
+    queue.claim("schedules", "worker-1")
+    queue.fail("schedules", "/teams/1", "worker-1", "blocked")
+    assert queue.claim("schedules", "worker-1").is_empty()
+    assert 0 < queue.next_retry_in("schedules") <= 0.2
+
+    time.sleep(0.25)
+    assert not queue.claim("schedules", "worker-1").is_empty()
+
+    # The second failure waits twice as long
+    queue.fail("schedules", "/teams/1", "worker-1", "blocked again")
+    assert 0.2 < queue.next_retry_in("schedules") <= 0.4
+
+    queue.claim("schedules", "worker-1")
+    assert queue.counts("schedules") == {"pending": 1}
+    time.sleep(0.45)
+    queue.claim("schedules", "worker-1")
+    queue.fail("schedules", "/teams/1", "worker-1", "blocked for good")
+    assert queue.next_retry_in("schedules") is None
+    assert queue.counts("schedules") == {"failed": 1}
+
+
+def _claim_all(db_path, owner, out):
+    queue = JobQueue(db_path)
+    claimed = []
+    while True:
+        batch = queue.claim("rosters", owner, n=3)
+        if batch.is_empty():
+            break
+        claimed += batch["season_url"].to_list()
+    out.put(claimed)
+
+
+@pytest.mark.no_web
+def test_concurrent_processes_never_claim_the_same_job(tmp_path):
+    db_path = str(tmp_path / "queue.duckdb")
+    targets = pl.DataFrame({"season_url": [f"/teams/{i}" for i in range(60)]})
+    JobQueue(db_path).enqueue("rosters", targets, "season_url")
+
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    procs = [
+        ctx.Process(target=_claim_all, args=(db_path, f"p{i}", out)) for i in range(3)
+    ]
+    for p in procs:
+        p.start()
+    claimed = [url for _ in procs for url in out.get(timeout=60)]
+    for p in procs:
+        p.join()
+
+    assert sorted(claimed) == sorted(targets["season_url"])
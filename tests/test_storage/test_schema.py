@@ -0,0 +1,112 @@
+import datetime
+
+import duckdb
+import polars as pl
+import pytest
+
+from batboy.storage.schema import apply_schema
+from batboy.storage.writer import DuckDBWriter
+
+
+@pytest.mark.no_web
+def test_apply_schema_casts_to_compact_types():
+    df = pl.DataFrame(
+        {
+            "date": ["02/14/2025", "TBA"],
+            "team_score": [15, 3],
+            "attendance": [6212, None],
+            "opponent_site": ["@", "neutral"],
+            "position": ["OF", "P"],
+            "ERA": ["3.25", "-"],
+            "notes": ["kept", "as is"],
+        }
+    )
+
+    out = apply_schema(df)
+
+    assert out.schema["date"] == pl.Date
+    assert out["date"].to_list() == [datetime.date(2025, 2, 14), None]
+    assert out.schema["team_score"] == pl.Int16
+    assert out.schema["attendance"] == pl.Int32
+    assert out["opponent_site"].to_list() == ["@", None]  # unknown enum value
+    assert out.schema["position"] == pl.Categorical
+    assert out.schema["ERA"] == pl.Float32  # Float16 is stored as Float32
+    assert out["ERA"].to_list() == [3.25, None]
+    assert out.schema["notes"] == pl.String
+
+
+@pytest.mark.no_web
+def test_writer_stores_typed_columns(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    df = pl.DataFrame({"date": ["03/01/2025"], "team_score": [5], "innings": [None]})
+
+    with DuckDBWriter(db_path, "schedules") as writer:
+        writer.add(df)
+
+    con = duckdb.connect(db_path)
+    types = dict(
+        con.sql("SELECT column_name, column_type FROM (DESCRIBE schedules)").fetchall()
+    )
+    con.close()
+    assert types == {"date": "DATE", "team_score": "SMALLINT", "innings": "SMALLINT"}
+
+
+@pytest.mark.no_web
+def test_apply_schema_strips_suffixes_and_counts_lost_values():
+    from batboy.metrics import get_metrics
+
+    df = pl.DataFrame(
+        {
+            "date": ["03/01/2025(1)", "03/01/2025(2)", "TBA"],
+            "team_score": ["2*", "1,204", ""],
+        }
+    )
+
+    out = apply_schema(df)
+
+    assert out["date"].to_list() == [datetime.date(2025, 3, 1)] * 2 + [None]
+    assert out["team_score"].to_list() == [2, 1204, None]
+    assert get_metrics().counter("cast_failures", column="date") == 1
+    assert get_metrics().counter("cast_failures", column="team_score") == 0
+
+
+@pytest.mark.no_web
+def test_writer_migrates_text_columns_of_existing_tables(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    con = duckdb.connect(db_path)
+    con.execute("CREATE TABLE schedules (date VARCHAR, team_score VARCHAR)")
+    con.execute("INSERT INTO schedules VALUES ('02/14/2024(1)', '7'), ('-', NULL)")
+    con.close()
+
+    with DuckDBWriter(db_path, "schedules") as writer:
+        writer.add(pl.DataFrame({"date": ["03/01/2025"], "team_score": [5]}))
+
+    con = duckdb.connect(db_path)
+    types = dict(
+        con.sql("SELECT column_name, column_type FROM (DESCRIBE schedules)").fetchall()
+    )
+    rows = con.sql("SELECT * FROM schedules ORDER BY date NULLS LAST").fetchall()
+    con.close()
+    assert types == {"date": "DATE", "team_score": "SMALLINT"}
+    assert rows == [
+        (datetime.date(2024, 2, 14), 7),
+        (datetime.date(2025, 3, 1), 5),
+        (None, None),
+    ]
+
+
+@pytest.mark.no_web
+def test_writer_refuses_unconvertible_text_columns(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    con = duckdb.connect(db_path)
+    con.execute("CREATE TABLE schedules (date VARCHAR)")
+    con.execute("INSERT INTO schedules VALUES ('someday')")
+    con.close()
+
+    with pytest.raises(TypeError, match="schedules.date"):
+        with DuckDBWriter(db_path, "schedules") as writer:
+            writer.add(pl.DataFrame({"date": ["03/01/2025"]}))
+
+    con = duckdb.connect(db_path)
+    assert con.sql("SELECT * FROM schedules").fetchall() == [("someday",)]
+    con.close()
@@ -0,0 +1,151 @@
+import duckdb
+import polars as pl
+import pytest
+
+from batboy.config.constants import (
+    BOX_SCORE_DB_PATH,
+    BOX_SCORE_LOG_COLUMNS,
+    BOX_SCORE_LOG_TABLE,
+    BOX_SCORE_PLAYER_TABLE,
+    LINE_SCORE_TABLE,
+    SCHEDULE_LOG_COLUMNS,
+)
+from batboy.storage import shards
+from batboy.storage.pending import get_pending_targets
+from batboy.storage.shards import (
+    SHARDED_DATABASES,
+    configure_shard,
+    filter_shard,
+    merge_shards,
+    parse_shard,
+    shard_db_path,
+    shard_of,
+    shard_predicate,
+)
+from batboy.storage.writer import DuckDBWriter, with_season_context
+
+
+@pytest.fixture(autouse=True)
+def no_shard(monkeypatch):
+    monkeypatch.setattr(shards, "_SHARD", None)
+
+
+@pytest.mark.no_web
+def test_parse_shard_and_paths():
+    assert parse_shard("1/4") == (1, 4)
+    for bad in ["4/4", "1-4", "0/0"]:
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+    assert shard_db_path("data/schedules.duckdb") == "data/schedules.duckdb"
+    configure_shard("2/8")
+    assert shard_db_path("data/schedules.duckdb") == "data/schedules.shard2of8.duckdb"
+
+
+@pytest.mark.no_web
+def test_python_and_sql_shard_assignment_agree():
+    org_ids = pl.DataFrame({"org_id": list(range(1, 2001))})
+    sql_shards = []
+    for k in range(4):
+        sql = f"SELECT org_id FROM org_ids WHERE {shard_predicate('org_id', (k, 4))}"
+        ids = {row[0] for row in duckdb.sql(sql).fetchall()}
+        assert ids == set(filter_shard(org_ids, shard=(k, 4))["org_id"])
+        assert all(shard_of(i, 4) == k for i in ids)
+        sql_shards.append(ids)
+
+    # Shards partition the targets and are roughly balanced
+    assert set().union(*sql_shards) == set(org_ids["org_id"])
+    assert min(len(ids) for ids in sql_shards) > 400
+
+
+def _write_season(db_path, org_id, season_url, games):
+    df = pl.DataFrame({"game_id": games})
+    with DuckDBWriter(db_path, "schedules", "log", SCHEDULE_LOG_COLUMNS) as writer:
+        writer.add(
+            with_season_context(df, org_id, "School", season_url, "2024-25"),
+            log={"org_id": org_id, "season_url": season_url, "success": True},
+        )
+
+
+@pytest.mark.no_web
+def test_merge_shards_dedupes_and_is_idempotent(tmp_path):
+    canonical = str(tmp_path / "season_schedules.duckdb")
+    databases = {canonical: {"schedules": "season_url", "log": None}}
+
+    _write_season(canonical, 1, "/teams/1", [1, 2])  # stale copy of /teams/1
+    _write_season(shard_db_path(canonical, (0, 2)), 1, "/teams/1", [1, 2, 3])
+    _write_season(shard_db_path(canonical, (1, 2)), 2, "/teams/2", [4])
+
+    merge_shards(databases)
+    merge_shards(databases)
+
+    con = duckdb.connect(canonical)
+    seasons = con.sql(
+        "SELECT season_url, count(*) FROM schedules GROUP BY 1 ORDER BY 1"
+    ).fetchall()
+    n_log = con.sql("SELECT count(*) FROM log").fetchone()[0]
+    con.close()
+    assert seasons == [("/teams/1", 3), ("/teams/2", 1)]
+    assert n_log == 2  # the canonical /teams/1 row equals the shard's
+
+    merge_shards(databases, remove=True)
+    assert shards.find_shard_files(canonical) == []
+
+
+@pytest.mark.no_web
+def test_sharded_pending_targets_skip_other_shards_and_merged_logs(tmp_path):
+    info_db = str(tmp_path / "info.duckdb")
+    duckdb.connect(info_db).execute("""
+        CREATE TABLE season_info AS
+        SELECT i AS org_id, '/teams/' || i AS season_url FROM range(1, 41) t(i)
+    """).close()
+    canonical = str(tmp_path / "season_schedules.duckdb")
+    query = "SELECT org_id, season_url FROM source.season_info"
+
+    configure_shard("0/2")
+    mine = filter_shard(pl.DataFrame({"org_id": list(range(1, 41))}))["org_id"]
+    _write_season(canonical, mine[0], f"/teams/{mine[0]}", [1])  # merged earlier
+    _write_season(shard_db_path(canonical), mine[1], f"/teams/{mine[1]}", [2])
+
+    pending = get_pending_targets(
+        canonical, "log", SCHEDULE_LOG_COLUMNS, info_db, query
+    )
+
+    assert set(pending["org_id"]) == set(mine[2:])
+
+
+def _write_box_score(db_path, game_id, n_players):
+    tables = {
+        LINE_SCORE_TABLE: pl.DataFrame({"game_id": [game_id] * 2, "runs": [3, 5]}),
+        BOX_SCORE_PLAYER_TABLE: pl.DataFrame(
+            {"game_id": [game_id] * n_players, "player_id": list(range(n_players))}
+        ),
+    }
+    with DuckDBWriter(
+        db_path, BOX_SCORE_PLAYER_TABLE, BOX_SCORE_LOG_TABLE, BOX_SCORE_LOG_COLUMNS
+    ) as writer:
+        writer.add(tables, log={"game_id": game_id, "success": True})
+
+
+@pytest.mark.no_web
+def test_merge_shards_includes_box_scores(tmp_path):
+    canonical = str(tmp_path / "box_scores.duckdb")
+    databases = {canonical: SHARDED_DATABASES[BOX_SCORE_DB_PATH]}
+
+    _write_box_score(canonical, 100, 1)  # stale copy of game 100
+    _write_box_score(shard_db_path(canonical, (0, 2)), 100, 3)
+    _write_box_score(shard_db_path(canonical, (1, 2)), 200, 2)
+
+    merge_shards(databases, remove=True)
+
+    con = duckdb.connect(canonical)
+    players = con.sql(
+        f"SELECT game_id, count(*) FROM {BOX_SCORE_PLAYER_TABLE} GROUP BY 1 ORDER BY 1"
+    ).fetchall()
+    line_scores = con.sql(f"SELECT count(*) FROM {LINE_SCORE_TABLE}").fetchone()[0]
+    logged = con.sql(f"SELECT count(*) FROM {BOX_SCORE_LOG_TABLE}").fetchone()[0]
+    con.close()
+    assert players == [(100, 3), (200, 2)]
+    assert line_scores == 4
+    assert logged == 2
+    assert shards.find_shard_files(canonical) == []
@@ -0,0 +1,80 @@
+import duckdb
+import polars as pl
+import pytest
+
+from batboy.config.constants import SCHEDULE_LOG_COLUMNS
+from batboy.metrics import get_metrics
+from batboy.storage.writer import DuckDBWriter, with_season_context
+
+
+def _season(season_url, n_games):
+    df = pl.DataFrame({"game_id": list(range(n_games)), "team_score": [5] * n_games})
+    data = with_season_context(df, 694, "Tennessee", season_url, "2024-25")
+    log = {
+        "org_id": 694,
+        "school_name": "Tennessee",
+        "season_url": season_url,
+        "success": True,
+        "n_games": n_games,
+    }
+    return data, log
+
+
+def _counts(db_path):
+    con = duckdb.connect(db_path)
+    n_data = con.sql("SELECT count(*) FROM schedules").fetchone()[0]
+    n_log = con.sql("SELECT count(*) FROM log").fetchone()[0]
+    con.close()
+    return n_data, n_log
+
+
+@pytest.mark.no_web
+def test_writer_buffers_and_flushes_data_with_logs(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    writer = DuckDBWriter(
+        db_path, "schedules", "log", SCHEDULE_LOG_COLUMNS, flush_every=2
+    )
+
+    writer.add(*_season("/teams/1", 3))
+    assert writer._units  # still buffered
+    writer.add(*_season("/teams/2", 4))
+    assert not writer._units  # flushed after two seasons
+
+    writer.add(log={"org_id": 694, "season_url": "/teams/3", "success": False})
+    writer.close()
+
+    assert _counts(db_path) == (7, 3)
+
+
+@pytest.mark.no_web
+def test_writer_rolls_back_data_when_log_insert_fails(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    with DuckDBWriter(db_path, "schedules", "log", SCHEDULE_LOG_COLUMNS) as writer:
+        writer.add(*_season("/teams/1", 3))
+        writer.flush()
+
+        data, log = _season("/teams/2", 4)
+        writer.add(data, {**log, "n_games": "not a number"})
+        with pytest.raises(duckdb.Error):
+            writer.flush()
+
+    # The bad season is dropped, so close() does not replay it
+    assert _counts(db_path) == (3, 1)
+
+
+@pytest.mark.no_web
+def test_writer_drops_only_the_bad_unit_of_a_flush(tmp_path):
+    db_path = str(tmp_path / "schedules.duckdb")
+    writer = DuckDBWriter(
+        db_path, "schedules", "log", SCHEDULE_LOG_COLUMNS, flush_every=3
+    )
+
+    writer.add(*_season("/teams/1", 3))
+    data, log = _season("/teams/2", 4)
+    writer.add(data, {**log, "n_games": "not a number"})
+    writer.add(*_season("/teams/3", 2))  # flushes; no error raised
+    writer.add(*_season("/teams/4", 1))
+    writer.close()
+
+    assert _counts(db_path) == (6, 3)
+    assert get_metrics().counter("write_failures") == 1